@@ -0,0 +1,42 @@
+# backend/app/api/models/change_log_model.py
+import json
+import os
+from typing import Iterable, List, Optional, Tuple
+
+from app.config.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    origin INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+async def append_changes(db: Database, topic: str, records: Iterable[dict], origin: Optional[int] = None) -> int:
+    """Publish changed records to the other workers"""
+    origin = os.getpid() if origin is None else origin
+    return await db.executemany(
+        "INSERT INTO change_log (topic, origin, data) VALUES (?, ?, ?)",
+        ((topic, origin, json.dumps(record)) for record in records),
+    )
+
+
+async def latest_seq(db: Database) -> int:
+    rows = await db.fetchall("SELECT COALESCE(MAX(seq), 0) AS seq FROM change_log")
+    return rows[0]["seq"]
+
+
+async def changes_since(db: Database, seq: int, limit: int = 1000) -> List[Tuple[int, str, int, dict]]:
+    """``(seq, topic, origin, record)`` rows after ``seq``, oldest first"""
+    rows = await db.fetchall(
+        "SELECT seq, topic, origin, data FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?", (seq, limit)
+    )
+    return [(row["seq"], row["topic"], row["origin"], json.loads(row["data"])) for row in rows]
+
+
+async def prune(db: Database, keep: int) -> int:
+    """Drop all but the newest ``keep`` entries"""
+    return await db.execute("DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - ?", (keep,))
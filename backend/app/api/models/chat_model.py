@@ -0,0 +1,42 @@
+# backend/app/api/models/chat_model.py
+import json
+import time
+from typing import Optional
+
+from app.config.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_sessions (
+    id TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_expires ON chat_sessions(expires_at);
+"""
+
+
+async def load_session(db: Database, session_id: str) -> Optional[dict]:
+    """Stored session state, or None when missing or expired"""
+    rows = await db.fetchall(
+        "SELECT data FROM chat_sessions WHERE id = ? AND expires_at > ?", (session_id, time.time())
+    )
+    return json.loads(rows[0]["data"]) if rows else None
+
+
+async def save_session(db: Database, session_id: str, state: dict, ttl_seconds: float) -> int:
+    return await db.execute(
+        """
+        INSERT INTO chat_sessions (id, expires_at, data) VALUES (?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET expires_at = excluded.expires_at, data = excluded.data
+        """,
+        (session_id, time.time() + ttl_seconds, json.dumps(state)),
+    )
+
+
+async def count_active(db: Database) -> int:
+    rows = await db.fetchall("SELECT COUNT(*) AS active FROM chat_sessions WHERE expires_at > ?", (time.time(),))
+    return rows[0]["active"]
+
+
+async def purge_expired(db: Database) -> int:
+    return await db.execute("DELETE FROM chat_sessions WHERE expires_at <= ?", (time.time(),))
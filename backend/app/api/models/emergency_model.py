@@ -0,0 +1,98 @@
+# backend/app/api/models/emergency_model.py
+import json
+from typing import Iterable, List, Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from app.config.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS emergencies (
+    id TEXT PRIMARY KEY,
+    type TEXT,
+    priority TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    area TEXT,
+    victims INTEGER NOT NULL DEFAULT 0,
+    lat REAL,
+    lng REAL,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_emergencies_status ON emergencies(status);
+CREATE INDEX IF NOT EXISTS idx_emergencies_type ON emergencies(type);
+CREATE INDEX IF NOT EXISTS idx_emergencies_area ON emergencies(area);
+CREATE INDEX IF NOT EXISTS idx_emergencies_status_type_area ON emergencies(status, type, area);
+"""
+
+
+# Keep IN (...) lookups under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+class Emergency(BaseModel):
+    """A stored emergency report; unknown fields are kept as-is."""
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    type: Optional[str] = None
+    priority: Optional[str] = None
+    status: str = "open"
+    area: Optional[str] = None
+    victims: int = 0
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    createdAt: Optional[str] = None
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def _id_as_text(cls, value):
+        return str(value)
+
+
+def _row(emergency: Emergency) -> tuple:
+    return (
+        emergency.id, emergency.type, emergency.priority, emergency.status, emergency.area,
+        emergency.victims, emergency.lat, emergency.lng, emergency.createdAt,
+        json.dumps(emergency.model_dump()),
+    )
+
+
+async def upsert_emergencies(db: Database, emergencies: Iterable[Emergency]) -> int:
+    """Insert or replace many emergencies in one transaction"""
+    return await db.executemany(
+        """
+        INSERT INTO emergencies (id, type, priority, status, area, victims, lat, lng, created_at, data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            type = excluded.type, priority = excluded.priority, status = excluded.status,
+            area = excluded.area, victims = excluded.victims, lat = excluded.lat, lng = excluded.lng,
+            created_at = excluded.created_at, data = excluded.data
+        """,
+        (_row(emergency) for emergency in emergencies),
+    )
+
+
+async def query_emergencies(db: Database, status: Optional[str] = None, type: Optional[str] = None,
+                            area: Optional[str] = None, limit: int = 1000) -> List[dict]:
+    """Emergencies filtered on the indexed status/type/area columns"""
+    clauses, params = [], []
+    for column, value in (("status", status), ("type", type), ("area", area)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = await db.fetchall(f"SELECT data FROM emergencies {where} ORDER BY created_at DESC LIMIT ?", (*params, limit))
+    return [json.loads(row["data"]) for row in rows]
+
+
+async def get_emergencies(db: Database, ids: List[str]) -> List[dict]:
+    """Emergencies by id, in the order requested (unknown ids are skipped)"""
+    ids = [str(i) for i in ids]
+    found = {}
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        chunk = ids[start:start + LOOKUP_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows = await db.fetchall(f"SELECT id, data FROM emergencies WHERE id IN ({placeholders})", chunk)
+        found.update((row["id"], json.loads(row["data"])) for row in rows)
+    return [found[i] for i in ids if i in found]
@@ -0,0 +1,37 @@
+# backend/app/api/models/metrics_model.py
+import json
+import time
+from typing import Dict, List
+
+from app.config.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_snapshots (
+    pid INTEGER PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+async def save_snapshot(db: Database, pid: int, snapshot: Dict[str, list]) -> int:
+    """Replace this worker's published metric values"""
+    return await db.execute(
+        """
+        INSERT INTO metric_snapshots (pid, updated_at, data) VALUES (?, ?, ?)
+        ON CONFLICT(pid) DO UPDATE SET updated_at = excluded.updated_at, data = excluded.data
+        """,
+        (pid, time.time(), json.dumps(snapshot)),
+    )
+
+
+async def recent_snapshots(db: Database, max_age_s: float, exclude_pid: int) -> List[Dict[str, list]]:
+    """Snapshots of the other live workers (exited workers stop refreshing theirs)"""
+    rows = await db.fetchall(
+        "SELECT data FROM metric_snapshots WHERE updated_at > ? AND pid != ?", (time.time() - max_age_s, exclude_pid)
+    )
+    return [json.loads(row["data"]) for row in rows]
+
+
+async def prune(db: Database, max_age_s: float) -> int:
+    return await db.execute("DELETE FROM metric_snapshots WHERE updated_at <= ?", (time.time() - max_age_s,))
@@ -0,0 +1,97 @@
+# backend/app/api/models/volunteer_model.py
+import json
+from typing import Iterable, List, Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from app.config.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS volunteers (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    status TEXT NOT NULL DEFAULT 'available',
+    area TEXT,
+    rating REAL NOT NULL DEFAULT 4.0,
+    completed_missions INTEGER NOT NULL DEFAULT 0,
+    lat REAL,
+    lng REAL,
+    skills TEXT NOT NULL DEFAULT '[]',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_volunteers_status ON volunteers(status);
+CREATE INDEX IF NOT EXISTS idx_volunteers_area ON volunteers(area);
+CREATE INDEX IF NOT EXISTS idx_volunteers_status_area ON volunteers(status, area);
+"""
+
+
+# Keep IN (...) lookups under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+class Volunteer(BaseModel):
+    """A stored volunteer; unknown fields are kept as-is."""
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    name: Optional[str] = None
+    skills: List[str] = []
+    status: str = "available"
+    area: Optional[str] = None
+    rating: float = 4.0
+    completedMissions: int = 0
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def _id_as_text(cls, value):
+        return str(value)
+
+
+def _row(volunteer: Volunteer) -> tuple:
+    return (
+        volunteer.id, volunteer.name, volunteer.status, volunteer.area, volunteer.rating,
+        volunteer.completedMissions, volunteer.lat, volunteer.lng, json.dumps(volunteer.skills),
+        json.dumps(volunteer.model_dump()),
+    )
+
+
+async def upsert_volunteers(db: Database, volunteers: Iterable[Volunteer]) -> int:
+    """Insert or replace many volunteers in one transaction"""
+    return await db.executemany(
+        """
+        INSERT INTO volunteers (id, name, status, area, rating, completed_missions, lat, lng, skills, data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            name = excluded.name, status = excluded.status, area = excluded.area,
+            rating = excluded.rating, completed_missions = excluded.completed_missions,
+            lat = excluded.lat, lng = excluded.lng, skills = excluded.skills, data = excluded.data
+        """,
+        (_row(volunteer) for volunteer in volunteers),
+    )
+
+
+async def query_volunteers(db: Database, status: Optional[str] = None, area: Optional[str] = None,
+                           limit: Optional[int] = None) -> List[dict]:
+    """Volunteers filtered on the indexed status/area columns"""
+    clauses, params = [], []
+    for column, value in (("status", status), ("area", area)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = await db.fetchall(f"SELECT data FROM volunteers {where} LIMIT ?", (*params, -1 if limit is None else limit))
+    return [json.loads(row["data"]) for row in rows]
+
+
+async def get_volunteers(db: Database, ids: List[str]) -> List[dict]:
+    """Volunteers by id, in the order requested (unknown ids are skipped)"""
+    ids = [str(i) for i in ids]
+    found = {}
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        chunk = ids[start:start + LOOKUP_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows = await db.fetchall(f"SELECT id, data FROM volunteers WHERE id IN ({placeholders})", chunk)
+        found.update((row["id"], json.loads(row["data"])) for row in rows)
+    return [found[i] for i in ids if i in found]
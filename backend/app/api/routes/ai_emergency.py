@@ -1,12 +1,40 @@
 # backend/app/api/routes/ai_emergency.py
-from fastapi import APIRouter, HTTPException, File, UploadFile
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import numpy as np
-import pandas as pd
-from datetime import datetime
-import openai
+import asyncio
+import heapq
 import json
+from PIL import UnidentifiedImageError
+
+from app.api.models.emergency_model import get_emergencies, query_emergencies
+from app.api.models.volunteer_model import get_volunteers, query_volunteers
+from app.api.services import sentiment
+from app.api.services.admission import LOW, NORMAL, Overloaded, admission, text_priority
+from app.api.services.ai_classifier import classify_text
+from app.api.services.chat_engine import engine as chat_engine
+from app.api.services.image_processor import (
+    ImageQueueFull, ImageTooLarge, MalformedUpload, MultipartImageReader, TooManyImages, analyzer as image_analyzer,
+    parse_options_header, site_summary,
+)
+from app.api.services.incidents import publish_incident
+from app.api.services.llm_client import llm_classifier
+from app.api.services.metrics import FALLBACKS, stage
+from app.api.services.prediction_engine import engine as prediction_engine, parse_timeframe
+from app.api.services.realtime import hub
+from app.api.services.resource_forecaster import forecaster as resource_forecaster, parse_inventory
+from app.api.services.response_cache import cache as response_cache
+from app.api.services.roster import Roster, RosterFormatError
+from app.api.services.volunteer_index import location_of, volunteer_index
+from app.api.services.volunteer_optimizer import optimizer as volunteer_optimizer, plan_summary
+from app.api.services.volunteer_scoring import (
+    format_arrival_time, format_distance, get_matching_skills,
+    payload_distances, score_components, weighted_score,
+)
+from app.api.services.worker_sync import sync as worker_sync
+from app.config.database import db
 
 router = APIRouter(prefix="/ai", tags=["AI Emergency Services"])
 
@@ -16,82 +44,43 @@ class EmergencyClassificationRequest(BaseModel):
     timestamp: str
 
 class VolunteerMatchRequest(BaseModel):
-    request: dict
-    volunteers: List[dict]
+    request: dict = {}
+    volunteers: List[dict] = []
+    # Stored ids may replace the inline request and roster
+    requestId: Optional[str] = None
+    volunteerIds: List[str] = []
+
+# Volunteer matching tuning
+MATCH_RESULTS = 10
+MATCH_CANDIDATES = 200
+MATCH_RADIUS_KM = 50.0
 
 @router.post("/classify-emergency")
 async def classify_emergency(request: EmergencyClassificationRequest):
     """AI-powered emergency classification using NLP and pattern recognition"""
     
-    try:
-        # Use OpenAI GPT for emergency classification
-        prompt = f"""
-        Analyze this emergency report and provide structured classification:
-        
-        Description: "{request.description}"
-        Timestamp: {request.timestamp}
-        
-        Provide a JSON response with:
-        1. emergencyType: (food, medical, water, shelter, fire, flood, earthquake)
-        2. suggestedPriority: (low, medium, high, critical)  
-        3. urgencyScore: (0.0-1.0)
-        4. estimatedPeople: (number of people likely affected)
-        5. resourceNeeds: (list of required resources)
-        6. confidence: (0.0-1.0)
-        7. keyInsights: (list of important observations)
-        
-        Consider: Keywords, severity indicators, time sensitivity, scope of impact.
-        """
-        
-        # In production, use actual OpenAI API
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1
-        )
-        
-        ai_result = json.loads(response.choices[0].message.content)
-        
-        # Add additional AI processing for images if provided
-        if request.images:
-            image_analysis = await analyze_emergency_images(request.images)
-            ai_result.update(image_analysis)
-        
-        return ai_result
-        
-    except Exception as e:
-        # Fallback rule-based classification
-        return fallback_classification(request.description)
+    async with admission.admit("classify", min(text_priority(request.description), NORMAL)):
+        try:
+            # Async LLM call with bounded concurrency, deadline, breaker and cache
+            with stage("llm_call"):
+                ai_result = await llm_classifier.classify(request.description)
+            
+            # Add additional AI processing for images if provided
+            if request.images:
+                image_analysis = await analyze_emergency_images(request.images)
+                ai_result.update(image_analysis)
+            
+            return ai_result
+            
+        except Exception as e:
+            # Fallback rule-based classification
+            return fallback_classification(request.description, reason=type(e).__name__)
 
-def fallback_classification(description: str):
+def fallback_classification(description: str, reason: str = "unavailable"):
     """Rule-based fallback when AI service is unavailable"""
-    description_lower = description.lower()
-    
-    # Emergency type detection
-    emergency_type = "unknown"
-    if any(word in description_lower for word in ["food", "hunger", "starving", "eat"]):
-        emergency_type = "food"
-    elif any(word in description_lower for word in ["medical", "injured", "sick", "hospital", "doctor"]):
-        emergency_type = "medical"
-    elif any(word in description_lower for word in ["water", "thirsty", "drinking", "clean"]):
-        emergency_type = "water"
-    elif any(word in description_lower for word in ["shelter", "homeless", "roof", "house"]):
-        emergency_type = "shelter"
-    
-    # Priority detection
-    priority = "medium"
-    if any(word in description_lower for word in ["urgent", "critical", "emergency", "dying", "life"]):
-        priority = "critical"
-    elif any(word in description_lower for word in ["serious", "important", "severe"]):
-        priority = "high"
-    elif any(word in description_lower for word in ["minor", "small", "later"]):
-        priority = "low"
-    
-    # Estimate people affected
-    estimated_people = 1
-    for word in description.split():
-        if word.isdigit():
-            estimated_people = max(estimated_people, int(word))
+    FALLBACKS.inc(reason)
+    with stage("fallback"):
+        emergency_type, priority, estimated_people, _ = classify_text(description)
     
     return {
         "emergencyType": emergency_type,
@@ -103,68 +92,129 @@ def fallback_classification(description: str):
         "keyInsights": [f"Detected {emergency_type} emergency with {priority} priority"]
     }
 
+@router.post("/volunteers")
+async def upsert_volunteers(volunteers: List[dict]):
+    """Register or update volunteers in the server-side spatial index"""
+    
+    missing = [i for i, volunteer in enumerate(volunteers) if "id" not in volunteer]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Volunteers at positions {missing} have no id")
+    
+    return {"upserted": volunteer_index.upsert_many(volunteers), "total": len(volunteer_index)}
+
+@router.get("/volunteers/nearby")
+async def nearby_volunteers(lat: float, lng: float, k: int = 10, radiusKm: float = MATCH_RADIUS_KM):
+    """k-nearest registered volunteers within a radius"""
+    
+    volunteers, distances = volunteer_index.nearest(lat, lng, k, max_radius_km=radiusKm)
+    return {
+        "volunteers": [
+            {"volunteer": volunteer, "distanceKm": round(distance, 2)}
+            for volunteer, distance in zip(volunteers, distances.tolist())
+        ]
+    }
+
 @router.post("/match-volunteers")
 async def match_volunteers_ai(request: VolunteerMatchRequest):
     """AI-powered volunteer matching using optimization algorithms"""
     
     emergency = request.request
-    volunteers = request.volunteers
+    if not emergency and request.requestId is not None:
+        stored = await get_emergencies(db, [request.requestId])
+        if not stored:
+            raise HTTPException(status_code=404, detail=f"Unknown request {request.requestId}")
+        emergency = stored[0]
+    emergency_location = location_of(emergency)
     
-    matches = []
+    # Candidates come from the payload or stored ids when supplied, otherwise from the spatial index
+    if request.volunteers or request.volunteerIds:
+        volunteers = request.volunteers or await get_volunteers(db, request.volunteerIds)
+        roster = Roster.from_records(volunteers, details=False)
+        distances = payload_distances(emergency_location, volunteers)
+    elif emergency_location is not None:
+        with stage("candidate_search"):
+            volunteers, distances = volunteer_index.nearest(
+                *emergency_location, MATCH_CANDIDATES, max_radius_km=MATCH_RADIUS_KM
+            )
+        roster = Roster.from_records(volunteers, details=False)
+    else:
+        raise HTTPException(status_code=422, detail="Emergency location is required when no volunteers are supplied")
     
-    for volunteer in volunteers:
-        # Calculate AI matching score
-        score_components = {
-            "skill_match": calculate_skill_match(emergency["type"], volunteer["skills"]),
-            "distance": calculate_distance_score(emergency["location"], volunteer["location"]),
-            "availability": 1.0 if volunteer["status"] == "available" else 0.0,
-            "experience": min(volunteer["completedMissions"] / 50, 1.0),
-            "rating": volunteer["rating"] / 5.0
-        }
-        
-        # Weighted AI score calculation
-        ai_score = (
-            score_components["skill_match"] * 0.35 +
-            score_components["distance"] * 0.25 +
-            score_components["availability"] * 0.20 +
-            score_components["experience"] * 0.10 +
-            score_components["rating"] * 0.10
-        )
-        
-        # Generate AI reasoning
-        reasoning = generate_match_reasoning(volunteer, emergency, score_components)
+    # The dicts are already parsed, so responses reuse them instead of rebuilding from the columns
+    return {"recommendations": rank_roster(emergency, roster, distances, volunteers)}
+
+@router.post("/match-volunteers/roster")
+async def match_volunteers_roster(request: Request, requestId: Optional[str] = None, type: Optional[str] = None,
+                                  lat: Optional[float] = None, lng: Optional[float] = None):
+    """Volunteer matching against a roster sent as JSON, msgpack or Arrow IPC
+    
+    The body is the roster alone (records or columns); the emergency comes from
+    ``requestId`` or the ``type``/``lat``/``lng`` query parameters.
+    """
+    
+    emergency = {"type": type}
+    if lat is not None and lng is not None:
+        emergency.update(lat=lat, lng=lng)
+    if requestId is not None:
+        stored = await get_emergencies(db, [requestId])
+        if not stored:
+            raise HTTPException(status_code=404, detail=f"Unknown request {requestId}")
+        emergency = stored[0]
+    
+    try:
+        roster = Roster.from_payload(await request.body(), request.headers.get("content-type", ""))
+    except RosterFormatError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"Unreadable roster: {e}")
+    
+    return {"recommendations": rank_roster(emergency, roster, roster.distances_from(location_of(emergency)))}
+
+def rank_roster(emergency: dict, roster: Roster, distances: np.ndarray,
+                volunteers: Optional[List[dict]] = None) -> List[dict]:
+    """Top MATCH_RESULTS volunteers of the roster, best first"""
+    if not len(roster):
+        return []
+    
+    # Vectorized score components over the roster columns
+    with stage("scoring"):
+        components = score_components(emergency.get("type"), roster, distances)
+        ai_scores = weighted_score(components)
+    
+    # Heap-based top-k instead of sorting every candidate
+    with stage("sort"):
+        top = heapq.nlargest(MATCH_RESULTS, range(len(roster)), key=ai_scores.__getitem__)
+    
+    matches = []
+    for i in top:
+        volunteer = volunteers[i] if volunteers is not None else roster.record(i)
+        volunteer_components = {name: float(values[i]) for name, values in components.items()}
+        distance_km = None if np.isnan(distances[i]) else float(distances[i])
         
         matches.append({
             "volunteer": volunteer,
-            "aiScore": ai_score,
-            "confidence": calculate_confidence(score_components),
-            "skillMatches": get_matching_skills(emergency["type"], volunteer["skills"]),
-            "skillMatchPercentage": int(score_components["skill_match"] * 100),
-            "distance": calculate_distance(emergency["location"], volunteer["location"]),
-            "estimatedArrival": calculate_arrival_time(emergency["location"], volunteer["location"]),
-            "aiReasoning": reasoning
+            "aiScore": float(ai_scores[i]),
+            "confidence": calculate_confidence(volunteer_components),
+            "skillMatches": get_matching_skills(emergency.get("type"), volunteer.get("skills", [])),
+            "skillMatchPercentage": int(volunteer_components["skill_match"] * 100),
+            "distance": format_distance(distance_km),
+            "estimatedArrival": format_arrival_time(distance_km),
+            "aiReasoning": generate_match_reasoning(volunteer, emergency, volunteer_components)
         })
     
-    # Sort by AI score
-    matches.sort(key=lambda x: x["aiScore"], reverse=True)
-    
-    return {"recommendations": matches[:10]}
+    return matches
 
-def calculate_skill_match(emergency_type: str, volunteer_skills: List[str]) -> float:
-    """Calculate skill matching score"""
-    skill_mapping = {
-        "medical": ["medical", "rescue", "first_aid"],
-        "food": ["food", "logistics", "distribution"],
-        "water": ["water", "sanitation", "logistics"],
-        "shelter": ["shelter", "construction", "logistics"]
-    }
-    
-    required_skills = skill_mapping.get(emergency_type, [])
-    if not required_skills:
-        return 0.5
-    
-    matches = len(set(required_skills) & set(volunteer_skills))
-    return min(matches / len(required_skills), 1.0)
+def calculate_confidence(score_components: dict) -> float:
+    """Confidence is higher when the score components agree with each other"""
+    values = np.array(list(score_components.values()))
+    return round(float(values.mean() * (1 - values.std() / 2)), 3)
+
+def generate_match_reasoning(volunteer: dict, emergency: dict, score_components: dict) -> str:
+    strengths = [name.replace("_", " ") for name, value in score_components.items() if value >= 0.7]
+    return (
+        f"{volunteer.get('name', 'Volunteer')} for {emergency.get('type', 'this')} emergency - "
+        f"strong on {', '.join(strengths) if strengths else 'overall availability'}"
+    )
 
 @router.post("/disaster-predictions")
 async def predict_disasters(data: dict):
@@ -175,137 +225,221 @@ async def predict_disasters(data: dict):
     current_requests = data.get("currentEmergencies", [])
     timeframe = data.get("timeframe", "24h")
     
-    # Mock AI prediction model
-    predictions = {
-        "predictedIncidents": [
-            {"type": "medical", "predicted": 3, "confidence": 0.75},
-            {"type": "flood", "predicted": 1, "confidence": 0.85},
-            {"type": "food", "predicted": 2, "confidence": 0.65}
-        ],
-        "riskAreas": [
-            {
-                "location": "Central Delhi",
-                "riskScore": 0.8,
-                "primaryThreat": "Flash flooding due to heavy rainfall",
-                "peakTime": "Next 6-12 hours",
-                "riskFactors": ["Heavy rainfall", "Poor drainage", "High population density"]
-            },
-            {
-                "location": "Gurgaon",
-                "riskScore": 0.6,
-                "primaryThreat": "Medical emergency surge",
-                "peakTime": "Next 24 hours",
-                "riskFactors": ["Extreme heat", "Air quality", "Vulnerable population"]
-            }
-        ],
-        "resourceForeccast": {
-            "medical_kits": {"predicted": 25, "current": 18, "trend": "up", "change": "+40%"},
-            "food_packets": {"predicted": 150, "current": 120, "trend": "up", "change": "+25%"},
-            "water_bottles": {"predicted": 300, "current": 280, "trend": "stable", "change": "+7%"}
-        },
-        "actionableInsights": [
-            {
-                "title": "Pre-position Medical Teams",
-                "description": "Deploy additional medical teams to high-risk areas before peak demand",
-                "priority": "high",
-                "confidence": 0.87,
-                "impact": "Reduce response time by 40%",
-                "timeframe": "Next 6 hours"
-            },
-            {
-                "title": "Flood Preparation",
-                "description": "Activate flood response protocols in Central Delhi area",
-                "priority": "high",
-                "confidence": 0.82,
-                "impact": "Prevent 200+ evacuations",
-                "timeframe": "Immediate"
-            }
-        ],
-        "modelConfidence": 0.78
-    }
+    # Checked up front so a malformed entry can't leave the forecasts half-updated
+    if not (isinstance(historical_data, list) and isinstance(current_requests, list)
+            and all(isinstance(incident, dict) for incident in [*historical_data, *current_requests])):
+        raise HTTPException(status_code=422, detail="historicalIncidents and currentEmergencies must be lists of objects")
+    if not isinstance(weather_data, dict):
+        raise HTTPException(status_code=422, detail="weatherData must be an object")
+    
+    # Incidents already counted (same id) are skipped, so clients may resend history safely
+    # and every worker (and the heatmap) sees the same incidents
+    for incident in [*historical_data, *current_requests]:
+        publish_incident(incident)
+    if weather_data and prediction_engine.set_weather(weather_data):
+        worker_sync.publish("weather", weather_data)
     
-    return predictions
+    def build():
+        forecast = prediction_engine.forecast(timeframe)
+        return {
+            "predictedIncidents": forecast["predictedIncidents"],
+            "riskAreas": forecast["riskAreas"],
+            "resourceForecast": resource_forecaster.totals(parse_timeframe(timeframe)),
+            "actionableInsights": forecast["actionableInsights"],
+            "modelConfidence": forecast["modelConfidence"]
+        }
+    
+    # Resent history and unchanged weather leave the versions alone, so the serialized body is reused
+    entry = response_cache.body(("ai-disaster-predictions", timeframe),
+                                (prediction_engine.version, resource_forecaster.version), build)
+    return Response(entry.body, media_type="application/json")
 
 @router.post("/analyze-image")
-async def analyze_emergency_image(file: UploadFile = File(...)):
-    """AI image analysis for damage assessment and people counting"""
+async def analyze_emergency_image(request: Request):
+    """AI image analysis for damage assessment (first file of a multipart upload)"""
     
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data upload")
+    content_length = request.headers.get("content-length", "")
+    
+    # The body is spooled once as it streams in (size-checked on the way) and decoded at working
+    # resolution in a worker process. Only the analysis takes an admission slot; photos are low
+    # priority next to text reports when the lane is backed up
     try:
-        # Read image file
-        image_data = await file.read()
-        
-        # In production, use computer vision models like:
-        # - YOLO for object detection (people, vehicles, damage)
-        # - CNN for damage assessment
-        # - OCR for reading signs/text
-        
-        # Mock analysis results
-        analysis = {
-            "detectedType": "flood",
-            "damageLevel": 7.5,  # 0-10 scale
-            "peopleDetected": 3,
-            "vehiclesDetected": 1,
-            "hazards": ["standing_water", "debris", "electrical_hazard"],
-            "confidence": 0.89,
-            "urgencyScore": 0.85,
-            "keyFindings": [
-                "Significant water damage visible",
-                "3 people appear to need assistance", 
-                "Electrical hazards present",
-                "Road access partially blocked"
-            ],
-            "recommendedActions": [
-                "Immediate evacuation recommended",
-                "Turn off electricity in area",
-                "Deploy water rescue team"
-            ]
-        }
-        
-        return analysis
-        
+        return await image_analyzer.analyze_stream(options[b"boundary"], request.stream(),
+                                                   int(content_length) if content_length.isdigit() else None,
+                                                   admit=lambda: admission.admit("image", LOW))
+    except Overloaded:
+        raise
+    except ImageQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except (ImageTooLarge, TooManyImages) as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except MalformedUpload as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except UnidentifiedImageError:
+        raise HTTPException(status_code=422, detail="Upload is not a readable image")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
 
+@router.post("/analyze-images")
+async def analyze_emergency_image_batch(request: Request):
+    """Batch image analysis for a site, streamed back as NDJSON"""
+    
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data upload")
+    
+    # Each file starts analysing as soon as its part ends, while later parts are still uploading
+    parts, tasks = [], []
+    
+    def submit(part):
+        parts.append(part)
+        tasks.append(asyncio.create_task(image_analyzer.analyze_part(part)))
+    
+    def abandon():
+        # A task cancelled before it first runs never reaches its cleanup, so close spools here too
+        reader.close()
+        for task in tasks:
+            task.cancel()
+        for part in parts:
+            part.spool.close()
+    
+    reader = MultipartImageReader(options[b"boundary"], submit)
+    try:
+        async for chunk in request.stream():
+            reader.write(chunk)
+        reader.finalize()
+    except TooManyImages as e:
+        abandon()
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        abandon()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+    except BaseException:
+        abandon()
+        raise
+    if not tasks:
+        raise HTTPException(status_code=422, detail="No image files in request")
+    
+    async def ndjson_results():
+        results = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                results.append(result)
+                yield json.dumps(result) + "\n"
+            yield json.dumps({"summary": site_summary(results)}) + "\n"
+        finally:
+            abandon()
+    
+    return StreamingResponse(ndjson_results(), media_type="application/x-ndjson")
+
+@router.get("/analyze-image/cache")
+async def image_cache_stats():
+    """Hit/miss counters of the near-duplicate image cache"""
+    return image_analyzer.cache.stats()
+
 @router.post("/emergency-chat")  
 async def emergency_chat_ai(data: dict):
     """AI chatbot for emergency assistance"""
     
-    user_message = data.get("message", "")
-    context = data.get("context", {})
-    
-    # Detect urgency level
-    urgency_level = detect_urgency(user_message)
-    
-    # Generate AI response using NLP
-    if urgency_level > 0.8:
-        response = {
-            "message": "This sounds like a serious emergency! I'm going to help you report this immediately. Please provide your location and I'll connect you with emergency services.",
-            "urgencyLevel": urgency_level,
-            "actions": [
-                {"type": "call_emergency", "text": "📞 Call Emergency Services Now"},
-                {"type": "open_form", "text": "📋 Fill Emergency Form"}
-            ],
-            "emergencyData": extract_emergency_info(user_message)
-        }
-    else:
-        response = {
-            "message": generate_helpful_response(user_message, context),
-            "urgencyLevel": urgency_level,
-            "actions": get_suggested_actions(user_message)
-        }
+    # Facts and urgency accumulate per sessionId; only the new message is scanned
+    message, context, session_id = data.get("message", ""), data.get("context") or {}, data.get("sessionId")
+    if not isinstance(message, str) or not isinstance(context, dict) or not isinstance(session_id, (str, type(None))):
+        raise HTTPException(status_code=422, detail="Expected {message: str, context?: object, sessionId?: str}")
+    # No admission lane: a turn is one keyword scan (plus a session read/write in multi-worker mode)
+    return await chat_engine.handle(message, context, session_id)
+
+@router.post("/analyze-sentiment")
+async def analyze_sentiment(data: dict):
+    """Sentiment & distress scoring for one message ({text, area}) or many ({texts, areas})"""
+    
+    if "texts" in data:
+        texts = [str(text) for text in data["texts"]]
+        areas = data.get("areas") or [data.get("area")] * len(texts)
+        if len(areas) != len(texts):
+            raise HTTPException(status_code=422, detail="areas must match texts in length")
+        scores = sentiment.score_many(texts)
+        for area, score in zip(areas, scores):
+            if area:
+                record_sentiment(str(area), score)
+        return {"results": scores, "areas": sentiment.tracker.summary()}
     
-    return response
+    score = sentiment.score_text(str(data.get("text") or data.get("message") or ""))
+    area = data.get("area")
+    if area:
+        record_sentiment(str(area), score)
+        score["areaAggregate"] = sentiment.tracker.area(str(area))
+    return score
+
+def record_sentiment(area: str, score: dict):
+    at = sentiment.tracker.clock()
+    sentiment.tracker.record(area, score, at)
+    worker_sync.publish("sentiment", {"area": area, "score": score, "at": at})
 
-def detect_urgency(message: str) -> float:
-    """Detect urgency level in user message"""
-    urgent_keywords = ["emergency", "urgent", "help", "dying", "critical", "fire", "flood", "accident"]
-    message_lower = message.lower()
+@router.get("/analyze-sentiment/areas")
+async def sentiment_by_area():
+    """Rolling (1 h half-life) sentiment and distress per area"""
+    return {"areas": sentiment.tracker.summary()}
+
+@router.post("/resource-predictions")
+async def resource_predictions(data: dict):
+    """Per-area resource demand forecast with depletion ETAs
     
-    urgency_score = 0.0
-    for keyword in urgent_keywords:
-        if keyword in message_lower:
-            urgency_score += 0.2
+    Optional body: {"timeframe": "24h", "area": "...", "inventory": {area: {resource: quantity}}}
+    """
+    if data.get("inventory"):
+        # Validate the whole payload before any stock changes or is sent to the other workers
+        try:
+            inventory = parse_inventory(data["inventory"])
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        resource_forecaster.set_inventory(inventory)
+        worker_sync.publish("inventory", inventory)
+    return resource_forecaster.forecast(data.get("timeframe", "24h"), data.get("area"))
+
+async def stored_emergencies(ids: Optional[List[str]]) -> List[dict]:
+    """Stored emergencies by id, or every open one when no ids are given"""
+    if ids:
+        return await get_emergencies(db, ids)
+    return await query_emergencies(db, status="open", limit=10000)
+
+async def stored_volunteers(ids: Optional[List[str]]) -> List[dict]:
+    """Stored volunteers by id, or every available one when no ids are given"""
+    if ids:
+        return await get_volunteers(db, ids)
+    return await query_volunteers(db, status="available")
+
+@router.post("/optimize-volunteers")
+async def optimize_volunteers(data: dict):
+    """Global volunteer dispatch across all open emergencies"""
+    
+    plan_id = data.get("planId")
+    try:
+        if plan_id:
+            # Incremental re-solve of a previous plan after a few changes
+            with stage("assignment_solve"):
+                plan = volunteer_optimizer.resolve(
+                    plan_id,
+                    volunteer_updates=data.get("volunteerUpdates", []),
+                    new_emergencies=data.get("requests", []),
+                    closed_emergencies=data.get("closedRequests", []),
+                )
+        else:
+            requests = data.get("requests") or await stored_emergencies(data.get("requestIds"))
+            volunteers = data.get("volunteers") or await stored_volunteers(data.get("volunteerIds"))
+            open_requests = [r for r in requests if r.get("status", "open") not in ("resolved", "closed")]
+            with stage("assignment_solve"):
+                plan = volunteer_optimizer.solve(open_requests, volunteers)
+    except KeyError as e:
+        raise HTTPException(status_code=404 if plan_id else 422, detail=f"Unknown plan or missing id: {e}")
     
-    return min(urgency_score, 1.0)
+    summary = plan_summary(plan)
+    gain = (summary["totalScore"] - summary["greedyScore"]) / summary["greedyScore"] if summary["greedyScore"] else 0.0
+    summary["improvement"] = f"{gain * 100:.1f}%"
+    hub.publish("assignments", summary, key=plan.id)
+    return summary
 
 # Additional utility functions...
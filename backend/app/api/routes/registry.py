@@ -0,0 +1,59 @@
+# backend/app/api/routes/registry.py
+"""The one place the API's routers are mounted.
+
+Each capability lives in exactly one router and is mounted once. Older paths
+the frontend still calls are registered as aliases of the same endpoint
+rather than copies of it, and mounting fails fast if two routes claim the
+same method and path, so duplicates cannot creep back into main.py.
+"""
+import importlib
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+# (module, prefix): the router's own prefix (e.g. /ai) is appended to this one
+ROUTERS: List[Tuple[str, str]] = [
+    ("app.api.routes.ai_emergency", "/api"),
+]
+
+# Legacy path -> canonical path of the endpoint that serves it
+ALIASES: Dict[str, str] = {
+    "/api/emergency-chat": "/api/ai/emergency-chat",
+}
+
+
+def api_routes(app: FastAPI) -> List[Tuple[str, APIRoute]]:
+    """``(full path, route)`` for the app's own routes and every mounted router's."""
+    routes = [(route.path, route) for route in app.router.routes if isinstance(route, APIRoute)]
+    for module_name, prefix in getattr(app.state, "mounted_routers", {}).items():
+        router = importlib.import_module(module_name).router
+        routes += [(prefix + route.path, route) for route in router.routes if isinstance(route, APIRoute)]
+    return routes
+
+
+def duplicate_routes(app: FastAPI) -> List[str]:
+    counts = Counter((method, path) for path, route in api_routes(app) for method in route.methods)
+    return sorted(f"{method} {path}" for (method, path), count in counts.items() if count > 1)
+
+
+def mount_routers(app: FastAPI):
+    """Include every router and alias once; safe to call again."""
+    mounted: Dict[str, str] = getattr(app.state, "mounted_routers", {})
+    for module_name, prefix in ROUTERS:
+        if module_name in mounted:
+            continue
+        app.include_router(importlib.import_module(module_name).router, prefix=prefix)
+        mounted[module_name] = prefix
+    app.state.mounted_routers = mounted
+
+    paths = dict(api_routes(app))
+    for alias, target in ALIASES.items():
+        if alias not in paths:
+            route = paths[target]
+            app.add_api_route(alias, route.endpoint, methods=list(route.methods), include_in_schema=False)
+
+    duplicates = duplicate_routes(app)
+    if duplicates:
+        raise RuntimeError(f"Routes registered more than once: {', '.join(duplicates)}")
@@ -0,0 +1,194 @@
+# backend/app/api/services/admission.py
+"""Priority-aware admission control for the intake endpoints.
+
+Report classification and image analysis share one event loop with the
+rest of the API. The parts of them that actually wait (model inference, the
+LLM call, the image worker pool) run in their own lane with a concurrency
+limit and a bounded priority queue; synchronous work such as a keyword scan
+never queues and is not admitted. A report is pre-classified with the
+urgency keywords the chat already uses: critical reports jump ahead of queued work,
+and a critical arrival at a full queue pushes out the newest low-priority
+waiter. Non-critical work is shed with ``Overloaded`` (mapped to 503 +
+``Retry-After``) when the queue is full or when its estimated wait is
+longer than the lane's latency target. The wait estimate is the number of
+requests ahead of it times a moving average of the lane's service time.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from app.api.services.ai_classifier import scan, urgency_level
+from app.api.services.metrics import Counter, Gauge, Histogram, registry
+from app.config import server
+
+CRITICAL, NORMAL, LOW = 0, 1, 2
+PRIORITY_NAMES = ("critical", "normal", "low")
+
+# Weight of the newest sample in the service-time moving average
+SERVICE_TIME_ALPHA = 0.2
+
+QUEUE_DEPTH = registry.register(Gauge(
+    "crisis_admission_queue_depth", "Requests waiting for an admission slot", ("lane",)))
+ADMITTED_IN_FLIGHT = registry.register(Gauge(
+    "crisis_admission_in_flight", "Admitted requests currently running", ("lane",)))
+SHED = registry.register(Counter(
+    "crisis_admission_shed_total", "Requests rejected with 503 by admission control", ("lane", "priority", "reason")))
+QUEUE_WAIT = registry.register(Histogram(
+    "crisis_admission_wait_seconds", "Time spent queued before admission", ("lane", "priority")))
+
+
+class Overloaded(Exception):
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"{lane} is overloaded ({reason}), retry in {retry_after}s")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def text_priority(text: str, critical: bool = False) -> int:
+    """Cheap urgency pre-classification: one keyword scan, no model."""
+    if critical:
+        return CRITICAL
+    level = urgency_level(scan(text))
+    return CRITICAL if level > 0.8 else NORMAL if level > 0.5 else LOW
+
+
+class Lane:
+    def __init__(self, name: str, limit: int, max_queue: int,
+                 latency_target_s: float = server.ADMISSION_LATENCY_TARGET_S):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.latency_target_s = latency_target_s
+        self.active = 0
+        self.service_s = 0.0
+        # Heap of [priority, seq, future]; removed entries get future=None
+        self._waiters: List[list] = []
+        self._seq = itertools.count()
+        self.queued = [0, 0, 0]
+        self.admitted = [0, 0, 0]
+        self.shed = [0, 0, 0]
+
+    @property
+    def depth(self) -> int:
+        return sum(self.queued)
+
+    def estimated_wait(self, priority: int) -> float:
+        """Seconds until a new request at ``priority`` would start running."""
+        ahead = sum(self.queued[:priority + 1])
+        return (ahead + 1) / self.limit * self.service_s
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.depth / self.limit * self.service_s))
+
+    def _reject(self, priority: int, reason: str) -> Overloaded:
+        self.shed[priority] += 1
+        SHED.inc(self.name, PRIORITY_NAMES[priority], reason)
+        return Overloaded(self.name, reason, self.retry_after())
+
+    def _evict(self) -> bool:
+        """Shed the newest waiter of the lowest queued priority to make room for critical work."""
+        victims = [entry for entry in self._waiters if entry[2] is not None and entry[0] != CRITICAL]
+        if not victims:
+            return False
+        victim = max(victims, key=lambda entry: (entry[0], entry[1]))
+        priority, future = victim[0], victim[2]
+        victim[2] = None
+        self.queued[priority] -= 1
+        QUEUE_DEPTH.set(self.name, value=self.depth)
+        future.set_exception(self._reject(priority, "evicted"))
+        return True
+
+    async def acquire(self, priority: int = NORMAL) -> float:
+        """Wait for a slot (critical work first); returns the seconds spent queued."""
+        if self.active < self.limit and not self.depth:
+            self.active += 1
+            self.admitted[priority] += 1
+            ADMITTED_IN_FLIGHT.set(self.name, value=self.active)
+            return 0.0
+
+        if priority != CRITICAL:
+            if self.depth >= self.max_queue:
+                raise self._reject(priority, "queue_full")
+            if self.estimated_wait(priority) > self.latency_target_s:
+                raise self._reject(priority, "latency")
+        elif self.depth >= self.max_queue and not self._evict():
+            raise self._reject(priority, "queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._seq), future]
+        heapq.heappush(self._waiters, entry)
+        self.queued[priority] += 1
+        QUEUE_DEPTH.set(self.name, value=self.depth)
+        started = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if entry[2] is None:
+                pass  # already evicted
+            elif future.cancelled():
+                entry[2] = None
+                self.queued[priority] -= 1
+                QUEUE_DEPTH.set(self.name, value=self.depth)
+            else:
+                # The slot was handed over just before the client went away
+                self.release()
+            raise
+        waited = time.perf_counter() - started
+        self.admitted[priority] += 1
+        QUEUE_WAIT.observe(self.name, PRIORITY_NAMES[priority], value=waited)
+        return waited
+
+    def release(self, service_s: Optional[float] = None):
+        """Free a slot, handing it straight to the most urgent waiter."""
+        if service_s is not None:
+            self.service_s += SERVICE_TIME_ALPHA * (service_s - self.service_s)
+        while self._waiters:
+            priority, _, future = heapq.heappop(self._waiters)
+            if future is None or future.done():
+                continue
+            self.queued[priority] -= 1
+            QUEUE_DEPTH.set(self.name, value=self.depth)
+            future.set_result(None)
+            return
+        self.active -= 1
+        ADMITTED_IN_FLIGHT.set(self.name, value=self.active)
+
+    @asynccontextmanager
+    async def admit(self, priority: int = NORMAL):
+        await self.acquire(priority)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "maxQueue": self.max_queue,
+            "active": self.active,
+            "queued": dict(zip(PRIORITY_NAMES, self.queued)),
+            "admitted": dict(zip(PRIORITY_NAMES, self.admitted)),
+            "shed": dict(zip(PRIORITY_NAMES, self.shed)),
+            "serviceMs": round(self.service_s * 1000, 2),
+        }
+
+
+class AdmissionController:
+    def __init__(self, lanes: Dict[str, tuple] = server.ADMISSION_LANES):
+        self.lanes = {name: Lane(name, limit, max_queue) for name, (limit, max_queue) in lanes.items()}
+
+    def admit(self, lane: str, priority: int = NORMAL):
+        """``async with admission.admit("classify", priority): ...``"""
+        return self.lanes[lane].admit(priority)
+
+    def stats(self) -> dict:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+
+admission = AdmissionController()
@@ -0,0 +1,209 @@
+# backend/app/api/services/ai_classifier.py
+"""Shared keyword classifier used by every rule-based emergency endpoint.
+
+All vocabularies (emergency type, priority, urgency) are compiled into one
+trie-shaped regular expression, so a description is scanned exactly once no
+matter how many keywords we know about. Matching keeps the original
+substring semantics of the ``any(word in text ...)`` checks it replaces.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Label order inside each vocabulary is its precedence: when a text hits
+# several labels, the first one listed wins.
+VOCABULARIES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "type": {
+        "medical": ("medical", "injured", "sick", "hospital", "doctor", "ambulance"),
+        "food": ("food", "hunger", "hungry", "starving", "eat", "nutrition", "supplies"),
+        "water": ("water", "thirsty", "drinking", "clean", "contaminated"),
+        "shelter": ("shelter", "homeless", "roof", "house", "building"),
+    },
+    "priority": {
+        "critical": ("urgent", "critical", "dying", "emergency", "life", "death"),
+        "high": ("serious", "important", "severe", "bad", "help"),
+        "low": ("minor", "small", "later", "tomorrow"),
+    },
+    "urgency": {
+        "urgent": ("emergency", "urgent", "help", "critical", "dying", "fire",
+                   "flood", "accident", "blood", "unconscious"),
+        "moderate": ("sick", "injured", "pain", "need help", "problem", "trouble"),
+    },
+}
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a prefix-sharing regex so each position is tried in O(depth)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class ScanResult:
+    """Every keyword and standalone number found in one pass over a text."""
+
+    __slots__ = ("keywords", "labels", "numbers", "vocabularies")
+
+    def __init__(self, vocabularies: Dict[str, Dict[str, Tuple[str, ...]]] = VOCABULARIES):
+        self.vocabularies = vocabularies
+        self.keywords: Dict[str, int] = {}
+        self.labels: Dict[str, Dict[str, List[str]]] = {}
+        self.numbers: List[int] = []
+
+    def has(self, vocabulary: str, label: str) -> bool:
+        return label in self.labels.get(vocabulary, {})
+
+    def first_label(self, vocabulary: str) -> Optional[str]:
+        """Highest-precedence label hit in ``vocabulary``, or None."""
+        hits = self.labels.get(vocabulary)
+        if not hits:
+            return None
+        for label in self.vocabularies[vocabulary]:
+            if label in hits:
+                return label
+        return None
+
+    def distinct(self, vocabulary: str, label: str) -> int:
+        """Number of distinct keywords of ``label`` present in the text."""
+        return len(self.labels.get(vocabulary, {}).get(label, ()))
+
+
+class KeywordMatcher:
+    """Compiled multi-vocabulary matcher returning all hits in one pass."""
+
+    def __init__(self, vocabularies: Dict[str, Dict[str, Tuple[str, ...]]]):
+        self.vocabularies = vocabularies
+        self.targets: Dict[str, List[Tuple[str, str]]] = {}
+        for vocabulary, labels in vocabularies.items():
+            for label, words in labels.items():
+                for word in words:
+                    self.targets.setdefault(word, []).append((vocabulary, label))
+
+        # The lookahead reports the longest keyword starting at every offset,
+        # so overlapping matches are kept. Shorter keywords starting at the
+        # same offset are recovered through ``implied``.
+        self.implied: Dict[str, Tuple[str, ...]] = {
+            word: tuple(other for other in self.targets if word.startswith(other))
+            for word in self.targets
+        }
+        self.pattern = re.compile(
+            r"(?=(?P<kw>" + _trie_pattern(self.targets) + r"))"
+            r"|(?<!\S)(?P<num>\d+)(?!\S)"
+        )
+
+        # Dense keyword -> label incidence matrix for batch scoring.
+        self.keyword_ids = {word: i for i, word in enumerate(self.targets)}
+        self.label_columns: Dict[str, List[int]] = {}
+        columns: List[Tuple[str, str]] = []
+        for vocabulary, labels in vocabularies.items():
+            for label in labels:
+                self.label_columns.setdefault(vocabulary, []).append(len(columns))
+                columns.append((vocabulary, label))
+        column_ids = {column: i for i, column in enumerate(columns)}
+        self.incidence = np.zeros((len(self.keyword_ids), len(columns)), dtype=np.int32)
+        for word, hits in self.targets.items():
+            for hit in hits:
+                self.incidence[self.keyword_ids[word], column_ids[hit]] = 1
+
+    def scan(self, text: str) -> ScanResult:
+        result = ScanResult(self.vocabularies)
+        keywords = result.keywords
+        for match in self.pattern.finditer(text.lower()):
+            word = match.group("kw")
+            if word is None:
+                result.numbers.append(int(match.group("num")))
+                continue
+            for found in self.implied[word]:
+                keywords[found] = keywords.get(found, 0) + 1
+
+        for word in keywords:
+            for vocabulary, label in self.targets[word]:
+                result.labels.setdefault(vocabulary, {}).setdefault(label, []).append(word)
+        return result
+
+    def term_matrix(self, texts: Sequence[str]):
+        """Scan a batch into a ``(documents x keywords)`` count matrix.
+
+        Returns the matrix together with the standalone numbers of each text.
+        """
+        terms = np.zeros((len(texts), len(self.keyword_ids)), dtype=np.int32)
+        numbers: List[List[int]] = []
+        for row, text in enumerate(texts):
+            result = self.scan(text)
+            if result.keywords:
+                ids = [self.keyword_ids[word] for word in result.keywords]
+                terms[row, ids] = list(result.keywords.values())
+            numbers.append(result.numbers)
+        return terms, numbers
+
+    def first_labels(self, label_hits, vocabulary: str) -> List[Optional[str]]:
+        """Vectorized ``ScanResult.first_label`` over a label-hit matrix."""
+        labels = list(self.vocabularies[vocabulary])
+        present = label_hits[:, self.label_columns[vocabulary]] > 0
+        first = present.argmax(axis=1)
+        found = present.any(axis=1)
+        return [labels[index] if hit else None for index, hit in zip(first.tolist(), found.tolist())]
+
+
+matcher = KeywordMatcher(VOCABULARIES)
+
+
+def scan(text: str) -> ScanResult:
+    """Scan ``text`` with the shared matcher."""
+    return matcher.scan(text)
+
+
+def classify_text(description: str, default_type: str = "unknown",
+                  default_priority: str = "medium", baseline_people: int = 1):
+    """Return ``(emergency_type, priority, estimated_people, scan_result)``."""
+    result = scan(description)
+    emergency_type = result.first_label("type") or default_type
+    priority = result.first_label("priority") or default_priority
+    estimated_people = max([baseline_people, *result.numbers])
+    return emergency_type, priority, estimated_people, result
+
+
+def classify_batch(descriptions: Sequence[str], default_types: Sequence[str],
+                   default_priorities: Sequence[str], baseline_people: Sequence[int]):
+    """Batch form of :func:`classify_text` without the per-item scan results.
+
+    The whole batch is scored with one matrix product against the keyword
+    incidence matrix; precedence and defaults match the single-item path.
+    """
+    if not descriptions:
+        return []
+    terms, numbers = matcher.term_matrix(descriptions)
+    label_hits = terms @ matcher.incidence
+    types = matcher.first_labels(label_hits, "type")
+    priorities = matcher.first_labels(label_hits, "priority")
+    return [
+        (emergency_type or default_type, priority or default_priority, max([baseline, *found]))
+        for emergency_type, priority, found, default_type, default_priority, baseline
+        in zip(types, priorities, numbers, default_types, default_priorities, baseline_people)
+    ]
+
+
+def urgency_level(result: ScanResult) -> float:
+    """Tiered chat urgency: 0.9 urgent, 0.6 moderate, 0.3 otherwise."""
+    if result.has("urgency", "urgent"):
+        return 0.9
+    if result.has("urgency", "moderate"):
+        return 0.6
+    return 0.3
@@ -0,0 +1,205 @@
+# backend/app/api/services/chat_engine.py
+"""Server-side chat sessions for the emergency assistant.
+
+Each conversation keeps the facts extracted so far (emergency type, people
+affected, location, peak urgency) in a bounded LRU with TTL eviction. A turn
+scans only the new message with one compiled matcher for type and urgency
+keywords and folds the hits into the session, so clients send one message
+per turn instead of the whole history. When several workers serve the API
+the session state is kept in SQLite instead, so consecutive turns may land
+on any worker.
+"""
+import re
+import uuid
+from typing import Dict, Optional
+
+from app.api.models import chat_model
+from app.api.services.ai_classifier import VOCABULARIES, KeywordMatcher, ScanResult, urgency_level
+from app.api.services.ttl_cache import TTLCache
+from app.config import ai_config
+from app.config.database import Database
+
+CHAT_VOCABULARIES = {
+    "type": {
+        "medical": ("medical", "sick", "injured", "doctor", "hospital"),
+        "fire": ("fire", "burning", "smoke", "flames"),
+        "flood": ("flood", "water", "drowning"),
+        "food": ("food", "hungry", "starving"),
+    },
+    "urgency": VOCABULARIES["urgency"],
+}
+
+# "5 people", "3 of us" ... and "at/in/near <Capitalised Place Name>"
+FACT_PATTERN = re.compile(
+    r"(?P<people>\d{1,4})\s+(?i:people|persons?|children|kids|adults|families|of us|injured|trapped)\b"
+    r"|\b(?i:at|in|near|around)\s+(?P<location>[A-Z][\w'-]*(?:\s+[A-Z][\w'-]*){0,3})"
+)
+
+chat_matcher = KeywordMatcher(CHAT_VOCABULARIES)
+
+
+def parse_count(value) -> Optional[int]:
+    """A client-supplied head count, or None when it isn't a number ("many", "")."""
+    try:
+        return int(value) if value is not None and not isinstance(value, bool) else None
+    except (TypeError, ValueError):
+        return None
+
+
+class ChatSession:
+    __slots__ = ("id", "turns", "type_hits", "people", "location", "urgency", "last_message")
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.turns = 0
+        self.type_hits: Dict[str, int] = {}
+        self.people: Optional[int] = None
+        self.location = None
+        self.urgency = 0.0
+        self.last_message = ""
+
+    @property
+    def emergency_type(self) -> str:
+        """Type with the most keyword hits so far; ties go to the earlier-listed type."""
+        if not self.type_hits:
+            return "unknown"
+        order = list(CHAT_VOCABULARIES["type"])
+        return max(self.type_hits, key=lambda label: (self.type_hits[label], -order.index(label)))
+
+    def update(self, message: str, result: ScanResult, context: dict) -> float:
+        """Fold one message into the session; returns that message's own urgency."""
+        self.turns += 1
+        self.last_message = message
+        for label, words in result.labels.get("type", {}).items():
+            self.type_hits[label] = self.type_hits.get(label, 0) + len(words)
+        for match in FACT_PATTERN.finditer(message):
+            if match.group("people"):
+                self.people = max(self.people or 0, int(match.group("people")))
+            else:
+                self.location = match.group("location")
+
+        # Facts the client already knows (form fields, GPS) override what was parsed
+        location, emergency_type = context.get("location"), context.get("emergencyType")
+        if location and isinstance(location, str):
+            self.location = location
+        people = parse_count(context.get("peopleCount"))
+        if people:
+            self.people = people
+        if emergency_type and isinstance(emergency_type, str):
+            self.type_hits[emergency_type] = self.type_hits.get(emergency_type, 0) + 10
+
+        message_urgency = urgency_level(result)
+        self.urgency = max(self.urgency, message_urgency)
+        return message_urgency
+
+    def state(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ChatSession":
+        session = cls(state["id"])
+        for name in cls.__slots__:
+            setattr(session, name, state.get(name, getattr(session, name)))
+        return session
+
+    def facts(self) -> dict:
+        return {
+            "type": self.emergency_type,
+            "peopleCount": self.people,
+            "location": self.location,
+            "extractedInfo": self.last_message,
+        }
+
+
+class ChatEngine:
+    def __init__(self, max_sessions: int = ai_config.CHAT_SESSION_LIMIT,
+                 ttl_seconds: float = ai_config.CHAT_SESSION_TTL_S):
+        self.sessions = TTLCache(max_sessions, ttl_seconds)
+        self.ttl = ttl_seconds
+        # Set in multi-worker mode: sessions then live in the shared database
+        self.store: Optional[Database] = None
+
+    def session(self, session_id: Optional[str]) -> ChatSession:
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            session = ChatSession(session_id or uuid.uuid4().hex)
+        # Re-setting refreshes the TTL and the LRU position
+        self.sessions.set(session.id, session)
+        return session
+
+    def turn(self, session: ChatSession, message: str, context: dict) -> dict:
+        message_urgency = session.update(message, chat_matcher.scan(message), context)
+        response = respond(session)
+        response.update({"sessionId": session.id, "turn": session.turns, "messageUrgency": message_urgency})
+        return response
+
+    async def handle(self, message: str, context: Optional[dict] = None, session_id: Optional[str] = None) -> dict:
+        context = context if isinstance(context, dict) else {}
+        session_id = session_id or context.get("sessionId")
+        if self.store is None:
+            return self.turn(self.session(session_id), message, context)
+
+        state = await chat_model.load_session(self.store, session_id) if session_id else None
+        session = ChatSession.from_state(state) if state else ChatSession(session_id or uuid.uuid4().hex)
+        response = self.turn(session, message, context)
+        await chat_model.save_session(self.store, session.id, session.state(), self.ttl)
+        return response
+
+    async def stats(self) -> dict:
+        if self.store is not None:
+            return {"store": "sqlite", "active": await chat_model.count_active(self.store), "ttlSeconds": self.ttl}
+        return {"store": "memory", **self.sessions.stats()}
+
+
+def follow_up(session: ChatSession) -> str:
+    """Ask for whichever key fact is still missing."""
+    if session.location is None:
+        return " Please share your exact location."
+    if session.people is None:
+        return " How many people need help?"
+    return ""
+
+
+def respond(session: ChatSession) -> dict:
+    emergency_type = session.emergency_type
+    known_type = emergency_type if emergency_type != "unknown" else ""
+    location_action = [] if session.location else [{"type": "get_location", "text": "📍 Share Location"}]
+
+    if session.urgency > 0.8:
+        return {
+            "message": f"🚨 I've detected a {known_type or 'critical'} emergency! I'm immediately connecting you to our "
+                       f"emergency response system. Please stay calm.{follow_up(session)}",
+            "urgencyLevel": session.urgency,
+            "actions": [
+                {"type": "call_emergency", "text": "📞 Call Emergency Services NOW"},
+                {"type": "open_form", "text": "📋 Quick Emergency Form"},
+                *location_action,
+            ],
+            "emergencyData": {**session.facts(), "priority": "critical"},
+        }
+    if session.urgency > 0.5:
+        return {
+            "message": f"⚠️ I understand you need assistance with a {known_type + ' ' if known_type else ''}situation. "
+                       f"Let me help you report this properly.{follow_up(session)}",
+            "urgencyLevel": session.urgency,
+            "actions": [{"type": "open_form", "text": "📋 Report Emergency"}, *location_action],
+            "emergencyData": {**session.facts(), "priority": "high"},
+        }
+    if session.turns == 1 and not known_type:
+        message = ("👋 Hello! I'm your CrisisConnect AI assistant. I'm here to help with emergency reporting and "
+                   "disaster coordination. How can I assist you today?")
+    elif known_type:
+        message = f"Thanks, I've noted this as a {known_type} issue.{follow_up(session)}"
+    else:
+        message = "Could you tell me a little more about what's happening and where?"
+    return {
+        "message": message,
+        "urgencyLevel": session.urgency,
+        "actions": [
+            {"type": "open_form", "text": "📋 Report Issue"},
+            {"type": "get_info", "text": "ℹ️ Get Information"},
+        ],
+    }
+
+
+engine = ChatEngine()
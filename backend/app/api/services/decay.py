@@ -0,0 +1,43 @@
+# backend/app/api/services/decay.py
+"""Exponentially decayed sums with O(1), order-independent updates.
+
+Uses forward decay: an event at time ``t`` is stored with weight
+``exp(λ (t - landmark))`` and the sum is read back by multiplying with
+``exp(-λ (now - landmark))``. Late or out-of-order events therefore need no
+special handling, and nothing has to be touched as time passes. The
+landmark is moved forward before the stored weights could overflow.
+"""
+import math
+from typing import Optional
+
+# Re-anchor once stored weights exceed e**RESCALE_EXPONENT
+RESCALE_EXPONENT = 50.0
+
+
+class DecayedSum:
+    __slots__ = ("decay", "landmark", "total")
+
+    def __init__(self, half_life_seconds: float):
+        self.decay = math.log(2) / half_life_seconds
+        self.landmark: Optional[float] = None
+        self.total = 0.0
+
+    def add(self, value: float, at: float):
+        if self.landmark is None:
+            self.landmark = at
+        exponent = self.decay * (at - self.landmark)
+        if exponent > RESCALE_EXPONENT:
+            self.total *= math.exp(-exponent)
+            self.landmark = at
+            exponent = 0.0
+        self.total += value * math.exp(exponent)
+
+    def value(self, now: float) -> float:
+        """The decayed sum as seen at ``now``."""
+        if self.landmark is None:
+            return 0.0
+        return self.total * math.exp(-self.decay * (now - self.landmark))
+
+    def rate(self, now: float) -> float:
+        """Exponentially weighted event rate per second (sum × decay constant)."""
+        return self.value(now) * self.decay
@@ -0,0 +1,249 @@
+# backend/app/api/services/heatmap.py
+"""Incremental geohash risk heatmap of open incidents.
+
+Each incident with coordinates is geohashed once at ``MAX_PRECISION``; its
+prefixes are its cells at every coarser precision, so one incident updates
+exactly ``MAX_PRECISION`` cells. Cells keep forward-decayed sums (see
+``decay.DecayedSum``) of the incident weight (priority x people), of the
+weighted coordinates for a centroid and of the weight per emergency type.
+Resolving or re-reporting an incident subtracts its original contribution
+at its original time, which forward decay makes exact. Tiles for a zoom
+level or bounding box are read straight from the cells of the matching
+precision, so nothing is re-aggregated per request.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+from app.api.services.decay import DecayedSum
+from app.api.services.prediction_engine import incident_people, incident_priority, incident_time, incident_type
+from app.api.services.volunteer_index import location_of
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 7  # ~150 m cells
+HALF_LIFE_S = 6 * 3600.0
+PRIORITY_WEIGHT = {"critical": 4.0, "high": 2.0, "medium": 1.0, "low": 0.5}
+CLOSED_STATUSES = {"resolved", "closed", "completed", "cancelled"}
+RISK_SCALE = 10.0
+# Open incidents remembered so they can be resolved later; older ones simply decay away
+MAX_TRACKED = 100_000
+# Most tiles one map request may ask for
+MAX_TILES = 5000
+# Web-map zoom level at which each geohash precision starts (precision 1 below zoom 3)
+ZOOM_PRECISION = ((16, 7), (13, 6), (11, 5), (8, 4), (6, 3), (3, 2))
+
+BBox = Tuple[float, float, float, float]  # (min_lat, min_lng, max_lat, max_lng)
+
+
+def geohash(lat: float, lng: float, precision: int = MAX_PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        if coordinate >= middle:
+            value = value * 2 + 1
+            interval[0] = middle
+        else:
+            value *= 2
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_bounds(cell: str) -> BBox:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            middle = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = middle
+            else:
+                interval[1] = middle
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def zoom_precision(zoom: float) -> int:
+    """Geohash precision whose cells are a few screen tiles wide at a web-map zoom level."""
+    for min_zoom, precision in ZOOM_PRECISION:
+        if zoom >= min_zoom:
+            return precision
+    return 1
+
+
+def intersects(bounds: BBox, bbox: BBox) -> bool:
+    min_lat, min_lng, max_lat, max_lng = bbox
+    if bounds[2] < min_lat or bounds[0] > max_lat:
+        return False
+    if min_lng <= max_lng:
+        return bounds[3] >= min_lng and bounds[1] <= max_lng
+    # Box crossing the antimeridian
+    return bounds[3] >= min_lng or bounds[1] <= max_lng
+
+
+def incident_weight(incident: dict) -> float:
+    return PRIORITY_WEIGHT.get(incident_priority(incident), 1.0) * math.sqrt(incident_people(incident))
+
+
+class Cell:
+    __slots__ = ("incidents", "weight", "lat", "lng", "types", "bounds")
+
+    def __init__(self, half_life_s: float):
+        self.bounds: Optional[BBox] = None  # filled in the first time a tile query needs it
+        self.incidents = 0
+        self.weight = DecayedSum(half_life_s)
+        self.lat = DecayedSum(half_life_s)
+        self.lng = DecayedSum(half_life_s)
+        self.types: Dict[str, DecayedSum] = {}
+
+    def add(self, weight: float, lat: float, lng: float, emergency_type: str, at: float, half_life_s: float):
+        self.incidents += 1 if weight > 0 else -1
+        self.weight.add(weight, at)
+        self.lat.add(weight * lat, at)
+        self.lng.add(weight * lng, at)
+        series = self.types.get(emergency_type)
+        if series is None:
+            series = self.types[emergency_type] = DecayedSum(half_life_s)
+        series.add(weight, at)
+
+
+class GeoHeatmap:
+    def __init__(self, half_life_s: float = HALF_LIFE_S, max_precision: int = MAX_PRECISION, clock=time.time):
+        self.half_life_s = half_life_s
+        self.max_precision = max_precision
+        self.clock = clock
+        # levels[p] maps a precision-p geohash to its cell
+        self.levels: List[Dict[str, Cell]] = [{} for _ in range(max_precision + 1)]
+        # incident id -> (geohash, weight, lat, lng, type, time) of what it contributed
+        self.incidents: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.unlocated = 0
+        self.version = 0
+
+    def _apply(self, contribution: tuple, sign: float):
+        cell_hash, weight, lat, lng, emergency_type, at = contribution
+        for precision in range(1, self.max_precision + 1):
+            prefix = cell_hash[:precision]
+            level = self.levels[precision]
+            cell = level.get(prefix)
+            if cell is None:
+                cell = level[prefix] = Cell(self.half_life_s)
+            cell.add(sign * weight, lat, lng, emergency_type, at, self.half_life_s)
+            if cell.incidents <= 0:
+                del level[prefix]
+
+    def record(self, incident: dict) -> bool:
+        """Add, update or (once resolved) remove one incident; returns True if the map changed."""
+        # Everything that can fail on malformed input runs before the cells are touched
+        try:
+            location = location_of(incident)
+        except (TypeError, ValueError):
+            location = None
+        contribution = None
+        if location is not None and (incident.get("status") or "open") not in CLOSED_STATUSES:
+            lat, lng = location
+            contribution = (geohash(lat, lng, self.max_precision), incident_weight(incident), lat, lng,
+                            incident_type(incident), incident_time(incident))
+
+        key = incident.get("id")
+        previous = self.incidents.pop(str(key), None) if key is not None else None
+        if previous is not None and previous == contribution:
+            self.incidents[str(key)] = previous  # resent unchanged
+            return False
+        if previous is not None:
+            self._apply(previous, -1.0)
+
+        if contribution is None:
+            if location is None:
+                self.unlocated += 1
+            if previous is not None:
+                self.version += 1
+            return previous is not None
+
+        self._apply(contribution, 1.0)
+        if key is not None:
+            self.incidents[str(key)] = contribution
+            if len(self.incidents) > MAX_TRACKED:
+                self.incidents.popitem(last=False)
+        self.version += 1
+        return True
+
+    def _cells(self, precision: int, bbox: Optional[BBox]) -> Iterator[Tuple[str, Cell]]:
+        """Cells at ``precision``; with a bbox, descend from precision 1 through occupied cells only."""
+        if bbox is None:
+            yield from self.levels[precision].items()
+            return
+        frontier = [""]
+        for child_precision in range(1, precision + 1):
+            level = self.levels[child_precision]
+            children = []
+            for parent in frontier:
+                for char in BASE32:
+                    cell = level.get(parent + char)
+                    if cell is None:
+                        continue
+                    if cell.bounds is None:
+                        cell.bounds = geohash_bounds(parent + char)
+                    if intersects(cell.bounds, bbox):
+                        children.append(parent + char)
+            frontier = children
+        level = self.levels[precision]
+        for cell_hash in frontier:
+            yield cell_hash, level[cell_hash]
+
+    def tiles(self, precision: int, bbox: Optional[BBox] = None, limit: Optional[int] = None,
+              now: Optional[float] = None) -> List[dict]:
+        """Cells at ``precision`` (inside ``bbox``), hottest first."""
+        now = self.clock() if now is None else now
+        precision = min(max(precision, 1), self.max_precision)
+        tiles = []
+        for cell_hash, cell in self._cells(precision, bbox):
+            weight = cell.weight.value(now)
+            if weight <= 1e-9:
+                continue
+            primary = max(cell.types.items(), key=lambda item: item[1].value(now))[0]
+            tiles.append({
+                "geohash": cell_hash,
+                "lat": round(cell.lat.value(now) / weight, 6),
+                "lng": round(cell.lng.value(now) / weight, 6),
+                "bounds": [round(value, 6) for value in cell.bounds or geohash_bounds(cell_hash)],
+                "intensity": round(weight, 3),
+                "riskScore": round(1 - math.exp(-weight / RISK_SCALE), 3),
+                "incidents": cell.incidents,
+                "primaryType": primary,
+            })
+        tiles.sort(key=lambda tile: -tile["intensity"])
+        return tiles if limit is None else tiles[:limit]
+
+    def hotspots(self, limit: int = 5, precision: int = 5, now: Optional[float] = None) -> List[dict]:
+        """The riskiest ~5 km cells, shaped like the forecast's ``riskAreas``."""
+        return [
+            {
+                "location": tile["geohash"],
+                "lat": tile["lat"],
+                "lng": tile["lng"],
+                "riskScore": tile["riskScore"],
+                "primaryThreat": f"{tile['primaryType'].capitalize()} emergencies",
+                "openIncidents": tile["incidents"],
+            }
+            for tile in self.tiles(precision, limit=limit, now=now)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "cells": {precision: len(level) for precision, level in enumerate(self.levels) if precision},
+            "tracked": len(self.incidents),
+            "unlocated": self.unlocated,
+            "version": self.version,
+        }
+
+
+heatmap = GeoHeatmap()
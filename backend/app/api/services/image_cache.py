@@ -0,0 +1,208 @@
+# backend/app/api/services/image_cache.py
+"""Near-duplicate cache of image analyses keyed by a 64-bit difference hash.
+
+Forwarded copies of the same photo differ in resolution, compression and
+small crops but share a dHash within a few bits. dHash only sees luminance
+edges, so entries also carry a coarse colour signature (mean colour per
+quadrant) and only match when every channel is within ``colour_tolerance``
+levels: a flat red and a flat grey frame (same dHash) never share a
+verdict, while re-encoded copies whose colours straddle a quantization
+step still do. Hashes are indexed in a multi-index table: the 64 bits are
+split into ``max_distance + 1`` bands, so
+by the pigeonhole principle any hash within ``max_distance`` bits of a
+stored one matches it exactly on at least one band. Lookups only compare
+against the entries in those buckets, and unlike a BK-tree entries can be
+removed cheaply when the LRU evicts them. ``snapshot`` exports the keys as
+arrays so a worker process can skip analysing a known near-duplicate.
+"""
+import io
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+HASH_BITS = 64
+# Colour signature: 4 quadrants x RGB, 16 levels per channel
+COLOUR_BITS = 4
+COLOUR_CHANNELS = 12
+# Levels (of 16) two near-duplicates' channel means may differ by
+COLOUR_TOLERANCE = 2
+
+
+def image_dhash(image: Image.Image) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 grayscale thumbnail."""
+    small = np.asarray(image.convert("L").resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def colour_signature(image: Image.Image) -> int:
+    """Mean colour of each quadrant, 4 bits per channel (48 bits)."""
+    quadrants = np.asarray(image.convert("RGB").resize((2, 2), Image.BOX), dtype=np.uint64).ravel() >> 4
+    return int(sum(int(level) << (COLOUR_BITS * position) for position, level in enumerate(quadrants)))
+
+
+def colour_levels(signatures: np.ndarray) -> np.ndarray:
+    """Per-channel levels of packed signatures, shape ``(n, COLOUR_CHANNELS)``."""
+    shifts = np.arange(COLOUR_CHANNELS, dtype=np.uint64) * np.uint64(COLOUR_BITS)
+    levels = (np.asarray(signatures, dtype=np.uint64)[:, None] >> shifts) & np.uint64((1 << COLOUR_BITS) - 1)
+    return levels.astype(np.int16)
+
+
+def colours_close(a: int, b: int, tolerance: int = COLOUR_TOLERANCE) -> bool:
+    if a == b:
+        return True
+    levels = colour_levels(np.array([a, b], dtype=np.uint64))
+    return bool(np.abs(levels[0] - levels[1]).max() <= tolerance)
+
+
+def fingerprint(image: Image.Image) -> Tuple[int, int]:
+    """(dHash, colour signature) of a decoded image."""
+    return image_dhash(image), colour_signature(image)
+
+
+def dhash(source: Union[str, bytes]) -> int:
+    """dHash straight from an encoded image."""
+    image = Image.open(source if isinstance(source, str) else io.BytesIO(source))
+    # A JPEG only needs decoding at 1/8 scale for a 9x8 thumbnail
+    image.draft("L", (64, 64))
+    return image_dhash(image)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def has_near_duplicate(value: int, signature: int, hashes: np.ndarray, signatures: np.ndarray,
+                       max_distance: int, colour_tolerance: int = COLOUR_TOLERANCE) -> bool:
+    """Vectorized check of one fingerprint against a ``snapshot`` of the cache."""
+    if not len(hashes):
+        return False
+    differing = np.bitwise_xor(hashes, np.uint64(value))
+    distances = np.unpackbits(differing.view(np.uint8)).reshape(-1, HASH_BITS).sum(axis=1)
+    near = distances <= max_distance
+    if not near.any():
+        return False
+    colour_gap = np.abs(colour_levels(signatures[near]) - colour_levels(np.array([signature]))).max(axis=1)
+    return bool((colour_gap <= colour_tolerance).any())
+
+
+class HashIndex:
+    """Multi-index hash table answering "any stored hash within ``max_distance`` bits?"."""
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        edges = np.linspace(0, HASH_BITS, bands + 1).astype(int)
+        self._bands: List[Tuple[int, int]] = [
+            (int(start), (1 << int(end - start)) - 1) for start, end in zip(edges[:-1], edges[1:])
+        ]
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in self._bands]
+
+    def __bool__(self) -> bool:
+        return any(self._tables)
+
+    def _keys(self, value: int):
+        return ((value >> shift) & mask for shift, mask in self._bands)
+
+    def add(self, value: int):
+        for table, key in zip(self._tables, self._keys(value)):
+            table.setdefault(key, set()).add(value)
+
+    def remove(self, value: int):
+        for table, key in zip(self._tables, self._keys(value)):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(value)
+                if not bucket:
+                    del table[key]
+
+    def within(self, value: int) -> Dict[int, int]:
+        """Every stored hash within range, mapped to its distance."""
+        found: Dict[int, int] = {}
+        for table, key in zip(self._tables, self._keys(value)):
+            for candidate in table.get(key, ()):
+                if candidate not in found:
+                    distance = hamming(value, candidate)
+                    if distance <= self.max_distance:
+                        found[candidate] = distance
+        return found
+
+
+class ImageCache:
+    """LRU of analyses, looked up by perceptual-hash proximity and colour similarity."""
+
+    def __init__(self, max_size: int, max_distance: int, colour_tolerance: int = COLOUR_TOLERANCE):
+        self.max_size = max_size
+        self.max_distance = max_distance
+        self.colour_tolerance = colour_tolerance
+        self._entries: "OrderedDict[Tuple[int, int], Any]" = OrderedDict()
+        self._index = HashIndex(max_distance)
+        # dHash -> colour signatures stored under it
+        self._signatures: Dict[int, Set[int]] = {}
+        self._snapshot: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, value: int, signature: int = 0) -> Optional[Tuple[Any, int]]:
+        """(cached analysis, Hamming distance) for a near-duplicate, or None."""
+        match = None
+        for stored, distance in sorted(self._index.within(value).items(), key=lambda item: item[1]):
+            close = [other for other in self._signatures[stored]
+                     if colours_close(signature, other, self.colour_tolerance)]
+            if close:
+                match = (signature if signature in close else close[0], stored, distance)
+                break
+        if match is None:
+            self.misses += 1
+            return None
+        stored_signature, stored, distance = match
+        self._entries.move_to_end((stored_signature, stored))
+        self.hits += 1
+        return self._entries[(stored_signature, stored)], distance
+
+    def set(self, value: int, analysis: Any, signature: int = 0):
+        key = (signature, value)
+        if key not in self._entries:
+            if value not in self._signatures:
+                self._signatures[value] = set()
+                self._index.add(value)
+            self._signatures[value].add(signature)
+            self._snapshot = None
+        self._entries[key] = analysis
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            (evicted_signature, evicted), _ = self._entries.popitem(last=False)
+            signatures = self._signatures[evicted]
+            signatures.discard(evicted_signature)
+            if not signatures:
+                del self._signatures[evicted]
+                self._index.remove(evicted)
+            self._snapshot = None
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(hashes, signatures) of every entry, rebuilt only after the key set changes."""
+        if self._snapshot is None:
+            keys = list(self._entries)
+            self._snapshot = (np.array([value for _, value in keys], dtype=np.uint64),
+                              np.array([signature for signature, _ in keys], dtype=np.uint64))
+        return self._snapshot
+
+    def clear(self):
+        self._entries.clear()
+        self._index = HashIndex(self.max_distance)
+        self._signatures.clear()
+        self._snapshot = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries), "maxSize": self.max_size, "maxDistance": self.max_distance,
+            "colourTolerance": self.colour_tolerance,
+            "hits": self.hits, "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,444 @@
+# backend/app/api/services/image_processor.py
+"""Bounded-memory image analysis for field photos.
+
+Uploads are copied in small chunks into a spool that stays in memory for
+small files and rolls over to a temp file for large ones, so a 20 MB photo
+is never held as one ``bytes`` object. Decoding happens in a process pool:
+Pillow's ``draft()`` lets JPEGs decode straight at a reduced scale and
+``reduce()`` shrinks other formats cheaply before NumPy computes colour and
+texture features. The number of images queued or running is capped; when
+the cap is reached new work is rejected instead of piling up. The worker
+that decodes an image also fingerprints it (perceptual hash + coarse colour
+signature) and skips the analysis when the cache already holds a
+near-duplicate, so forwarded copies of a photo reuse the cached analysis.
+"""
+import asyncio
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import AsyncContextManager, AsyncIterable, Callable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from app.api.services.image_cache import ImageCache, fingerprint, has_near_duplicate
+from app.config import ai_config
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+class ImageQueueFull(Exception):
+    pass
+
+
+class TooManyImages(Exception):
+    pass
+
+
+class MalformedUpload(Exception):
+    pass
+
+
+# Room for multipart boundaries and part headers on top of the image itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class SpooledUpload:
+    """Bytes in memory up to ``spool_bytes``, a named temp file beyond that."""
+
+    def __init__(self, spool_bytes: int = ai_config.IMAGE_SPOOL_BYTES):
+        self.spool_bytes = spool_bytes
+        self.size = 0
+        self._buffer = bytearray()
+        self._file = None
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self._file is None and self.size > self.spool_bytes:
+            self._file = tempfile.NamedTemporaryFile(prefix="crisis-upload-", delete=False)
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer.extend(chunk)
+
+    def source(self) -> Union[str, bytes]:
+        """What a worker process should open: a file path, or the small payload itself."""
+        if self._file is not None:
+            self._file.flush()
+            return self._file.name
+        return bytes(self._buffer)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except FileNotFoundError:
+                pass
+            self._file = None
+        self._buffer = bytearray()
+
+
+class ImagePart:
+    """One file part of a multipart upload, spooled as it arrives."""
+
+    __slots__ = ("index", "filename", "spool", "error")
+
+    def __init__(self, index: int, filename: str):
+        self.index = index
+        self.filename = filename
+        self.spool = SpooledUpload()
+        self.error: Optional[str] = None
+
+
+class MultipartImageReader:
+    """Incremental multipart/form-data parser that hands over each file part as soon as it ends.
+
+    Feed it body chunks with ``write``; ``on_part`` is called with a complete
+    ImagePart while later parts are still arriving. Form fields without a
+    filename are ignored. An oversized part is recorded as that part's
+    ``error``, or raises ImageTooLarge with ``fail_fast``.
+    """
+
+    def __init__(self, boundary: bytes, on_part: Callable[[ImagePart], None],
+                 max_files: int = ai_config.IMAGE_BATCH_MAX_FILES, max_bytes: int = ai_config.IMAGE_MAX_BYTES,
+                 fail_fast: bool = False):
+        self.on_part = on_part
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.fail_fast = fail_fast
+        self.count = 0
+        self._part: Optional[ImagePart] = None
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def write(self, chunk: bytes):
+        self._parser.write(chunk)
+
+    def finalize(self):
+        self._parser.finalize()
+
+    def close(self):
+        """Discard a part that was still being received."""
+        if self._part is not None:
+            self._part.spool.close()
+            self._part = None
+
+    def _on_part_begin(self):
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        filename = options.get(b"filename")
+        if filename is None:
+            return
+        if self.count >= self.max_files:
+            raise TooManyImages(f"At most {self.max_files} images per request")
+        self._part = ImagePart(self.count, filename.decode("utf-8", "replace"))
+        self.count += 1
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        part = self._part
+        if part is None or part.error:
+            return
+        part.spool.write(data[start:end])
+        if part.spool.size > self.max_bytes:
+            if self.fail_fast:
+                raise ImageTooLarge(f"Image exceeds {self.max_bytes // (1024 * 1024)} MB")
+            part.error = f"Image exceeds {self.max_bytes // (1024 * 1024)} MB"
+            part.spool.close()
+
+    def _on_part_end(self):
+        part, self._part = self._part, None
+        if part is not None:
+            self.on_part(part)
+
+
+def load_working_image(source: Union[str, bytes], size: int = ai_config.IMAGE_WORKING_SIZE) -> Image.Image:
+    """Decode ``source`` to RGB no larger than ``size`` on its long side."""
+    import io
+
+    image = Image.open(source if isinstance(source, str) else io.BytesIO(source))
+    # JPEG: let the decoder produce a 1/2, 1/4 or 1/8 scale image directly
+    image.draft("RGB", (size, size))
+    factor = max(image.width, image.height) // size
+    if factor >= 2:
+        image = image.reduce(factor)
+    image = image.convert("RGB")
+    image.thumbnail((size, size))
+    return image
+
+
+def _share(mask: np.ndarray) -> float:
+    """Fraction of set pixels; 0 for an empty region (e.g. gradients of a one-pixel-high image)."""
+    return float(mask.mean()) if mask.size else 0.0
+
+
+def extract_features(source: Union[str, bytes]) -> dict:
+    """Colour and texture statistics used for damage/hazard assessment (runs in a worker)."""
+    return image_features(load_working_image(source))
+
+
+def image_features(image: Image.Image) -> dict:
+    pixels = np.asarray(image, dtype=np.float32) / 255.0
+    r, g, b = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    brightness = pixels.max(axis=2)
+    saturation = np.where(brightness > 0, (brightness - pixels.min(axis=2)) / np.maximum(brightness, 1e-6), 0)
+    gray = 0.299 * r + 0.587 * g + 0.114 * b
+
+    lower = slice(pixels.shape[0] // 2, None)
+    clear_water = (b > r + 0.05) & (b >= g - 0.02) & (brightness > 0.2)
+    muddy_water = (r > b + 0.08) & (g > b) & (r - g < 0.12) & (saturation < 0.45) & (brightness < 0.75)
+    flames = (r > 0.6) & (r > g + 0.15) & (g > b + 0.05) & (saturation > 0.5)
+    smoke = (saturation < 0.12) & (brightness > 0.35) & (brightness < 0.85)
+
+    gradient = np.abs(np.diff(gray, axis=0))[:, :-1] + np.abs(np.diff(gray, axis=1))[:-1, :]
+    return {
+        "width": image.width,
+        "height": image.height,
+        "waterRatio": _share(clear_water[lower] | muddy_water[lower]),
+        "fireRatio": _share(flames),
+        "smokeRatio": _share(smoke),
+        "edgeDensity": _share(gradient > 0.25),
+        "brightness": float(gray.mean()),
+        "contrast": float(gray.std()),
+    }
+
+
+def assess(features: dict) -> dict:
+    """Turn image features into the damage assessment returned by the API."""
+    water, fire, smoke, edges = (features["waterRatio"], features["fireRatio"],
+                                 features["smokeRatio"], features["edgeDensity"])
+    hazards, findings, actions = [], [], []
+    if water > 0.25:
+        hazards.append("standing_water")
+        findings.append(f"Water covers about {int(water * 100)}% of the lower frame")
+        actions.append("Deploy water rescue team")
+    if fire > 0.02:
+        hazards.append("fire")
+        findings.append("Flames visible")
+        actions.append("Alert fire services immediately")
+    if smoke > 0.35 and fire > 0.005:
+        hazards.append("smoke")
+        findings.append("Heavy smoke in frame")
+    if edges > 0.12:
+        hazards.append("debris")
+        findings.append("Cluttered, high-texture scene suggests debris or structural damage")
+        actions.append("Send structural assessment team")
+    if features["brightness"] < 0.15:
+        findings.append("Image is very dark; assessment confidence is reduced")
+
+    scores = {"flood": water, "fire": fire * 8, "structural": edges * 3}
+    detected_type, strongest = max(scores.items(), key=lambda item: item[1])
+    if strongest < 0.2:
+        detected_type = "unknown"
+
+    damage_level = round(min(10.0, 10 * (0.5 * min(water / 0.6, 1) + 0.7 * min(fire * 10, 1) + 0.4 * min(edges / 0.25, 1))), 1)
+    urgency = round(min(1.0, damage_level / 10 + (0.2 if "fire" in hazards else 0)), 2)
+    quality = min(features["contrast"] / 0.15, 1.0) * (0.6 if features["brightness"] < 0.15 else 1.0)
+    return {
+        "detectedType": detected_type,
+        "damageLevel": damage_level,  # 0-10 scale
+        "peopleDetected": 0,  # needs a person-detection model; colour features cannot count people
+        "vehiclesDetected": 0,
+        "hazards": hazards,
+        "confidence": round(0.4 + 0.5 * quality, 2),
+        "urgencyScore": urgency,
+        "keyFindings": findings or ["No clear damage indicators detected"],
+        "recommendedActions": actions or ["Request additional photos or a field report"],
+        "features": features,
+    }
+
+
+def analyze_source(source: Union[str, bytes]) -> dict:
+    """Full CPU-side analysis of one image (runs in a worker process)."""
+    return assess(extract_features(source))
+
+
+def inspect_source(source: Union[str, bytes], known_hashes: np.ndarray, known_signatures: np.ndarray,
+                   max_distance: int, colour_tolerance: int) -> Tuple[int, int, Optional[dict]]:
+    """Decode once, fingerprint, and analyse unless the cache snapshot has a near-duplicate (runs in a worker).
+
+    Returns ``(dHash, colour signature, analysis or None)``.
+    """
+    image = load_working_image(source)
+    image_hash, signature = fingerprint(image)
+    if has_near_duplicate(image_hash, signature, known_hashes, known_signatures, max_distance, colour_tolerance):
+        return image_hash, signature, None
+    return image_hash, signature, assess(image_features(image))
+
+
+def is_finite(analysis: dict) -> bool:
+    """False for analyses with NaN/inf features, which must never be cached."""
+    return all(math.isfinite(value) for value in analysis["features"].values() if isinstance(value, float))
+
+
+class ImageAnalyzer:
+    def __init__(self, workers: int = ai_config.IMAGE_WORKERS, max_queue: int = ai_config.IMAGE_MAX_QUEUE,
+                 cache: Optional[ImageCache] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self._slot_freed = asyncio.Event()
+        self.cache = cache or ImageCache(ai_config.IMAGE_CACHE_SIZE, ai_config.IMAGE_HASH_MAX_DISTANCE)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def reserve(self):
+        """Claim a queue slot or raise ImageQueueFull; pair with ``release``."""
+        if self.in_flight >= self.max_queue:
+            raise ImageQueueFull("Image analysis queue is full")
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._slot_freed.set()
+
+    async def acquire(self):
+        """Wait for a queue slot; batch uploads queue behind each other instead of being rejected."""
+        while self.in_flight >= self.max_queue:
+            self._slot_freed.clear()
+            await self._slot_freed.wait()
+        self.in_flight += 1
+
+    async def run(self, source: Union[str, bytes]) -> dict:
+        loop = asyncio.get_running_loop()
+        # One round trip and one decode: the worker fingerprints the image and analyses it only when
+        # the snapshot of cached fingerprints has no near-duplicate
+        image_hash, signature, analysis = await loop.run_in_executor(
+            self.executor, inspect_source, source, *self.cache.snapshot(), self.cache.max_distance,
+            self.cache.colour_tolerance)
+        cached = self.cache.get(image_hash, signature)
+        if cached is not None:
+            analysis, distance = cached
+            return {**analysis, "cached": True, "hashDistance": distance}
+        if analysis is None:
+            # The near-duplicate was evicted while the worker ran
+            analysis = await loop.run_in_executor(self.executor, analyze_source, source)
+        analysis["imageHash"] = f"{image_hash:016x}"
+        if is_finite(analysis):
+            self.cache.set(image_hash, analysis, signature)
+        return {**analysis, "cached": False}
+
+    async def analyze_stream(self, boundary: bytes, chunks: AsyncIterable[bytes],
+                             content_length: Optional[int] = None,
+                             max_bytes: int = ai_config.IMAGE_MAX_BYTES,
+                             admit: Optional[Callable[[], AsyncContextManager]] = None) -> dict:
+        """Analysis of the first file in a multipart body, spooled once while the body streams in.
+
+        ``admit`` (e.g. an admission-control slot) is entered once the body has been read,
+        so a slow upload doesn't hold it.
+        """
+        if content_length is not None and content_length > max_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise ImageTooLarge(f"Image exceeds {max_bytes // (1024 * 1024)} MB")
+        self.reserve()
+        parts: List[ImagePart] = []
+        reader = MultipartImageReader(boundary, parts.append, max_bytes=max_bytes, fail_fast=True)
+        try:
+            try:
+                async for chunk in chunks:
+                    reader.write(chunk)
+                reader.finalize()
+            except (ImageTooLarge, TooManyImages):
+                raise
+            except Exception as e:
+                raise MalformedUpload(f"Malformed multipart body: {e}") from e
+            if not parts:
+                raise MalformedUpload("No image file in request")
+            async with admit() if admit is not None else nullcontext():
+                analysis = await self.run(parts[0].spool.source())
+        finally:
+            reader.close()
+            for part in parts:
+                part.spool.close()
+            self.release()
+        analysis["fileSizeBytes"] = parts[0].spool.size
+        return analysis
+
+    async def analyze_part(self, part: ImagePart) -> dict:
+        """Analysis of one batch part; failures become an ``error`` entry instead of raising."""
+        result = {"index": part.index, "filename": part.filename, "fileSizeBytes": part.spool.size}
+        try:
+            if part.error:
+                return {**result, "error": part.error}
+            await self.acquire()
+            try:
+                return {**result, **await self.run(part.spool.source())}
+            except UnidentifiedImageError:
+                return {**result, "error": "Not a readable image"}
+            except Exception as e:
+                return {**result, "error": f"Image analysis failed: {e}"}
+            finally:
+                self.release()
+        finally:
+            part.spool.close()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def site_summary(results: Iterable[dict]) -> dict:
+    """Aggregate per-image analyses of one site."""
+    analysed: List[dict] = []
+    failed = 0
+    for result in results:
+        if "error" in result:
+            failed += 1
+        else:
+            analysed.append(result)
+    types = {}
+    for result in analysed:
+        types[result["detectedType"]] = types.get(result["detectedType"], 0) + 1
+    return {
+        "images": len(analysed) + failed,
+        "analysed": len(analysed),
+        "failed": failed,
+        "cached": sum(1 for result in analysed if result.get("cached")),
+        "totalPeopleDetected": sum(result["peopleDetected"] for result in analysed),
+        "maxDamageLevel": max((result["damageLevel"] for result in analysed), default=0.0),
+        "maxUrgencyScore": max((result["urgencyScore"] for result in analysed), default=0.0),
+        "hazards": sorted({hazard for result in analysed for hazard in result["hazards"]}),
+        "detectedTypes": types,
+    }
+
+
+analyzer = ImageAnalyzer()
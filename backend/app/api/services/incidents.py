@@ -0,0 +1,34 @@
+# backend/app/api/services/incidents.py
+"""One entry point that folds an incident into every view derived from it.
+
+The heatmap, the incident-rate forecast and the resource forecast all read
+the same incidents. Routes record them through ``publish_incident`` so the
+other workers (through the ``incidents`` change-feed topic) and the heatmap
+see exactly what this worker saw, and cached forecasts agree across workers.
+"""
+from app.api.services.heatmap import heatmap
+from app.api.services.prediction_engine import engine as prediction_engine
+from app.api.services.realtime import hub
+from app.api.services.resource_forecaster import forecaster as resource_forecaster
+from app.api.services.worker_sync import sync as worker_sync
+
+
+def record_incident(incident: dict) -> bool:
+    """Feed the heatmap and the incident and resource forecasters (O(1)); returns True if any changed."""
+    # Status changes of a known incident still move (or clear) its heatmap cells
+    changed = heatmap.record(incident)
+    # Demand first: the incident only counts as seen once everything derived from it is recorded
+    if not prediction_engine.is_new(incident):
+        return changed
+    resource_forecaster.record(incident)
+    prediction_engine.record(incident)
+    area, emergency_type = incident.get("area") or "Unknown", incident.get("type") or "unknown"
+    hub.publish("predictions", {"area": area, "type": emergency_type, "version": prediction_engine.version},
+                key=f"{area}:{emergency_type}")
+    return True
+
+
+def publish_incident(incident: dict):
+    """Record locally and, if anything changed, hand the incident to the other workers."""
+    if record_incident(incident):
+        worker_sync.publish("incidents", incident)
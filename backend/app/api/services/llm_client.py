@@ -0,0 +1,198 @@
+# backend/app/api/services/llm_client.py
+"""Non-blocking LLM emergency classification.
+
+Calls an OpenAI-compatible ``/chat/completions`` endpoint with httpx, so the
+event loop is never blocked. Every call goes through a concurrency
+semaphore, a hard deadline and a circuit breaker; answers are cached by a
+hash of the normalized description, and identical reports that arrive while
+a call is in flight share that call. Point ``CRISIS_LLM_BASE_URL`` at a local
+stub server to exercise the path without a real API key.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from app.api.services.ttl_cache import TTLCache
+from app.config import ai_config
+
+if TYPE_CHECKING:
+    # Imported on first call instead; most deployments never reach the LLM
+    import httpx
+
+PROMPT_TEMPLATE = """
+Analyze this emergency report and provide structured classification:
+
+Description: "{description}"
+
+Provide a JSON response with:
+1. emergencyType: (food, medical, water, shelter, fire, flood, earthquake)
+2. suggestedPriority: (low, medium, high, critical)
+3. urgencyScore: (0.0-1.0)
+4. estimatedPeople: (number of people likely affected)
+5. resourceNeeds: (list of required resources)
+6. confidence: (0.0-1.0)
+7. keyInsights: (list of important observations)
+
+Consider: Keywords, severity indicators, time sensitivity, scope of impact.
+"""
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class LLMUnavailable(Exception):
+    """The LLM path cannot answer; callers should use the rule-based fallback."""
+
+
+def description_key(description: str) -> str:
+    """Cache key that ignores case and whitespace differences between copies."""
+    normalized = _WHITESPACE.sub(" ", description).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one probe through per reset window."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def cancel_probe(self):
+        """A probe abandoned without an outcome (caller cancelled) frees the slot for the next one."""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class LLMClassifier:
+    def __init__(self, base_url: str = ai_config.LLM_BASE_URL, api_key: str = ai_config.LLM_API_KEY,
+                 model: str = ai_config.LLM_MODEL, deadline: float = ai_config.LLM_DEADLINE_S,
+                 max_concurrency: int = ai_config.LLM_MAX_CONCURRENCY,
+                 transport: Optional["httpx.AsyncBaseTransport"] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.deadline = deadline
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+        self.breaker = CircuitBreaker(ai_config.LLM_BREAKER_FAILURES, ai_config.LLM_BREAKER_RESET_S)
+        self.cache = TTLCache(ai_config.LLM_CACHE_SIZE, ai_config.LLM_CACHE_TTL_S)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def configured(self) -> bool:
+        # A custom base URL (e.g. a local stub server) needs no key
+        return bool(self.api_key) or self.transport is not None or self.base_url != DEFAULT_BASE_URL
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(base_url=self.base_url, headers=headers,
+                                             timeout=self.deadline, transport=self.transport)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def classify(self, description: str) -> dict:
+        """Classify ``description``; raises LLMUnavailable when the fallback should be used."""
+        if not self.configured:
+            raise LLMUnavailable("no LLM API key configured")
+
+        key = description_key(description)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                return dict(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if pending.cancelled():
+                    raise LLMUnavailable("shared LLM call was cancelled")
+                raise
+
+        if not self.breaker.allow():
+            raise LLMUnavailable("circuit breaker open")
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await asyncio.wait_for(self._call(description), timeout=self.deadline)
+        except Exception as e:
+            self.breaker.record_failure()
+            error = e if isinstance(e, LLMUnavailable) else LLMUnavailable(f"{type(e).__name__}: {e}")
+            future.set_exception(error)
+            # Waiters re-raise it; mark retrieved so an unobserved failure isn't logged
+            future.exception()
+            raise error from e
+        else:
+            self.breaker.record_success()
+            self.cache.set(key, result)
+            future.set_result(result)
+        finally:
+            del self._in_flight[key]
+            if not future.done():
+                # Cancelled before any outcome was recorded
+                self.breaker.cancel_probe()
+                future.cancel()
+        return dict(result)
+
+    async def _call(self, description: str) -> dict:
+        client = self._get_client()
+        async with self._semaphore:
+            response = await client.post("/chat/completions", json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": PROMPT_TEMPLATE.format(description=description)}],
+                "temperature": 0.1,
+            })
+        response.raise_for_status()
+        content = response.json()["choices"][0]["message"]["content"]
+        result = json.loads(content)
+        if not isinstance(result, dict):
+            raise LLMUnavailable("LLM returned a non-object classification")
+        return result
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+llm_classifier = LLMClassifier()
@@ -0,0 +1,227 @@
+# backend/app/api/services/metrics.py
+"""In-process metrics with Prometheus text exposition.
+
+Counters, gauges and fixed-bucket histograms are plain Python lists/floats
+updated from the event loop thread, so recording a sample takes no lock and
+costs a dict lookup plus a ``bisect``. With several workers a scrape lands
+on any one of them, so each worker also publishes a ``snapshot`` of its raw
+values to the shared database every few seconds and ``/metrics`` renders
+its own live values summed with the other workers' recent snapshots
+(counters, gauges and histogram buckets all add up). ``MetricsMiddleware`` is a raw ASGI middleware (no
+``BaseHTTPMiddleware`` task overhead) that records per-route latency,
+in-flight requests and request/response body sizes; ``stage`` times named
+steps inside handlers.
+"""
+import os
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def snapshot(self) -> list:
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+    def merged(self, snapshots: Iterable[list]) -> Dict[Tuple[str, ...], float]:
+        values = dict(self.values)
+        for labels, value in snapshots:
+            values[tuple(labels)] = values.get(tuple(labels), 0.0) + value
+        return values
+
+    def samples(self, values: Dict[Tuple[str, ...], float] = None) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_number(value)}"
+                for labels, value in (self.values if values is None else values).items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        self.values[labels] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self.series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, *labels: str, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def snapshot(self) -> list:
+        return [[list(labels), series] for labels, series in self.series.items()]
+
+    def merged(self, snapshots: Iterable[list]) -> Dict[Tuple[str, ...], List[float]]:
+        merged = {labels: list(series) for labels, series in self.series.items()}
+        for labels, series in snapshots:
+            total = merged.get(tuple(labels))
+            if total is None:
+                merged[tuple(labels)] = list(series)
+            elif len(total) == len(series):
+                merged[tuple(labels)] = [a + b for a, b in zip(total, series)]
+        return merged
+
+    def samples(self, series_by_labels: Dict[Tuple[str, ...], List[float]] = None) -> List[str]:
+        lines = []
+        for labels, series in (self.series if series_by_labels is None else series_by_labels).items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def snapshot(self) -> Dict[str, list]:
+        """Raw values of every metric, JSON-serializable, for the other workers to add in."""
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+    def render(self, others: Iterable[Dict[str, list]] = ()) -> str:
+        """Text exposition of this process's values plus those of ``others`` (worker snapshots)."""
+        others = list(others)
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if others:
+                lines.extend(metric.samples(metric.merged(
+                    entry for snapshot in others for entry in snapshot.get(metric.name, ()))))
+            else:
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+REQUEST_SECONDS = registry.register(Histogram(
+    "crisis_http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "crisis_http_requests_in_flight", "HTTP requests currently being served", ("method",)))
+REQUEST_BYTES = registry.register(Histogram(
+    "crisis_http_request_size_bytes", "HTTP request body size by route", ("method", "route"), SIZE_BUCKETS))
+RESPONSE_BYTES = registry.register(Histogram(
+    "crisis_http_response_size_bytes", "HTTP response body size by route", ("method", "route"), SIZE_BUCKETS))
+STAGE_SECONDS = registry.register(Histogram(
+    "crisis_stage_duration_seconds", "Time spent in named handler stages", ("stage",)))
+FALLBACKS = registry.register(Counter(
+    "crisis_classification_fallbacks_total", "Rule-based fallback classifications by reason", ("reason",)))
+PROCESS_START = registry.register(Gauge(
+    "crisis_process_start_time_seconds", "Start time of this worker process", ("pid",)))
+
+
+def record_process_start():
+    """Label the start-time gauge with this process; forked workers call it again after the fork."""
+    PROCESS_START.values.clear()
+    PROCESS_START.set(str(os.getpid()), value=time.time())
+
+
+record_process_start()
+
+
+class stage:
+    """``with stage("keyword_scan"): ...`` records the block's wall time."""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        STAGE_SECONDS.observe(self.name, value=time.perf_counter() - self.started)
+        return False
+
+
+def route_label(scope: dict) -> str:
+    """Route template (``/api/items/{id}``) so label cardinality stays bounded."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        sizes = [0, 0]
+        status = [500]
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes[0] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes[1] += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(method)
+            route = route_label(scope)
+            REQUEST_SECONDS.observe(method, route, str(status[0]), value=time.perf_counter() - started)
+            REQUEST_BYTES.observe(method, route, value=sizes[0])
+            RESPONSE_BYTES.observe(method, route, value=sizes[1])
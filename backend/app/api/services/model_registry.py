@@ -0,0 +1,168 @@
+# backend/app/api/services/model_registry.py
+"""Loads the scikit-learn artifacts in app/ai_models and serves them.
+
+Each artifact is loaded once at startup and validated. Inference runs in a
+small thread pool behind a micro-batcher: requests that arrive within a few
+milliseconds of each other share a single ``predict_proba`` call. Missing,
+empty or invalid artifacts are reported as unavailable so callers can fall
+back to the keyword rules.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import ai_config
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item predictions into one batched call."""
+
+    def __init__(self, predict: Callable[[List[Any]], Any], executor: ThreadPoolExecutor,
+                 max_batch: int, max_wait_ms: float):
+        self.predict = predict
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: Any):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self.executor, self.predict, [item for item, _ in batch])
+        task.add_done_callback(lambda done: self._resolve(batch, done))
+
+    @staticmethod
+    def _resolve(batch: List[Tuple[Any, asyncio.Future]], done: asyncio.Future):
+        error = done.exception()
+        rows = None if error else done.result()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(rows[index])
+
+
+class LoadedModel:
+    """A validated estimator plus the batcher that serves it."""
+
+    def __init__(self, name: str, path: Path, estimator: Any, batcher: MicroBatcher):
+        self.name = name
+        self.path = path
+        self.estimator = estimator
+        self.classes = [str(label) for label in estimator.classes_]
+        self.batcher = batcher
+
+
+class ModelRegistry:
+    def __init__(self):
+        self.models: Dict[str, LoadedModel] = {}
+        self.errors: Dict[str, str] = {}
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def load_all(self, reload: bool = True):
+        """Load and validate every configured artifact.
+
+        With ``reload=False`` artifacts already loaded (or already known to be
+        unusable), e.g. by a pre-fork parent process, are kept as they are.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=ai_config.MODEL_THREADS,
+                                               thread_name_prefix="model-inference")
+            # Models kept from before a shutdown() still point at the old pool
+            for model in self.models.values():
+                model.batcher.executor = self.executor
+        for name, filename in ai_config.MODEL_FILES.items():
+            path = ai_config.MODELS_DIR / filename
+            if not reload and (name in self.models or name in self.errors):
+                continue
+            try:
+                self.models[name] = self._load(name, path)
+                self.errors.pop(name, None)
+                logger.info("Loaded model %s from %s", name, path)
+            except Exception as e:
+                self.models.pop(name, None)
+                self.errors[name] = str(e)
+                logger.warning("Model %s unavailable, using rule-based fallback: %s", name, e)
+
+    def _load(self, name: str, path: Path) -> LoadedModel:
+        if not path.exists():
+            raise FileNotFoundError(f"{path} does not exist")
+        if path.stat().st_size == 0:
+            raise ValueError(f"{path} is empty")
+
+        import joblib
+
+        estimator = joblib.load(path, mmap_mode="r" if ai_config.MODEL_MMAP else None)
+        if not hasattr(estimator, "predict_proba") or not hasattr(estimator, "classes_"):
+            raise TypeError(f"{type(estimator).__name__} is not a fitted probabilistic classifier")
+
+        sample = ai_config.MODEL_VALIDATION_SAMPLES.get(name)
+        if sample is not None:
+            probabilities = np.asarray(estimator.predict_proba(sample))
+            if probabilities.shape != (len(sample), len(estimator.classes_)):
+                raise ValueError(f"predict_proba returned shape {probabilities.shape}")
+
+        batcher = MicroBatcher(estimator.predict_proba, self.executor,
+                               ai_config.MICROBATCH_MAX_SIZE, ai_config.MICROBATCH_MAX_WAIT_MS)
+        return LoadedModel(name, path, estimator, batcher)
+
+    def available(self, name: str) -> bool:
+        return name in self.models
+
+    async def predict_proba(self, name: str, item: Any) -> Dict[str, float]:
+        """Class probabilities for one input, micro-batched with its neighbours."""
+        model = self.models[name]
+        row = await model.batcher.submit(item)
+        return dict(zip(model.classes, np.asarray(row).tolist()))
+
+    async def predict_proba_many(self, name: str, items: Sequence[Any]) -> List[Dict[str, float]]:
+        """Class probabilities for an already-batched input."""
+        model = self.models[name]
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(self.executor, model.estimator.predict_proba, list(items))
+        return [dict(zip(model.classes, row)) for row in np.asarray(rows).tolist()]
+
+    def status(self) -> Dict[str, dict]:
+        report = {name: {"loaded": True, "classes": model.classes} for name, model in self.models.items()}
+        report.update({name: {"loaded": False, "reason": reason} for name, reason in self.errors.items()})
+        return report
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+registry = ModelRegistry()
+
+
+def best_label(probabilities: Dict[str, float]) -> Tuple[Optional[str], float]:
+    """Most likely class if it clears ``MODEL_MIN_CONFIDENCE``."""
+    label, probability = max(probabilities.items(), key=lambda item: item[1])
+    if probability < ai_config.MODEL_MIN_CONFIDENCE:
+        return None, probability
+    return label, probability
@@ -0,0 +1,101 @@
+# backend/app/api/services/realtime.py
+"""Per-topic fan-out hub for pushing incremental updates to dashboards.
+
+Publishers never wait on subscribers: ``publish`` drops the delta into each
+subscriber's pending buffer and returns. Deltas that share a key (e.g. the
+same volunteer changing status twice) replace each other while still
+pending, so a slow client receives only the latest state. Each buffer is
+bounded; when it overflows the oldest delta is dropped, and a client that
+keeps overflowing is disconnected instead of growing server memory.
+"""
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+TOPICS = ("emergencies", "volunteers", "assignments", "predictions")
+MAX_PENDING = 256
+MAX_DROPS_BEFORE_DISCONNECT = 1024
+
+_sequence = itertools.count(1)
+
+
+class Subscriber:
+    def __init__(self, max_pending: int = MAX_PENDING):
+        self.topics: Set[str] = set()
+        self.max_pending = max_pending
+        self.pending: "OrderedDict[tuple, dict]" = OrderedDict()
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    @property
+    def overloaded(self) -> bool:
+        return self.dropped >= MAX_DROPS_BEFORE_DISCONNECT
+
+    def offer(self, topic: str, key: Hashable, message: dict):
+        """Queue a delta without blocking; coalesces on ``(topic, key)``."""
+        if self.closed:
+            return
+        slot = (topic, key)
+        if slot in self.pending:
+            del self.pending[slot]
+        self.pending[slot] = message
+        while len(self.pending) > self.max_pending:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+        self._ready.set()
+
+    async def next_batch(self) -> List[dict]:
+        """Wait for and take every pending delta, oldest first."""
+        await self._ready.wait()
+        self._ready.clear()
+        batch = list(self.pending.values())
+        self.pending.clear()
+        return batch
+
+    def close(self):
+        self.closed = True
+        self.pending.clear()
+        self._ready.set()
+
+
+class Hub:
+    def __init__(self):
+        self.subscribers: Dict[str, Set[Subscriber]] = {topic: set() for topic in TOPICS}
+        self.published = 0
+
+    def subscribe(self, subscriber: Subscriber, topics: Iterable[str]) -> List[str]:
+        accepted = [topic for topic in topics if topic in self.subscribers]
+        for topic in accepted:
+            self.subscribers[topic].add(subscriber)
+            subscriber.topics.add(topic)
+        return accepted
+
+    def unsubscribe(self, subscriber: Subscriber, topics: Optional[Iterable[str]] = None):
+        for topic in list(subscriber.topics if topics is None else topics):
+            self.subscribers.get(topic, set()).discard(subscriber)
+            subscriber.topics.discard(topic)
+
+    def publish(self, topic: str, data: Any, key: Optional[Hashable] = None):
+        """Fan a delta out to the topic's subscribers.
+
+        ``key`` identifies the entity being updated; pass None for events
+        that must never be coalesced away.
+        """
+        sequence = next(_sequence)
+        message = {"topic": topic, "key": key, "seq": sequence, "ts": time.time(), "data": data}
+        coalesce_key = sequence if key is None else key
+        self.published += 1
+        for subscriber in tuple(self.subscribers.get(topic, ())):
+            subscriber.offer(topic, coalesce_key, message)
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "subscribers": {topic: len(subs) for topic, subs in self.subscribers.items()},
+        }
+
+
+hub = Hub()
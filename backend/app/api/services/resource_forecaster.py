@@ -0,0 +1,184 @@
+# backend/app/api/services/resource_forecaster.py
+"""Online per-area resource demand forecasting and depletion estimates.
+
+Every classified incident converts into resource demand (type × people ×
+priority) and is folded into two exponentially decayed demand sums per
+(area, resource): a long half-life that gives the forecast rate and a short
+one used to tell whether demand is rising. Each incident is an O(1) update,
+and incident demand is drawn from the area's running inventory so depletion
+ETAs stay current without rescanning history.
+"""
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.api.services.decay import DecayedSum
+from app.api.services.prediction_engine import (
+    incident_people, incident_priority, incident_time, incident_type, parse_timeframe,
+)
+
+RESOURCES = ("medical_kits", "food_packets", "water_bottles")
+# Units needed per affected person, by emergency type
+DEMAND_PER_PERSON: Dict[str, Dict[str, float]] = {
+    "medical": {"medical_kits": 1.0, "water_bottles": 2.0},
+    "food": {"food_packets": 3.0, "water_bottles": 2.0},
+    "water": {"water_bottles": 6.0},
+    "shelter": {"food_packets": 2.0, "water_bottles": 3.0, "medical_kits": 0.2},
+    "flood": {"food_packets": 2.0, "water_bottles": 4.0, "medical_kits": 0.3},
+    "fire": {"medical_kits": 0.8, "water_bottles": 2.0},
+}
+DEFAULT_DEMAND = {"food_packets": 1.0, "water_bottles": 2.0, "medical_kits": 0.2}
+PRIORITY_MULTIPLIER = {"critical": 1.5, "high": 1.2, "medium": 1.0, "low": 0.7}
+RATE_HALF_LIFE_S = 6 * 3600.0
+TREND_HALF_LIFE_S = 3600.0
+TREND_TOLERANCE = 0.1
+
+
+def incident_demand(incident: dict) -> Dict[str, float]:
+    """Resource units one incident is expected to consume."""
+    scale = incident_people(incident) * PRIORITY_MULTIPLIER.get(incident_priority(incident), 1.0)
+    per_person = DEMAND_PER_PERSON.get(incident_type(incident), DEFAULT_DEMAND)
+    return {resource: units * scale for resource, units in per_person.items()}
+
+
+def parse_inventory(inventory) -> Dict[str, Dict[str, float]]:
+    """``{area: {resource: quantity}}`` with numeric quantities; raises ValueError otherwise."""
+    if not isinstance(inventory, dict):
+        raise ValueError("inventory must be an object of {area: {resource: quantity}}")
+    parsed = {}
+    for area, resources in inventory.items():
+        if not isinstance(resources, dict):
+            raise ValueError(f"inventory for {area} must be an object of {{resource: quantity}}")
+        parsed[str(area)] = {}
+        for resource, quantity in resources.items():
+            if isinstance(quantity, bool) or not isinstance(quantity, (int, float)) or not math.isfinite(quantity):
+                raise ValueError(f"inventory quantity for {area}/{resource} must be a number")
+            parsed[str(area)][str(resource)] = float(quantity)
+    return parsed
+
+
+class ResourceSeries:
+    __slots__ = ("rate", "trend", "stock", "stock_at")
+
+    def __init__(self):
+        self.rate = DecayedSum(RATE_HALF_LIFE_S)
+        self.trend = DecayedSum(TREND_HALF_LIFE_S)
+        self.stock: Optional[float] = None  # None until an inventory count is reported
+        self.stock_at = 0.0  # when that count was taken; earlier demand is already reflected in it
+
+    def add(self, units: float, at: float):
+        self.rate.add(units, at)
+        self.trend.add(units, at)
+        if self.stock is not None and at >= self.stock_at:
+            self.stock = max(self.stock - units, 0.0)
+
+    def hourly(self, now: float) -> Tuple[float, float]:
+        """(forecast demand per hour, short-window demand per hour)."""
+        return self.rate.rate(now) * 3600, self.trend.rate(now) * 3600
+
+
+class ResourceForecaster:
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.series: Dict[Tuple[str, str], ResourceSeries] = {}
+        self.version = 0
+
+    def _series(self, area: str, resource: str) -> ResourceSeries:
+        series = self.series.get((area, resource))
+        if series is None:
+            series = self.series[(area, resource)] = ResourceSeries()
+        return series
+
+    def record(self, incident: dict):
+        """Fold one incident's demand into its area (O(number of resources))."""
+        area = str(incident.get("area") or "Unknown")
+        at = incident_time(incident)
+        for resource, units in incident_demand(incident).items():
+            self._series(area, resource).add(units, at)
+        self.version += 1
+
+    def ingest(self, incidents: Iterable[dict]):
+        for incident in incidents:
+            self.record(incident)
+
+    def set_stock(self, area: str, resource: str, quantity: float):
+        series = self._series(str(area), resource)
+        series.stock = max(float(quantity), 0.0)
+        series.stock_at = self.clock()
+        self.version += 1
+
+    def set_inventory(self, inventory: dict):
+        """Absolute stock counts as ``{area: {resource: quantity}}``."""
+        for area, resources in inventory.items():
+            for resource, quantity in resources.items():
+                self.set_stock(area, resource, quantity)
+
+    def area_forecast(self, hours: float, area: Optional[str] = None, now: Optional[float] = None) -> List[dict]:
+        now = self.clock() if now is None else now
+        results = []
+        for (series_area, resource), series in self.series.items():
+            if area is not None and series_area != area:
+                continue
+            rate, recent = series.hourly(now)
+            eta_hours = series.stock / rate if series.stock is not None and rate > 1e-9 else None
+            results.append({
+                "area": series_area,
+                "resource": resource,
+                "demandPerHour": round(rate, 3),
+                "predicted": round(rate * hours, 1),
+                "stock": None if series.stock is None else round(series.stock, 1),
+                "trend": trend(rate, recent),
+                "depletionEtaHours": None if eta_hours is None else round(eta_hours, 1),
+                "depletesAt": None if eta_hours is None else
+                (datetime.fromtimestamp(now) + timedelta(hours=eta_hours)).isoformat(),
+                "shortfall": None if series.stock is None else round(max(rate * hours - series.stock, 0.0), 1),
+            })
+        results.sort(key=lambda item: (item["depletionEtaHours"] is None, item["depletionEtaHours"] or 0.0,
+                                       -item["predicted"]))
+        return results
+
+    def totals(self, hours: float, now: Optional[float] = None) -> Dict[str, dict]:
+        """Network-wide forecast per resource, in the dashboard's resourceForecast shape."""
+        now = self.clock() if now is None else now
+        # rate, recent rate, stock, rate of the areas whose stock is known
+        sums = {resource: [0.0, 0.0, 0.0, 0.0] for resource in RESOURCES}
+        for (_, resource), series in self.series.items():
+            rate, recent = series.hourly(now)
+            totals = sums.setdefault(resource, [0.0, 0.0, 0.0, 0.0])
+            totals[0] += rate
+            totals[1] += recent
+            if series.stock is not None:
+                totals[2] += series.stock
+                totals[3] += rate
+        forecast = {}
+        for resource, (rate, recent, stock, stocked_rate) in sums.items():
+            predicted = rate * hours
+            change = (predicted - stock) / stock * 100 if stock else None
+            forecast[resource] = {
+                "predicted": int(round(predicted)),
+                "current": int(round(stock)),
+                "trend": trend(rate, recent),
+                "change": "n/a" if change is None else f"{change:+.0f}%",
+                "depletionEtaHours": round(stock / stocked_rate, 1) if stocked_rate > 1e-9 and stock else None,
+            }
+        return forecast
+
+    def forecast(self, timeframe="24h", area: Optional[str] = None) -> dict:
+        hours = parse_timeframe(timeframe)
+        return {
+            "timeframeHours": hours,
+            "resourceForecast": self.totals(hours),
+            "areas": self.area_forecast(hours, area),
+        }
+
+
+def trend(rate: float, recent: float) -> str:
+    if recent > rate * (1 + TREND_TOLERANCE):
+        return "up"
+    if recent < rate * (1 - TREND_TOLERANCE):
+        return "down"
+    return "stable"
+
+
+forecaster = ResourceForecaster()
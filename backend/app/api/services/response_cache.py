@@ -0,0 +1,100 @@
+# backend/app/api/services/response_cache.py
+"""Serialized-response cache with ETags for read-heavy endpoints.
+
+A cached body is the JSON bytes for one key (endpoint plus parameters),
+built once and reused until the state it was built from changes. The state
+is a cheap tuple of version counters (e.g. the prediction engine's version,
+bumped by every new incident or weather update), so checking freshness on a
+hit is a tuple comparison and no payload is rebuilt or re-serialized. Bodies
+also expire after a TTL because forecasts drift with the clock, and the
+number of keys is bounded (LRU) because parameters come from clients.
+Conditional requests whose ``If-None-Match`` matches get an empty 304. The
+ETag hashes the body without its build timestamp, so identical content
+built at different times, or by different workers, keeps one ETag.
+"""
+import hashlib
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.api.services.ttl_cache import TTLCache
+from app.config import server
+
+# Top-level fields that change on every build and are left out of the ETag
+VOLATILE_FIELDS = ("lastUpdated",)
+
+try:
+    import orjson
+
+    def dumps(payload: Any) -> bytes:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ModuleNotFoundError:  # optional speed-up
+    import json
+
+    def dumps(payload: Any) -> bytes:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+class CachedBody:
+    __slots__ = ("state", "body", "etag")
+
+    def __init__(self, state: Hashable, payload: Any):
+        self.state = state
+        self.body = dumps(payload)
+        if isinstance(payload, dict) and any(field in payload for field in VOLATILE_FIELDS):
+            stable = dumps({name: value for name, value in payload.items() if name not in VOLATILE_FIELDS})
+        else:
+            stable = self.body
+        self.etag = '"' + hashlib.blake2b(stable, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float = server.RESPONSE_CACHE_TTL_S,
+                 max_age: int = server.RESPONSE_MAX_AGE_S, max_entries: int = server.RESPONSE_CACHE_SIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl_seconds
+        self.max_age = max_age
+        self._entries = TTLCache(max_entries, ttl_seconds, clock)
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def body(self, key: Hashable, state: Hashable, build: Callable[[], Any]) -> CachedBody:
+        """Cached bytes for ``key``, rebuilt when ``state`` changed or the TTL passed."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.state == state:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = CachedBody(state, build())
+        self._entries.set(key, entry)
+        return entry
+
+    def respond(self, request: Request, key: Hashable, state: Hashable, build: Callable[[], Any]) -> Response:
+        entry = self.body(key, state, build)
+        headers = {"ETag": entry.etag, "Cache-Control": f"max-age={self.max_age}, must-revalidate"}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "notModified": self.not_modified}
+
+
+cache = ResponseCache()
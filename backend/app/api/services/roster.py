@@ -0,0 +1,282 @@
+# backend/app/api/services/roster.py
+"""Columnar volunteer rosters for matching.
+
+The fields matching reads (status, rating, completed missions, coordinates
+and the skill bitmask) are held as parallel NumPy arrays, so scoring a whole
+roster is a handful of vectorized expressions instead of one ``dict.get``
+per field per volunteer. Everything else about a volunteer (contact details,
+current assignment, ...) is kept as one compact JSON blob per row and only
+decoded for the few volunteers a response actually returns.
+
+Ids, names and the extras live in packed UTF-8 buffers and statuses and
+skill lists are dictionary-encoded, so a volunteer costs about a hundred
+bytes instead of a kilobyte of nested dicts. Rosters are built from JSON
+records, from a columnar mapping (``{"id": [...], "rating": [...], ...}``),
+or from msgpack / Arrow IPC payloads. The binary formats need the optional
+``msgpack`` and ``pyarrow`` packages.
+"""
+import json
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.api.services.skills import has_skill, skill_masks
+from app.api.services.volunteer_index import haversine_km, location_of
+
+# Columns parsed into arrays; any other field goes to the per-row extras
+COLUMNS = ("id", "name", "status", "rating", "completedMissions", "lat", "lng", "skills")
+DEFAULT_RATING = 4.0
+
+JSON_TYPES = ("application/json",)
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+ARROW_TYPES = ("application/vnd.apache.arrow.stream", "application/vnd.apache.arrow.file")
+
+
+class RosterFormatError(ValueError):
+    """Payload cannot be read as a roster (unsupported type or missing optional package)."""
+
+
+def _compact(extra: dict) -> Optional[bytes]:
+    return json.dumps(extra, separators=(",", ":")).encode() if extra else None
+
+
+def _floats(values: Sequence, default: float = np.nan) -> np.ndarray:
+    return np.array([default if value is None else value for value in values], dtype=np.float64)
+
+
+def _codes(values: Iterable[Hashable]) -> Tuple[np.ndarray, list]:
+    """Dictionary-encode ``values``: (code per value, distinct values in first-seen order)."""
+    values = list(values)
+    vocabulary = list(dict.fromkeys(values))
+    index = {value: code for code, value in enumerate(vocabulary)}
+    return np.fromiter(map(index.__getitem__, values), dtype=np.int32, count=len(values)), vocabulary
+
+
+def _identity_codes(values: Iterable[Hashable]) -> Tuple[np.ndarray, list]:
+    values = list(values)
+    return np.arange(len(values), dtype=np.int32), values
+
+
+class PackedStrings:
+    """Many short strings in one UTF-8 buffer plus an offsets array (no per-string objects)."""
+    __slots__ = ("data", "offsets", "missing")
+
+    def __init__(self, values: Sequence[Optional[Union[str, bytes]]]):
+        encoded = [b"" if value is None else value if isinstance(value, bytes) else value.encode()
+                   for value in values]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=self.offsets[1:])
+        self.data = b"".join(encoded)
+        self.missing = np.fromiter((value is None for value in values), dtype=bool, count=len(encoded))
+
+    @classmethod
+    def blank(cls, size: int) -> "PackedStrings":
+        """``size`` missing values"""
+        packed = cls.__new__(cls)
+        packed.data, packed.offsets, packed.missing = b"", np.zeros(size + 1, dtype=np.int64), np.ones(size, dtype=bool)
+        return packed
+
+    def __len__(self) -> int:
+        return len(self.missing)
+
+    def raw(self, index: int) -> Optional[bytes]:
+        if self.missing[index]:
+            return None
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        value = self.raw(index)
+        return None if value is None else value.decode()
+
+    def take(self, rows: Sequence[int]) -> "PackedStrings":
+        return PackedStrings([self.raw(i) for i in rows])
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.nbytes + self.missing.nbytes
+
+
+class Roster:
+    __slots__ = ("ids", "names", "status_codes", "statuses", "available", "rating", "missions", "lat", "lng",
+                 "nested", "skill_codes", "skill_sets", "masks", "extras")
+
+    def __init__(self, ids: Sequence[Optional[str]], names: Sequence[Optional[str]], status: Iterable[str],
+                 rating: np.ndarray, missions: np.ndarray, lat: np.ndarray, lng: np.ndarray,
+                 skills: Iterable[tuple], extras: Optional[Sequence[Optional[bytes]]] = None,
+                 nested: Optional[Sequence[bool]] = None, encode: bool = True):
+        self.ids = ids if isinstance(ids, PackedStrings) else PackedStrings(ids)
+        self.names = names if isinstance(names, PackedStrings) else PackedStrings(names)
+        # Statuses and skill lists repeat across volunteers: store a code per row
+        # (short-lived scoring rosters skip the encoding and use one code per row)
+        self.status_codes, self.statuses = _codes(status) if encode else _identity_codes(status)
+        self.available = np.array([value == "available" for value in self.statuses], dtype=bool)[self.status_codes]
+        self.skill_codes, self.skill_sets = _codes(skills) if encode else _identity_codes(skills)
+        self.masks = skill_masks(self.skill_sets)[self.skill_codes]
+        self.rating = np.asarray(rating, dtype=np.float64)
+        self.missions = np.asarray(missions, dtype=np.float64)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        # Rows whose coordinates arrived as {"location": {"lat", "lng"}} rather than top-level fields
+        self.nested = np.zeros(len(self.ids), dtype=bool) if nested is None else np.asarray(nested, dtype=bool)
+        if extras is None:
+            self.extras = PackedStrings.blank(len(self.ids))
+        else:
+            self.extras = extras if isinstance(extras, PackedStrings) else PackedStrings(extras)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], details: bool = True) -> "Roster":
+        """Roster from volunteer dicts.
+
+        With ``details=False`` only the scored columns are filled (no ids, names,
+        coordinates or extras), for callers that already have the distances and
+        keep the original dicts for their response.
+        """
+        if not details:
+            records = list(records)
+            unknown = np.full(len(records), np.nan)
+            return cls(
+                PackedStrings.blank(len(records)), PackedStrings.blank(len(records)),
+                [record.get("status") or "" for record in records],
+                _floats([record.get("rating", DEFAULT_RATING) for record in records], DEFAULT_RATING),
+                _floats([record.get("completedMissions", 0) for record in records], 0.0),
+                unknown, unknown, [tuple(record.get("skills") or ()) for record in records], encode=False,
+            )
+
+        ids, names, status, rating, missions, lat, lng, skills, extras, nested = [], [], [], [], [], [], [], [], [], []
+        for record in records:
+            coords = location_of(record)
+            location = record.get("location")
+            plain_location = isinstance(location, dict) and location.keys() <= {"lat", "lng"} and coords is not None
+            ids.append(None if record.get("id") is None else str(record["id"]))
+            names.append(record.get("name"))
+            status.append(record.get("status") or "")
+            rating.append(record.get("rating", DEFAULT_RATING))
+            missions.append(record.get("completedMissions", 0))
+            lat.append(coords[0] if coords else np.nan)
+            lng.append(coords[1] if coords else np.nan)
+            skills.append(tuple(record.get("skills") or ()))
+            nested.append(plain_location)
+            extras.append(_compact({key: value for key, value in record.items()
+                                    if key not in COLUMNS and not (plain_location and key == "location")}))
+        return cls(ids, names, status, _floats(rating, DEFAULT_RATING), _floats(missions, 0.0),
+                   np.array(lat, dtype=np.float64), np.array(lng, dtype=np.float64), skills, extras, nested)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence]) -> "Roster":
+        """Roster from equal-length columns keyed by volunteer field name."""
+        if "id" not in columns:
+            raise RosterFormatError("roster has no id column")
+        size = len(columns["id"])
+        if any(len(values) != size for values in columns.values()):
+            raise RosterFormatError("roster columns differ in length")
+
+        def column(name: str, default: Any = None) -> Sequence:
+            return columns[name] if name in columns else [default] * size
+
+        # A "location" column of {lat, lng} dicts is folded into the coordinate arrays
+        lat, lng, nested = column("lat"), column("lng"), None
+        extra_names = [name for name in columns if name not in COLUMNS]
+        if "lat" not in columns and "location" in columns:
+            coords = [location_of({"location": value}) if isinstance(value, dict) else None
+                      for value in columns["location"]]
+            lat, lng = [c and c[0] for c in coords], [c and c[1] for c in coords]
+            nested = [c is not None for c in coords]
+            extra_names.remove("location")
+
+        extras = [_compact({name: columns[name][row] for name in extra_names if columns[name][row] is not None})
+                  for row in range(size)] if extra_names else None
+        return cls(
+            [str(value) for value in columns["id"]],
+            list(column("name")),
+            [value or "" for value in column("status")],
+            _floats(column("rating"), DEFAULT_RATING),
+            _floats(column("completedMissions"), 0.0),
+            _floats(lat),
+            _floats(lng),
+            [tuple(value or ()) for value in column("skills")],
+            extras,
+            nested,
+        )
+
+    @classmethod
+    def from_json(cls, data: Any) -> "Roster":
+        """From a decoded JSON body: a list of records or a columnar mapping."""
+        if isinstance(data, dict):
+            return cls.from_columns(data)
+        if isinstance(data, list):
+            return cls.from_records(data)
+        raise RosterFormatError("roster must be a list of volunteers or a mapping of columns")
+
+    @classmethod
+    def from_msgpack(cls, payload: bytes) -> "Roster":
+        try:
+            import msgpack
+        except ModuleNotFoundError:
+            raise RosterFormatError("msgpack rosters need the msgpack package")
+        return cls.from_json(msgpack.unpackb(payload, raw=False))
+
+    @classmethod
+    def from_arrow(cls, payload: bytes) -> "Roster":
+        try:
+            import pyarrow
+        except ModuleNotFoundError:
+            raise RosterFormatError("Arrow rosters need the pyarrow package")
+        try:
+            table = pyarrow.ipc.open_stream(payload).read_all()
+        except pyarrow.ArrowInvalid:
+            table = pyarrow.ipc.open_file(pyarrow.BufferReader(payload)).read_all()
+        return cls.from_columns(table.to_pydict())
+
+    @classmethod
+    def from_payload(cls, payload: bytes, content_type: str) -> "Roster":
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in MSGPACK_TYPES:
+            return cls.from_msgpack(payload)
+        if media_type in ARROW_TYPES:
+            return cls.from_arrow(payload)
+        if media_type in JSON_TYPES or not media_type:
+            return cls.from_json(json.loads(payload))
+        raise RosterFormatError(f"unsupported roster format {media_type}")
+
+    def distances_from(self, location) -> np.ndarray:
+        """Distances in km to ``(lat, lng)``; NaN for volunteers without coordinates"""
+        if location is None:
+            return np.full(len(self), np.nan)
+        return haversine_km(*location, self.lat, self.lng)
+
+    def has_skill(self, skill: str) -> np.ndarray:
+        """Boolean array: which volunteers list ``skill``"""
+        # Checked once per distinct skill list, then spread over the rows
+        return has_skill(skill_masks(self.skill_sets), skill, self.skill_sets)[self.skill_codes]
+
+    def take(self, rows: Sequence[int]) -> "Roster":
+        rows = list(rows)
+        return Roster(self.ids.take(rows), self.names.take(rows), [self.statuses[self.status_codes[i]] for i in rows],
+                      self.rating[rows], self.missions[rows], self.lat[rows], self.lng[rows],
+                      [self.skill_sets[self.skill_codes[i]] for i in rows], self.extras.take(rows), self.nested[rows])
+
+    def record(self, row: int) -> dict:
+        """The volunteer at ``row`` as a plain dict (for responses)."""
+        extra = self.extras.raw(row)
+        record = json.loads(extra) if extra else {}
+        record.update(name=self.names[row], rating=float(self.rating[row]),
+                      completedMissions=int(self.missions[row]), skills=list(self.skill_sets[self.skill_codes[row]]))
+        if self.ids[row] is not None:
+            record["id"] = self.ids[row]
+        status = self.statuses[self.status_codes[row]]
+        if status:
+            record["status"] = status
+        if self.nested[row]:
+            record["location"] = {"lat": float(self.lat[row]), "lng": float(self.lng[row])}
+        elif "location" not in record and not np.isnan(self.lat[row]):
+            record["lat"], record["lng"] = float(self.lat[row]), float(self.lng[row])
+        return record
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the roster"""
+        arrays = sum(array.nbytes for array in (self.status_codes, self.available, self.rating, self.missions,
+                                                 self.lat, self.lng, self.nested, self.skill_codes, self.masks))
+        return arrays + self.ids.nbytes + self.names.nbytes + self.extras.nbytes
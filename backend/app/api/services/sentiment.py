@@ -0,0 +1,173 @@
+# backend/app/api/services/sentiment.py
+"""Lexicon-based sentiment and distress scoring for chat and field messages.
+
+Scoring is a single regex tokenisation plus dict lookups, with simple
+negation ("not safe") and intensifier ("very scared") handling, so a short
+message costs tens of microseconds and needs no model files. Scored messages
+that carry an area also update exponentially decayed per-area aggregates,
+which the dashboard reads in O(areas) without revisiting old messages.
+"""
+import math
+import re
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Valence in [-4, 4], VADER-style
+VALENCE: Dict[str, float] = {
+    # negative
+    "dying": -3.5, "dead": -3.5, "death": -3.5, "killed": -3.5, "drowning": -3.5,
+    "trapped": -3.0, "stranded": -2.5, "stuck": -2.0, "bleeding": -3.0, "injured": -2.5, "hurt": -2.5,
+    "pain": -2.5, "sick": -2.0, "collapsed": -3.0, "destroyed": -3.0, "lost": -2.0, "missing": -2.5,
+    "scared": -2.5, "afraid": -2.5, "terrified": -3.2, "panic": -3.0, "desperate": -3.0, "worried": -2.0,
+    "hopeless": -3.0, "helpless": -3.0, "hungry": -2.0, "starving": -3.0, "thirsty": -2.0, "cold": -1.5,
+    "bad": -2.0, "worse": -2.5, "worst": -3.0, "terrible": -3.0, "awful": -3.0, "horrible": -3.0,
+    "fire": -2.0, "flood": -2.0, "flooded": -2.5, "emergency": -2.0, "danger": -2.5, "dangerous": -2.5,
+    "unsafe": -2.5, "problem": -1.5, "trouble": -1.8, "angry": -2.5, "nobody": -1.5, "alone": -1.5,
+    "crying": -2.5, "unconscious": -3.0, "damaged": -2.0,
+    # positive
+    "safe": 2.5, "rescued": 3.0, "okay": 1.5, "ok": 1.5, "fine": 1.5, "good": 1.9, "better": 1.9,
+    "great": 3.1, "thanks": 1.9, "thank": 1.5, "grateful": 2.8, "relieved": 2.5, "helped": 2.2,
+    "stable": 1.8, "recovered": 2.5, "arrived": 1.2, "resolved": 2.0, "calm": 1.5, "happy": 2.7,
+    "appreciate": 2.3, "evacuated": 1.5, "secure": 2.0, "fed": 1.0,
+}
+# Distress cues in [0, 1]; independent of valence ("please hurry" is neutral but distressed)
+DISTRESS: Dict[str, float] = {
+    "help": 0.6, "please": 0.3, "hurry": 0.7, "urgent": 0.8, "urgently": 0.8, "now": 0.3, "immediately": 0.7,
+    "sos": 1.0, "emergency": 0.7, "trapped": 0.9, "stuck": 0.6, "stranded": 0.6, "dying": 1.0,
+    "drowning": 1.0, "bleeding": 0.9, "unconscious": 1.0, "injured": 0.6, "collapsed": 0.8,
+    "scared": 0.6, "afraid": 0.6, "terrified": 0.8, "panic": 0.8, "desperate": 0.8, "missing": 0.6,
+    "children": 0.3, "baby": 0.4, "elderly": 0.3, "pregnant": 0.4, "fire": 0.6, "flood": 0.5,
+    "save": 0.7, "rescue": 0.6,
+}
+NEGATIONS = frozenset({"not", "no", "never", "none", "cannot", "can't", "dont", "don't", "isn't", "aren't",
+                       "wasn't", "without", "nothing", "neither", "nor"})
+INTENSIFIERS = {"very": 0.3, "really": 0.3, "extremely": 0.5, "so": 0.2, "too": 0.2, "badly": 0.4,
+                "completely": 0.4, "totally": 0.4, "seriously": 0.4}
+NEGATION_WINDOW = 3
+NEGATION_FACTOR = -0.74
+# VADER normalisation constant: score / sqrt(score^2 + alpha) maps onto (-1, 1)
+ALPHA = 15.0
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+DISTRESS_HIGH = 0.6
+AREA_HALF_LIFE_S = 3600.0
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|!")
+
+
+def score_text(text: str) -> dict:
+    """Sentiment label, compound score in [-1, 1] and distress in [0, 1] for one message."""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    valence = 0.0
+    distress = 0.0
+    exclamations = 0
+    last_negation = -NEGATION_WINDOW - 1
+    boost = 0.0
+    for position, token in enumerate(tokens):
+        if token == "!":
+            exclamations += 1
+            continue
+        if token in NEGATIONS:
+            last_negation = position
+        if token in INTENSIFIERS:
+            boost += INTENSIFIERS[token]
+            continue
+        negated = 0 < position - last_negation <= NEGATION_WINDOW
+        weight = VALENCE.get(token)
+        if weight is not None:
+            weight *= 1 + boost
+            valence += weight * NEGATION_FACTOR if negated else weight
+        cue = DISTRESS.get(token)
+        if cue is not None and not negated:
+            distress += cue * (1 + boost)
+        boost = 0.0
+
+    if valence:
+        # Exclamation marks amplify whichever way the message already leans
+        valence += math.copysign(min(exclamations, 4) * 0.29, valence)
+    compound = valence / math.sqrt(valence * valence + ALPHA)
+    letters = [char for char in text if char.isalpha()]
+    shouting = len(letters) >= 8 and sum(char.isupper() for char in letters) / len(letters) > 0.7
+    distress += 0.15 * min(exclamations, 4) + (0.3 if shouting else 0.0) + max(-compound, 0.0) * 0.5
+    distress = 1 - math.exp(-distress)
+
+    if compound >= POSITIVE_THRESHOLD:
+        sentiment = "positive"
+    elif compound <= NEGATIVE_THRESHOLD:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+    return {
+        "sentiment": sentiment,
+        "compound": round(compound, 4),
+        "distress": round(distress, 4),
+        "distressLevel": "high" if distress >= DISTRESS_HIGH else "medium" if distress >= 0.3 else "low",
+    }
+
+
+def score_many(texts: Sequence[str]) -> List[dict]:
+    return [score_text(text) for text in texts]
+
+
+class AreaAggregate:
+    """Exponentially decayed message count, sentiment and distress sums for one area."""
+
+    __slots__ = ("count", "compound", "distress", "high_distress", "updated")
+
+    def __init__(self, now: float):
+        self.count = 0.0
+        self.compound = 0.0
+        self.distress = 0.0
+        self.high_distress = 0.0
+        self.updated = now
+
+    def decay(self, now: float):
+        factor = 0.5 ** (max(now - self.updated, 0.0) / AREA_HALF_LIFE_S)
+        self.count *= factor
+        self.compound *= factor
+        self.distress *= factor
+        self.high_distress *= factor
+        self.updated = max(now, self.updated)
+
+    def add(self, score: dict, now: float):
+        self.decay(now)
+        self.count += 1
+        self.compound += score["compound"]
+        self.distress += score["distress"]
+        self.high_distress += score["distress"] >= DISTRESS_HIGH
+
+    def summary(self, now: float) -> dict:
+        self.decay(now)
+        count = self.count or 1.0
+        return {
+            "recentMessages": round(self.count, 2),
+            "avgSentiment": round(self.compound / count, 4),
+            "avgDistress": round(self.distress / count, 4),
+            "highDistressShare": round(self.high_distress / count, 4),
+        }
+
+
+class SentimentTracker:
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.areas: Dict[str, AreaAggregate] = {}
+
+    def record(self, area: str, score: dict, now: Optional[float] = None):
+        now = self.clock() if now is None else now
+        aggregate = self.areas.get(area)
+        if aggregate is None:
+            aggregate = self.areas[area] = AreaAggregate(now)
+        aggregate.add(score, now)
+
+    def area(self, area: str) -> Optional[dict]:
+        aggregate = self.areas.get(area)
+        return None if aggregate is None else {"area": area, **aggregate.summary(self.clock())}
+
+    def summary(self) -> List[dict]:
+        """Areas ordered by decayed average distress, most distressed first."""
+        now = self.clock()
+        areas = [{"area": area, **aggregate.summary(now)} for area, aggregate in self.areas.items()]
+        return sorted(areas, key=lambda item: -item["avgDistress"])
+
+
+tracker = SentimentTracker()
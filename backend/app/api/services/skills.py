@@ -0,0 +1,106 @@
+# backend/app/api/services/skills.py
+"""Skill interning and bitset skill matching.
+
+Every skill name is interned to a bit position, so a volunteer's skill
+profile is a single ``uint64`` and skill match for a whole candidate set is
+one vectorized AND + popcount against the emergency type's requirement
+mask. Skills required by ``SKILL_MAPPING`` are interned first, so the
+requirement scores always see them. Once all 64 bits are taken, further
+skills get no bit; lookups of such a skill (``has_skill``) then fall back
+to plain membership in the skill lists, so clients sending many distinct
+skills cannot change how a volunteer is matched.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+MAX_SKILLS = 64
+
+SKILL_MAPPING = {
+    "medical": ["medical", "rescue", "first_aid"],
+    "food": ["food", "logistics", "distribution"],
+    "water": ["water", "sanitation", "logistics"],
+    "shelter": ["shelter", "construction", "logistics"]
+}
+
+# Bits set in each byte value, for popcounting uint64 arrays byte-wise
+_POPCOUNT8 = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+_skill_ids: Dict[str, int] = {}
+
+
+def intern(skill: str) -> int:
+    """Bit position of ``skill``, or -1 when the vocabulary is full."""
+    skill_id = _skill_ids.get(skill)
+    if skill_id is None:
+        if len(_skill_ids) >= MAX_SKILLS:
+            return -1
+        skill_id = _skill_ids[skill] = len(_skill_ids)
+    return skill_id
+
+
+@lru_cache(maxsize=4096)
+def _mask_of(skills: tuple) -> int:
+    mask = 0
+    for skill in skills:
+        skill_id = intern(skill)
+        if skill_id >= 0:
+            mask |= 1 << skill_id
+    return mask
+
+
+def skill_mask(skills: Iterable[str]) -> int:
+    """Bitmask of a skill list"""
+    return _mask_of(tuple(skills))
+
+
+def skill_masks(skill_lists: Iterable[Sequence[str]]) -> np.ndarray:
+    """Masks for many skill lists as a ``uint64`` array"""
+    return np.fromiter((_mask_of(tuple(skills)) for skills in skill_lists), dtype=np.uint64)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Number of set bits in each element of a ``uint64`` array"""
+    masks = np.ascontiguousarray(masks, dtype=np.uint64)
+    return _POPCOUNT8[masks.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+for _required in SKILL_MAPPING.values():
+    for _skill in _required:
+        intern(_skill)
+
+REQUIREMENT_MASKS = {emergency_type: skill_mask(required) for emergency_type, required in SKILL_MAPPING.items()}
+
+
+def requirement_mask(emergency_type: str) -> int:
+    return REQUIREMENT_MASKS.get(emergency_type, 0)
+
+
+def skill_match_scores(emergency_type: str, masks: np.ndarray) -> np.ndarray:
+    """Share of the emergency type's required skills each volunteer has (0.5 if none are required)"""
+    required = requirement_mask(emergency_type)
+    if not required:
+        return np.full(len(masks), 0.5)
+    matched = popcount(np.bitwise_and(masks, np.uint64(required)))
+    return np.minimum(matched / bin(required).count("1"), 1.0)
+
+
+def has_skill(masks: np.ndarray, skill: str, skill_lists: Optional[Sequence[Sequence[str]]] = None) -> np.ndarray:
+    """Boolean array: which masks include ``skill``
+
+    A skill without a bit (vocabulary full) is looked up in ``skill_lists``,
+    the lists the masks were built from.
+    """
+    skill_id = _skill_ids.get(skill)
+    if skill_id is None:
+        if skill_lists is None:
+            return np.zeros(len(masks), dtype=bool)
+        return np.fromiter((skill in skills for skills in skill_lists), dtype=bool, count=len(masks))
+    return np.bitwise_and(masks, np.uint64(1 << skill_id)) != 0
+
+
+def matching_skills(emergency_type: str, volunteer_skills: List[str]) -> List[str]:
+    """Volunteer skills that satisfy the emergency type's requirements"""
+    required = requirement_mask(emergency_type)
+    return [skill for skill in volunteer_skills if skill in _skill_ids and required >> _skill_ids[skill] & 1]
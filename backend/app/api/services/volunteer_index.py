@@ -0,0 +1,146 @@
+# backend/app/api/services/volunteer_index.py
+"""Server-side volunteer store with a lat/lon grid index.
+
+Volunteers are bucketed into fixed-size grid cells; coordinates live in
+parallel NumPy arrays so candidate distances are one vectorized haversine
+call. Radius queries only visit the cells overlapping the search box, and
+k-nearest queries widen the radius until enough volunteers are found.
+"""
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.195
+
+
+def location_of(item: dict) -> Optional[Tuple[float, float]]:
+    """``(lat, lng)`` from either a nested ``location`` dict or top-level fields."""
+    location = item.get("location")
+    if isinstance(location, dict):
+        item = location
+    lat = item.get("lat", item.get("latitude"))
+    lng = item.get("lng", item.get("lon", item.get("longitude")))
+    if lat is None or lng is None:
+        return None
+    return float(lat), float(lng)
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many, in kilometres."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs) - math.radians(lng)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class VolunteerIndex:
+    def __init__(self, cell_degrees: float = 0.05, capacity: int = 1024):
+        self.cell_degrees = cell_degrees
+        self.volunteers: Dict[str, dict] = {}
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._cells: Dict[Tuple[int, int], set] = {}
+        self._cell_of: Dict[int, Tuple[int, int]] = {}
+        self._lat = np.zeros(capacity)
+        self._lng = np.zeros(capacity)
+
+    def __len__(self) -> int:
+        return len(self.volunteers)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = len(self._ids)
+        if slot >= len(self._lat):
+            self._lat = np.resize(self._lat, len(self._lat) * 2)
+            self._lng = np.resize(self._lng, len(self._lng) * 2)
+        self._ids.append(None)
+        return slot
+
+    def upsert(self, volunteer: dict):
+        """Insert or replace a volunteer; entries without coordinates are stored unindexed."""
+        volunteer_id = str(volunteer["id"])
+        self.remove(volunteer_id)
+        self.volunteers[volunteer_id] = volunteer
+        coords = location_of(volunteer)
+        if coords is None:
+            return
+        slot = self._allocate()
+        self._ids[slot] = volunteer_id
+        self._slots[volunteer_id] = slot
+        self._lat[slot], self._lng[slot] = coords
+        cell = self._cell(*coords)
+        self._cells.setdefault(cell, set()).add(slot)
+        self._cell_of[slot] = cell
+
+    def upsert_many(self, volunteers: Iterable[dict]) -> int:
+        count = 0
+        for volunteer in volunteers:
+            self.upsert(volunteer)
+            count += 1
+        return count
+
+    def remove(self, volunteer_id: str):
+        self.volunteers.pop(volunteer_id, None)
+        slot = self._slots.pop(volunteer_id, None)
+        if slot is None:
+            return
+        cell = self._cell_of.pop(slot)
+        members = self._cells[cell]
+        members.discard(slot)
+        if not members:
+            del self._cells[cell]
+        self._ids[slot] = None
+        self._free.append(slot)
+
+    def _candidate_slots(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        dlat = radius_km / KM_PER_DEGREE
+        dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        low_i, low_j = self._cell(lat - dlat, lng - dlng)
+        high_i, high_j = self._cell(lat + dlat, lng + dlng)
+
+        slots: List[int] = []
+        if (high_i - low_i + 1) * (high_j - low_j + 1) > len(self._cells):
+            # Search box is larger than the occupied grid; walk occupied cells instead
+            for (i, j), members in self._cells.items():
+                if low_i <= i <= high_i and low_j <= j <= high_j:
+                    slots.extend(members)
+        else:
+            for i in range(low_i, high_i + 1):
+                for j in range(low_j, high_j + 1):
+                    members = self._cells.get((i, j))
+                    if members:
+                        slots.extend(members)
+        return np.fromiter(slots, dtype=np.int64, count=len(slots))
+
+    def within_radius(self, lat: float, lng: float, radius_km: float) -> Tuple[List[dict], np.ndarray]:
+        """Volunteers within ``radius_km`` and their distances, unordered."""
+        slots = self._candidate_slots(lat, lng, radius_km)
+        distances = haversine_km(lat, lng, self._lat[slots], self._lng[slots])
+        keep = distances <= radius_km
+        return [self.volunteers[self._ids[slot]] for slot in slots[keep].tolist()], distances[keep]
+
+    def nearest(self, lat: float, lng: float, k: int,
+                max_radius_km: float = 500.0) -> Tuple[List[dict], np.ndarray]:
+        """Up to ``k`` closest volunteers within ``max_radius_km``, closest first."""
+        radius = self.cell_degrees * KM_PER_DEGREE
+        while True:
+            radius = min(radius, max_radius_km)
+            volunteers, distances = self.within_radius(lat, lng, radius)
+            if len(volunteers) >= k or radius >= max_radius_km or len(volunteers) == len(self._slots):
+                break
+            radius *= 2
+        order = heapq.nsmallest(k, range(len(volunteers)), key=distances.__getitem__)
+        return [volunteers[i] for i in order], distances[order]
+
+
+volunteer_index = VolunteerIndex()
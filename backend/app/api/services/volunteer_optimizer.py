@@ -0,0 +1,230 @@
+# backend/app/api/services/volunteer_optimizer.py
+"""Global volunteer dispatch across many open emergencies.
+
+Instead of ranking volunteers for each incident in isolation, all open
+emergencies and available volunteers are solved together as one assignment
+problem over the same weighted score used by per-incident matching, scaled
+by emergency priority. Each emergency only considers its best
+``CANDIDATES_PER_SLOT`` nearby volunteers, which keeps the cost matrix
+small. Plans are kept for a while so that a few volunteer status changes
+can be repaired by re-solving only the affected part.
+"""
+import heapq
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.api.services.ttl_cache import TTLCache
+from app.api.services.volunteer_index import VolunteerIndex, location_of
+from app.api.services.volunteer_scoring import (
+    format_arrival_time, format_distance, payload_distances, score_components, weighted_score,
+)
+
+PRIORITY_WEIGHTS = {"critical": 2.0, "high": 1.5, "medium": 1.0, "low": 0.7}
+CANDIDATES_PER_SLOT = 20
+CANDIDATE_RADIUS_KM = 50.0
+PLAN_CACHE_SIZE = 64
+PLAN_TTL_SECONDS = 3600
+
+Slot = Tuple[str, int]
+
+
+def _id(item: dict) -> str:
+    return str(item["id"])
+
+
+def _available(volunteers: Dict[str, dict]) -> List[dict]:
+    return [v for v in volunteers.values() if v.get("status", "available") == "available"]
+
+
+class DispatchPlan:
+    """One solved assignment plus the inputs needed to repair it."""
+
+    def __init__(self, emergencies: Dict[str, dict], volunteers: Dict[str, dict]):
+        self.id = uuid.uuid4().hex
+        self.emergencies = emergencies
+        self.volunteers = volunteers
+        self.assignments: Dict[Slot, str] = {}
+        self.scores: Dict[Slot, float] = {}
+        self.distances: Dict[Slot, Optional[float]] = {}
+        self.greedy_score = 0.0
+
+    def slots(self) -> List[Slot]:
+        return [
+            (emergency_id, n)
+            for emergency_id, emergency in self.emergencies.items()
+            for n in range(max(int(emergency.get("volunteersNeeded", 1)), 1))
+        ]
+
+    def assigned_volunteers(self) -> set:
+        return set(self.assignments.values())
+
+    def unassign(self, slot: Slot):
+        self.assignments.pop(slot, None)
+        self.scores.pop(slot, None)
+        self.distances.pop(slot, None)
+
+    def total_score(self) -> float:
+        return float(sum(self.scores.values()))
+
+
+class VolunteerOptimizer:
+    def __init__(self):
+        self.plans = TTLCache(PLAN_CACHE_SIZE, PLAN_TTL_SECONDS)
+
+    def solve(self, emergencies: Iterable[dict], volunteers: Iterable[dict]) -> DispatchPlan:
+        plan = DispatchPlan({_id(e): e for e in emergencies}, {_id(v): v for v in volunteers})
+        self._assign(plan, plan.slots(), _available(plan.volunteers))
+        self.plans.set(plan.id, plan)
+        return plan
+
+    def resolve(self, plan_id: str, volunteer_updates: Iterable[dict] = (),
+                new_emergencies: Iterable[dict] = (), closed_emergencies: Iterable[str] = ()) -> DispatchPlan:
+        """Repair an existing plan after a few changes instead of solving from scratch.
+
+        Assignments untouched by the changes are kept; only open slots,
+        slots whose volunteer changed, and volunteers that changed or are
+        idle are re-solved.
+        """
+        plan = self.plans.get(plan_id)
+        if plan is None:
+            raise KeyError(plan_id)
+
+        changed = set()
+        for update in volunteer_updates:
+            volunteer_id = _id(update)
+            plan.volunteers[volunteer_id] = {**plan.volunteers.get(volunteer_id, {}), **update}
+            changed.add(volunteer_id)
+        for emergency_id in closed_emergencies:
+            plan.emergencies.pop(str(emergency_id), None)
+        for emergency in new_emergencies:
+            plan.emergencies[_id(emergency)] = emergency
+
+        valid_slots = set(plan.slots())
+        for slot, volunteer_id in list(plan.assignments.items()):
+            if slot not in valid_slots or volunteer_id in changed:
+                plan.unassign(slot)
+
+        open_slots = [slot for slot in plan.slots() if slot not in plan.assignments]
+        busy = plan.assigned_volunteers()
+        idle = {vid: v for vid, v in plan.volunteers.items() if vid not in busy}
+        plan.greedy_score = plan.total_score()
+        self._assign(plan, open_slots, _available(idle))
+        self.plans.set(plan.id, plan)
+        return plan
+
+    def _candidates(self, emergency: dict, volunteers: List[dict],
+                    index: Optional[VolunteerIndex]) -> Tuple[List[dict], np.ndarray, np.ndarray]:
+        """Best-scoring nearby volunteers for one emergency: (volunteers, scores, distances)."""
+        location = location_of(emergency)
+        if index is not None and location is not None:
+            pool, distances = index.nearest(*location, CANDIDATES_PER_SLOT * 4, max_radius_km=CANDIDATE_RADIUS_KM)
+        else:
+            pool, distances = volunteers, payload_distances(location, volunteers)
+        if not pool:
+            return [], np.empty(0), np.empty(0)
+
+        scores = weighted_score(score_components(emergency.get("type"), pool, distances))
+        scores = scores * PRIORITY_WEIGHTS.get(emergency.get("priority"), 1.0)
+        top = heapq.nlargest(CANDIDATES_PER_SLOT, range(len(pool)), key=scores.__getitem__)
+        return [pool[i] for i in top], scores[top], distances[top]
+
+    def _assign(self, plan: DispatchPlan, slots: List[Slot], volunteers: List[dict]):
+        if not slots or not volunteers:
+            return
+
+        # Large rosters go through a spatial index so each emergency only scores nearby volunteers
+        index = None
+        unlocated: List[dict] = []
+        if len(volunteers) > CANDIDATES_PER_SLOT * 4:
+            index = VolunteerIndex()
+            index.upsert_many(v for v in volunteers if location_of(v) is not None)
+            unlocated = [v for v in volunteers if location_of(v) is None]
+        # Candidate lists are identical for every slot of the same emergency
+        candidates: Dict[str, Tuple[List[dict], np.ndarray, np.ndarray]] = {}
+        for emergency_id, _ in slots:
+            if emergency_id not in candidates:
+                emergency = plan.emergencies[emergency_id]
+                if index is not None and location_of(emergency) is None:
+                    candidates[emergency_id] = self._candidates(emergency, volunteers, None)
+                else:
+                    pool = self._candidates(emergency, volunteers, index)
+                    if index is not None and unlocated:
+                        extra = self._candidates(emergency, unlocated, None)
+                        pool = (pool[0] + extra[0], np.concatenate([pool[1], extra[1]]),
+                                np.concatenate([pool[2], extra[2]]))
+                    candidates[emergency_id] = pool
+
+        # Sparse candidates -> compact dense matrix over the volunteers that appear at all
+        columns: Dict[str, int] = {}
+        for pool, _, _ in candidates.values():
+            for volunteer in pool:
+                columns.setdefault(_id(volunteer), len(columns))
+        if not columns:
+            return
+        benefit = np.zeros((len(slots), len(columns)))
+        distance = np.full((len(slots), len(columns)), np.nan)
+        for row, (emergency_id, _) in enumerate(slots):
+            pool, scores, distances = candidates[emergency_id]
+            cols = [columns[_id(v)] for v in pool]
+            benefit[row, cols] = scores
+            distance[row, cols] = distances
+
+        # scipy.optimize costs ~0.3 s to import; only pay it when a plan is solved
+        from scipy.optimize import linear_sum_assignment
+
+        plan.greedy_score += greedy_total(benefit)
+        rows, cols = linear_sum_assignment(benefit, maximize=True)
+        column_ids = list(columns)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            if benefit[row, col] <= 0:
+                continue  # pruned pair, not a real candidate
+            slot = slots[row]
+            plan.assignments[slot] = column_ids[col]
+            plan.scores[slot] = float(benefit[row, col])
+            plan.distances[slot] = None if np.isnan(distance[row, col]) else float(distance[row, col])
+
+
+def greedy_total(benefit: np.ndarray) -> float:
+    """Score of per-incident greedy matching (best remaining volunteer, in row order)."""
+    taken = set()
+    total = 0.0
+    for row in benefit:
+        for col in np.argsort(-row).tolist():
+            if row[col] <= 0:
+                break
+            if col not in taken:
+                taken.add(col)
+                total += float(row[col])
+                break
+    return total
+
+
+def plan_summary(plan: DispatchPlan) -> dict:
+    schedule = []
+    for (emergency_id, slot), volunteer_id in sorted(plan.assignments.items()):
+        volunteer = plan.volunteers[volunteer_id]
+        emergency = plan.emergencies[emergency_id]
+        distance_km = plan.distances.get((emergency_id, slot))
+        schedule.append({
+            "emergencyId": emergency_id,
+            "emergencyType": emergency.get("type"),
+            "priority": emergency.get("priority"),
+            "volunteerId": volunteer_id,
+            "volunteerName": volunteer.get("name", "Volunteer"),
+            "score": round(plan.scores[(emergency_id, slot)], 3),
+            "distance": format_distance(distance_km),
+            "estimatedArrival": format_arrival_time(distance_km),
+        })
+    filled = {emergency_id for emergency_id, _ in plan.assignments}
+    return {
+        "planId": plan.id,
+        "schedule": schedule,
+        "unassignedEmergencies": [eid for eid in plan.emergencies if eid not in filled],
+        "totalScore": round(plan.total_score(), 3),
+        "greedyScore": round(plan.greedy_score, 3),
+    }
+
+
+optimizer = VolunteerOptimizer()
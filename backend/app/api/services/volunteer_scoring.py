@@ -0,0 +1,69 @@
+# backend/app/api/services/volunteer_scoring.py
+"""Volunteer/emergency scoring shared by per-incident matching and global dispatch."""
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from app.api.services.roster import Roster
+from app.api.services.skills import matching_skills, skill_match_scores
+from app.api.services.volunteer_index import haversine_km, location_of
+
+MATCH_MAX_DISTANCE_KM = 25.0
+TRAVEL_SPEED_KMH = 30.0
+DISPATCH_MINUTES = 5
+
+SCORE_WEIGHTS = {
+    "skill_match": 0.35,
+    "distance": 0.25,
+    "availability": 0.20,
+    "experience": 0.10,
+    "rating": 0.10,
+}
+
+
+def get_matching_skills(emergency_type: str, volunteer_skills: List[str]) -> List[str]:
+    """Volunteer skills that satisfy the emergency type's requirements"""
+    return matching_skills(emergency_type, volunteer_skills)
+
+
+def payload_distances(emergency_location, volunteers: List[dict]) -> np.ndarray:
+    """Distances in km from the emergency to each volunteer (NaN when unknown)"""
+    distances = np.full(len(volunteers), np.nan)
+    if emergency_location is None:
+        return distances
+    coords = [location_of(v) for v in volunteers]
+    known = [i for i, c in enumerate(coords) if c is not None]
+    if known:
+        lats = np.array([coords[i][0] for i in known])
+        lngs = np.array([coords[i][1] for i in known])
+        distances[known] = haversine_km(*emergency_location, lats, lngs)
+    return distances
+
+
+def score_components(emergency_type: str, volunteers: Union[Roster, List[dict]],
+                     distances: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-volunteer score components as parallel arrays"""
+    roster = volunteers if isinstance(volunteers, Roster) else Roster.from_records(volunteers, details=False)
+    return {
+        "skill_match": skill_match_scores(emergency_type, roster.masks),
+        "distance": np.where(np.isnan(distances), 0.5, np.clip(1 - distances / MATCH_MAX_DISTANCE_KM, 0.0, 1.0)),
+        "availability": roster.available.astype(float),
+        "experience": np.minimum(roster.missions / 50, 1.0),
+        "rating": roster.rating / 5.0,
+    }
+
+
+def weighted_score(components: Dict[str, np.ndarray]) -> np.ndarray:
+    """Weighted AI score calculation"""
+    return sum(components[name] * weight for name, weight in SCORE_WEIGHTS.items())
+
+
+def format_distance(distance_km: Optional[float]) -> str:
+    return "unknown" if distance_km is None else f"{round(distance_km, 1)}km"
+
+
+def format_arrival_time(distance_km: Optional[float]) -> str:
+    if distance_km is None:
+        return "unknown"
+    minutes = DISPATCH_MINUTES + distance_km / TRAVEL_SPEED_KMH * 60
+    return f"{int(round(minutes))} mins"
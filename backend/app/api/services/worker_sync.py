@@ -0,0 +1,131 @@
+# backend/app/api/services/worker_sync.py
+"""Keeps per-worker in-memory state coherent when several workers serve the API.
+
+Each worker appends the changes it makes (volunteer upserts, new incidents,
+classifications) to the ``change_log`` table in the shared SQLite database
+and polls it for changes made by the others. Publishing is synchronous and
+only buffers the record, so request handlers never wait on the database;
+the background loop flushes the buffer in one transaction and applies
+remote changes through the handlers registered per topic; tasks registered
+with ``every`` run from the same loop. In single-worker
+mode nothing is started and ``publish`` is a no-op.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.api.models import change_log_model
+from app.config import server
+from app.config.database import Database, db
+
+logger = logging.getLogger(__name__)
+
+# Prune the log every this many polls
+PRUNE_EVERY = 200
+
+
+class WorkerSync:
+    def __init__(self, db: Database, enabled: bool = server.MULTI_WORKER,
+                 interval: float = server.SYNC_INTERVAL_S, keep: int = server.CHANGE_LOG_KEEP):
+        self.db = db
+        self.enabled = enabled
+        self.interval = interval
+        self.keep = keep
+        self.pid = os.getpid()
+        self.seq = 0
+        self.applied = 0
+        self.handlers: Dict[str, Callable[[dict], None]] = {}
+        self.maintenance: List[Callable] = []
+        # [interval seconds, next due (monotonic), task]
+        self.periodic: List[list] = []
+        self._outbox: Dict[str, List[dict]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._polls = 0
+
+    def on(self, topic: str, handler: Callable[[dict], None]):
+        """Apply ``handler`` to every record another worker publishes on ``topic``."""
+        self.handlers[topic] = handler
+
+    def every(self, seconds: float, task: Callable):
+        """Run ``task`` (a coroutine function) from the sync loop at most every ``seconds``."""
+        self.periodic.append([seconds, 0.0, task])
+
+    def publish(self, topic: str, record: dict):
+        if self.enabled:
+            self._outbox.setdefault(topic, []).append(record)
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        # Forked workers inherit the parent's instance; tag changes with our own pid
+        self.pid = os.getpid()
+        # Everything before now is already in the database this worker warmed from
+        self.seq = await change_log_model.latest_seq(self.db)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    async def flush(self):
+        outbox, self._outbox = self._outbox, {}
+        for topic, records in outbox.items():
+            await change_log_model.append_changes(self.db, topic, records, self.pid)
+
+    async def poll(self) -> int:
+        """Apply changes from other workers; returns how many were applied."""
+        applied = 0
+        while True:
+            changes = await change_log_model.changes_since(self.db, self.seq)
+            for seq, topic, origin, record in changes:
+                self.seq = seq
+                handler = self.handlers.get(topic)
+                if origin == self.pid or handler is None:
+                    continue
+                try:
+                    handler(record)
+                    applied += 1
+                except Exception:
+                    logger.exception("Failed to apply %s change %s", topic, seq)
+            if len(changes) < 1000:
+                break
+        self.applied += applied
+        return applied
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+                await self.poll()
+                self._polls += 1
+                now = time.monotonic()
+                for entry in self.periodic:
+                    if now >= entry[1]:
+                        entry[1] = now + entry[0]
+                        await entry[2]()
+                if self._polls % PRUNE_EVERY == 0:
+                    await change_log_model.prune(self.db, self.keep)
+                    for task in self.maintenance:
+                        await task()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Worker sync iteration failed")
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "pid": self.pid, "seq": self.seq, "applied": self.applied,
+                "pending": sum(len(records) for records in self._outbox.values())}
+
+
+# Propagates writes between workers when launched with --workers N (no-op otherwise)
+sync = WorkerSync(db)
@@ -0,0 +1,52 @@
+# backend/app/config/ai_config.py
+"""Runtime settings for the AI services, overridable through environment variables."""
+import os
+from pathlib import Path
+
+# Serialized scikit-learn artifacts; only those a route serves are loaded
+# (disaster_predictor.pkl and volunteer_matcher.pkl have no caller yet)
+MODELS_DIR = Path(os.getenv("CRISIS_MODELS_DIR", Path(__file__).resolve().parents[1] / "ai_models"))
+MODEL_FILES = {
+    "emergency_classifier": "emergency_classifier.pkl",
+}
+# Memory-map numpy arrays inside the artifacts instead of copying them into RAM
+MODEL_MMAP = os.getenv("CRISIS_MODEL_MMAP", "0") == "1"
+# Sample inputs used to smoke-test an artifact at load time
+MODEL_VALIDATION_SAMPLES = {
+    "emergency_classifier": ["flood water rising, 4 people trapped on the roof"],
+}
+# Model predictions below this probability defer to the keyword rules
+MODEL_MIN_CONFIDENCE = float(os.getenv("CRISIS_MODEL_MIN_CONFIDENCE", "0.5"))
+
+# Inference thread pool and dynamic micro-batching
+MODEL_THREADS = int(os.getenv("CRISIS_MODEL_THREADS", "2"))
+MICROBATCH_MAX_SIZE = int(os.getenv("CRISIS_MICROBATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("CRISIS_MICROBATCH_MAX_WAIT_MS", "5"))
+
+# Remote LLM classification (OpenAI-compatible chat completions API)
+LLM_BASE_URL = os.getenv("CRISIS_LLM_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+LLM_API_KEY = os.getenv("OPENAI_API_KEY", "")
+LLM_MODEL = os.getenv("CRISIS_LLM_MODEL", "gpt-4")
+LLM_DEADLINE_S = float(os.getenv("CRISIS_LLM_DEADLINE_S", "8"))
+LLM_MAX_CONCURRENCY = int(os.getenv("CRISIS_LLM_MAX_CONCURRENCY", "8"))
+LLM_BREAKER_FAILURES = int(os.getenv("CRISIS_LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_S = float(os.getenv("CRISIS_LLM_BREAKER_RESET_S", "30"))
+LLM_CACHE_SIZE = int(os.getenv("CRISIS_LLM_CACHE_SIZE", "2048"))
+LLM_CACHE_TTL_S = float(os.getenv("CRISIS_LLM_CACHE_TTL_S", "600"))
+
+# Image analysis pipeline
+IMAGE_WORKERS = int(os.getenv("CRISIS_IMAGE_WORKERS", str(max((os.cpu_count() or 2) - 1, 1))))
+IMAGE_MAX_QUEUE = int(os.getenv("CRISIS_IMAGE_MAX_QUEUE", "16"))
+IMAGE_MAX_BYTES = int(os.getenv("CRISIS_IMAGE_MAX_BYTES", str(25 * 1024 * 1024)))
+IMAGE_SPOOL_BYTES = 1024 * 1024
+IMAGE_CHUNK_BYTES = 256 * 1024
+IMAGE_WORKING_SIZE = int(os.getenv("CRISIS_IMAGE_WORKING_SIZE", "512"))
+IMAGE_BATCH_MAX_FILES = int(os.getenv("CRISIS_IMAGE_BATCH_MAX_FILES", "100"))
+
+# Near-duplicate image cache (dHash Hamming distance, out of 64 bits)
+IMAGE_CACHE_SIZE = int(os.getenv("CRISIS_IMAGE_CACHE_SIZE", "1024"))
+IMAGE_HASH_MAX_DISTANCE = int(os.getenv("CRISIS_IMAGE_HASH_MAX_DISTANCE", "6"))
+
+# Chat sessions kept server-side between turns
+CHAT_SESSION_LIMIT = int(os.getenv("CRISIS_CHAT_SESSION_LIMIT", "10000"))
+CHAT_SESSION_TTL_S = float(os.getenv("CRISIS_CHAT_SESSION_TTL_S", "1800"))
@@ -0,0 +1,99 @@
+# backend/app/config/database.py
+"""SQLite persistence for emergencies and volunteers.
+
+The database runs in WAL mode so readers never block the single writer, and
+is accessed through a small pool of aiosqlite connections so queries don't
+block the event loop. Table definitions live next to their models in
+app/api/models and are applied on connect.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence
+
+import aiosqlite
+
+DATABASE_PATH = Path(os.getenv("CRISIS_DB_PATH", Path(__file__).resolve().parents[2] / "crisisconnect.db"))
+POOL_SIZE = int(os.getenv("CRISIS_DB_POOL_SIZE", "4"))
+BUSY_TIMEOUT_MS = 5000
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store=MEMORY",
+    # Workers read the same file through the shared OS page cache
+    "PRAGMA mmap_size=268435456",
+)
+
+
+class Database:
+    def __init__(self, path: Path = DATABASE_PATH, pool_size: int = POOL_SIZE):
+        self.path = path
+        self.pool_size = pool_size
+        self._pool: Optional[asyncio.Queue] = None
+        self._connections: List[aiosqlite.Connection] = []
+
+    @property
+    def connected(self) -> bool:
+        return self._pool is not None
+
+    async def connect(self, schema: Iterable[str] = ()):
+        if self.connected:
+            return
+        self._pool = asyncio.Queue()
+        for _ in range(self.pool_size):
+            connection = await aiosqlite.connect(self.path)
+            connection.row_factory = aiosqlite.Row
+            for pragma in PRAGMAS:
+                await connection.execute(pragma)
+            self._connections.append(connection)
+            self._pool.put_nowait(connection)
+        async with self.acquire() as connection:
+            for statement in schema:
+                await connection.executescript(statement)
+            await connection.commit()
+
+    async def close(self):
+        for connection in self._connections:
+            await connection.close()
+        self._connections.clear()
+        self._pool = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self._pool is None:
+            raise RuntimeError("Database is not connected")
+        connection = await self._pool.get()
+        try:
+            yield connection
+        except BaseException:
+            # Never hand a half-written transaction to the next user of this connection
+            if connection.in_transaction:
+                await asyncio.shield(connection.rollback())
+            raise
+        finally:
+            self._pool.put_nowait(connection)
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[aiosqlite.Row]:
+        async with self.acquire() as connection:
+            async with connection.execute(sql, params) as cursor:
+                return await cursor.fetchall()
+
+    async def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """Run ``sql`` for every row in one transaction."""
+        rows = list(rows)
+        async with self.acquire() as connection:
+            await connection.executemany(sql, rows)
+            await connection.commit()
+        return len(rows)
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        async with self.acquire() as connection:
+            cursor = await connection.execute(sql, params)
+            await connection.commit()
+            return cursor.rowcount
+
+
+db = Database()
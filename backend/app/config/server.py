@@ -0,0 +1,41 @@
+# backend/app/config/server.py
+"""Process-level settings for running the API under one or more workers."""
+import os
+from pathlib import Path
+
+HOST = os.getenv("CRISIS_HOST", "0.0.0.0")
+PORT = int(os.getenv("CRISIS_PORT", "8000"))
+# Set by the launcher for every worker it spawns; 1 means the classic single process
+WORKERS = int(os.getenv("CRISIS_WORKERS", "1"))
+MULTI_WORKER = WORKERS > 1
+# Fork the workers from one warmed parent instead of letting each import the app
+PREFORK = os.getenv("CRISIS_PREFORK", "0") == "1"
+
+# Worker-to-worker change feed (SQLite table polled by every worker)
+SYNC_INTERVAL_S = float(os.getenv("CRISIS_SYNC_INTERVAL_S", "0.5"))
+CHANGE_LOG_KEEP = int(os.getenv("CRISIS_CHANGE_LOG_KEEP", "10000"))
+# How often each worker publishes its metrics for the others' /metrics; older snapshots are from exited workers
+METRICS_PUBLISH_S = float(os.getenv("CRISIS_METRICS_PUBLISH_S", "5"))
+METRICS_STALE_S = 3 * METRICS_PUBLISH_S
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def default_workers() -> int:
+    """One worker per core; the CPU-heavy image work has its own process pool."""
+    return max(os.cpu_count() or 1, 1)
+
+# Cached read endpoints: how long clients may reuse a response without revalidating,
+# and how long the server keeps serving a body whose inputs have not changed
+RESPONSE_MAX_AGE_S = int(os.getenv("CRISIS_RESPONSE_MAX_AGE_S", "5"))
+RESPONSE_CACHE_TTL_S = float(os.getenv("CRISIS_RESPONSE_CACHE_TTL_S", "60"))
+# Distinct cached bodies kept per worker (keys include client parameters such as a heatmap bbox)
+RESPONSE_CACHE_SIZE = int(os.getenv("CRISIS_RESPONSE_CACHE_SIZE", "256"))
+
+# Admission control for the intake endpoints: lane -> (concurrent requests, queued requests).
+# Non-critical work is shed once its estimated queue wait exceeds the latency target.
+ADMISSION_LANES = {
+    "classify": (int(os.getenv("CRISIS_CLASSIFY_CONCURRENCY", "64")), int(os.getenv("CRISIS_CLASSIFY_QUEUE", "512"))),
+    "image": (int(os.getenv("CRISIS_IMAGE_CONCURRENCY", "4")), int(os.getenv("CRISIS_IMAGE_QUEUE", "32"))),
+}
+ADMISSION_LATENCY_TARGET_S = float(os.getenv("CRISIS_ADMISSION_LATENCY_TARGET_S", "2"))
@@ -0,0 +1,121 @@
+# backend/app/startup.py
+"""Worker cold-start tooling: import-time profile and pre-fork serving.
+
+``python -m app.startup`` imports main in a fresh interpreter under
+``-X importtime`` and reports where the import time goes, per top-level
+package and per app module. ``serve_prefork`` imports and warms everything
+once in a parent process and forks the workers from it, so each worker
+starts with the modules and model artifacts already in memory and shares
+those pages copy-on-write instead of importing them again.
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+from typing import Dict, List
+
+from app.config import server
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Imported lazily by the request paths that need them; a pre-fork parent pays for them once
+LAZY_MODULES = ("scipy.optimize", "joblib", "httpx")
+
+
+def profile_imports(target: str = "main") -> List[dict]:
+    """One entry per imported module with its own and cumulative import time in ms."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                            cwd=server.BACKEND_DIR, capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            entries.append({"module": module, "depth": len(indent) // 2, "selfMs": int(own) / 1000,
+                            "cumulativeMs": int(cumulative) / 1000})
+    return entries
+
+
+def import_report(entries: List[dict], top: int = 20) -> dict:
+    packages: Dict[str, float] = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + entry["selfMs"]
+    app_modules = [entry for entry in entries if entry["module"].startswith("app.")]
+    return {
+        "totalMs": round(sum(entry["selfMs"] for entry in entries), 1),
+        "packages": sorted(({"package": name, "ms": round(ms, 1)} for name, ms in packages.items()),
+                           key=lambda item: -item["ms"])[:top],
+        "appModules": sorted(({"module": entry["module"], "cumulativeMs": round(entry["cumulativeMs"], 1)}
+                              for entry in app_modules), key=lambda item: -item["cumulativeMs"])[:top],
+    }
+
+
+def warm():
+    """Import the lazily loaded modules and load the models before forking."""
+    from app.api.services.model_registry import registry as model_registry
+
+    for module in LAZY_MODULES:
+        importlib.import_module(module)
+    model_registry.load_all()
+    # Keep the refcount updates of the workers from un-sharing these pages
+    gc.freeze()
+
+
+def serve_prefork(app, host: str, port: int, workers: int):
+    """Bind once, warm, then fork ``workers`` uvicorn servers that share the socket."""
+    import uvicorn
+
+    config = uvicorn.Config(app, host=host, port=port)
+    sock = config.bind_socket()
+    warm()
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for child in children:
+        os.waitpid(child, 0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time profile of the API")
+    parser.add_argument("--target", default="main", help="module to import")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = import_report(profile_imports(args.target), args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"import {args.target}: {report['totalMs']:.1f} ms")
+    print("\nby package (self time):")
+    for item in report["packages"]:
+        print(f"  {item['package']:<32} {item['ms']:>9.1f} ms")
+    print("\napp modules (cumulative):")
+    for item in report["appModules"]:
+        print(f"  {item['module']:<48} {item['cumulativeMs']:>9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
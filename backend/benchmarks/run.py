@@ -0,0 +1,314 @@
+# backend/benchmarks/run.py
+"""Micro-benchmarks and in-process load tests for the CrisisConnect API.
+
+Run from ``backend/``::
+
+    python -m benchmarks.run                   # full suite, rosters up to 100k
+    python -m benchmarks.run --quick           # smaller rosters and fewer requests
+    python -m benchmarks.run --only match      # benchmarks whose name contains "match"
+    python -m benchmarks.run --compare benchmarks/results/<older>.json
+
+Load tests drive the ASGI app through httpx's ``ASGITransport`` (no sockets,
+no server process) against a throwaway SQLite database. Every run writes a
+JSON file under ``benchmarks/results/`` named after the current commit;
+``--compare`` prints p50 latency deltas against an earlier file and exits
+non-zero when something regressed by more than ``--threshold``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# Keep the benchmark database out of the real one
+os.environ.setdefault("CRISIS_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="crisis-bench-"), "bench.db"))
+
+from benchmarks import synthetic  # noqa: E402
+
+
+def summarize(samples: List[float], elapsed: Optional[float] = None) -> dict:
+    """Latency percentiles in milliseconds plus throughput."""
+    values = np.asarray(samples) * 1000
+    total = elapsed if elapsed is not None else values.sum() / 1000
+    return {
+        "n": len(samples),
+        "p50_ms": round(float(np.percentile(values, 50)), 4),
+        "p95_ms": round(float(np.percentile(values, 95)), 4),
+        "p99_ms": round(float(np.percentile(values, 99)), 4),
+        "mean_ms": round(float(values.mean()), 4),
+        "throughput_per_s": round(len(samples) / total, 2) if total else None,
+    }
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.5, max_calls: int = 20000, warmup: int = 3) -> dict:
+    """Call ``fn`` repeatedly for about ``min_time`` seconds and summarize per-call latency."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_calls and time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - call_started)
+    return summarize(samples)
+
+
+def micro_benchmarks(rosters: List[int]) -> Dict[str, Callable[[], dict]]:
+    """name -> thunk returning a measurement; data is generated lazily per benchmark."""
+    from app.api.services import ai_classifier, sentiment, skills
+    from app.api.services.chat_engine import ChatEngine
+    from app.api.services.image_cache import dhash
+    from app.api.services.image_processor import analyze_source, inspect_source
+    from app.api.services.roster import Roster
+    from app.api.services.volunteer_index import VolunteerIndex, haversine_km
+    from app.api.services.volunteer_optimizer import VolunteerOptimizer
+    from app.api.services.volunteer_scoring import score_components, weighted_score
+
+    texts = synthetic.descriptions(1000)
+    benches: Dict[str, Callable[[], dict]] = {}
+
+    def classify_text():
+        items = iter(texts * 1000)
+        return measure(lambda: ai_classifier.classify_text(next(items)))
+
+    def classify_batch_1000():
+        types, priorities, people = ["unknown"] * len(texts), ["medium"] * len(texts), [1] * len(texts)
+        return measure(lambda: ai_classifier.classify_batch(texts, types, priorities, people), max_calls=200)
+
+    def sentiment_score():
+        items = iter(texts * 1000)
+        return measure(lambda: sentiment.score_text(next(items)))
+
+    def chat_turn():
+        engine = ChatEngine()
+        session = engine.session("bench")
+        items = iter(texts * 1000)
+        return measure(lambda: engine.turn(session, next(items), {}))
+
+    benches.update({
+        "classify_text": classify_text,
+        "classify_batch[1000]": classify_batch_1000,
+        "sentiment.score_text": sentiment_score,
+        "chat_engine.turn": chat_turn,
+    })
+
+    for size in rosters:
+        def roster_benches(size=size):
+            roster = synthetic.volunteers(size)
+            index = VolunteerIndex()
+            index.upsert_many(roster)
+            lats = np.array([v["location"]["lat"] for v in roster])
+            lngs = np.array([v["location"]["lng"] for v in roster])
+            masks = skills.skill_masks(v["skills"] for v in roster)
+            emergency = synthetic.emergencies(1)[0]
+            lat, lng = emergency["location"]["lat"], emergency["location"]["lng"]
+            distances = haversine_km(lat, lng, lats, lngs)
+            columnar = Roster.from_records(roster)
+            return {
+                f"haversine_km[{size}]": lambda: measure(lambda: haversine_km(lat, lng, lats, lngs)),
+                f"volunteer_index.nearest[{size}]": lambda: measure(lambda: index.nearest(lat, lng, 200, max_radius_km=50)),
+                f"skill_match_scores[{size}]": lambda: measure(lambda: skills.skill_match_scores("medical", masks)),
+                f"score_components[{size}]": lambda: measure(
+                    lambda: weighted_score(score_components("medical", roster, distances)), max_calls=500),
+                f"Roster.from_records[{size}]": lambda: measure(lambda: Roster.from_records(roster), max_calls=200),
+                f"score_components[roster {size}]": lambda: measure(
+                    lambda: weighted_score(score_components("medical", columnar, columnar.distances_from((lat, lng))))),
+            }
+
+        # Build the roster only when one of its benchmarks actually runs
+        cache = {}
+
+        def lazy(name, size=size, roster_benches=roster_benches):
+            def run():
+                if size not in cache:
+                    cache[size] = roster_benches()
+                return cache[size][name]()
+            return run
+
+        for name in (f"haversine_km[{size}]", f"volunteer_index.nearest[{size}]",
+                     f"skill_match_scores[{size}]", f"score_components[{size}]", f"Roster.from_records[{size}]",
+                     f"score_components[roster {size}]"):
+            benches[name] = lazy(name)
+
+    def optimizer_solve(emergency_count=100, volunteer_count=2000):
+        emergencies = synthetic.emergencies(emergency_count)
+        roster = synthetic.volunteers(volunteer_count)
+        optimizer = VolunteerOptimizer()
+        return measure(lambda: optimizer.solve(emergencies, roster), min_time=2.0, max_calls=50, warmup=1)
+
+    image = synthetic.image_bytes()
+
+    benches.update({
+        "optimizer.solve[100x2000]": optimizer_solve,
+        "image.dhash[4000x3000]": lambda: measure(lambda: dhash(image), max_calls=200),
+        "image.analyze_source[4000x3000]": lambda: measure(lambda: analyze_source(image), min_time=2.0, max_calls=100),
+        "image.inspect_source[4000x3000]": lambda: measure(
+            lambda: inspect_source(image, np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint32), 6),
+            min_time=2.0, max_calls=100),
+    })
+    return benches
+
+
+async def run_load(client, method: str, path: str, bodies: Callable[[int], dict], requests: int,
+                   concurrency: int) -> dict:
+    """Fire ``requests`` calls with ``concurrency`` in flight; latency per call and overall throughput."""
+    samples: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await client.request(method, path, **bodies(i))
+            samples.append(time.perf_counter() - started)
+            errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(samples, time.perf_counter() - started)
+    result.update({"concurrency": concurrency, "errors": errors})
+    return result
+
+
+async def load_tests(requests: int, concurrency: int, roster_size: int, only: Optional[str]) -> Dict[str, dict]:
+    import httpx
+
+    import main
+    from app.api.services.image_processor import analyzer
+
+    app = main.app
+
+    emergency_bodies = synthetic.emergency_requests(1000)
+    roster = synthetic.volunteers(roster_size)
+    emergencies = synthetic.emergencies(200)
+    images = [synthetic.image_bytes(kind=kind, seed=seed) for seed, kind in enumerate(["flood", "fire", "rubble"] * 3)]
+    inline_roster = roster[:50]
+
+    scenarios = {
+        "POST /api/classify-emergency": ("POST", "/api/classify-emergency",
+                                         lambda i: {"json": emergency_bodies[i % len(emergency_bodies)]}),
+        "POST /api/classify-emergency/batch[100]": ("POST", "/api/classify-emergency/batch",
+                                                    lambda i: {"json": emergency_bodies[(i % 10) * 100:(i % 10 + 1) * 100]}),
+        "POST /api/match-volunteers": ("POST", "/api/match-volunteers",
+                                       lambda i: {"json": {"request": emergencies[i % len(emergencies)],
+                                                           "volunteers": inline_roster}}),
+        f"POST /api/ai/match-volunteers[index {roster_size}]": ("POST", "/api/ai/match-volunteers",
+                                                            lambda i: {"json": {"request": emergencies[i % len(emergencies)]}}),
+        "POST /api/emergency-chat": ("POST", "/api/emergency-chat",
+                                     lambda i: {"json": {"message": emergency_bodies[i % 1000]["description"],
+                                                         "sessionId": f"s{i % 50}"}}),
+        "POST /api/ai/analyze-sentiment": ("POST", "/api/ai/analyze-sentiment",
+                                           lambda i: {"json": {"text": emergency_bodies[i % 1000]["description"],
+                                                               "area": emergency_bodies[i % 1000]["area"]}}),
+        "GET /api/disaster-predictions": ("GET", "/api/disaster-predictions", lambda i: {}),
+        "POST /api/ai/analyze-image[9 photos]": ("POST", "/api/ai/analyze-image",
+                                             lambda i: {"files": {"file": ("photo.jpg", images[i % len(images)], "image/jpeg")}}),
+    }
+
+    results = {}
+    async with main.lifespan(app):
+        from app.api.services.volunteer_index import volunteer_index
+        volunteer_index.upsert_many(roster)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, (method, path, bodies) in scenarios.items():
+                if only and only not in name:
+                    continue
+                count = requests if "analyze-image" not in name else max(requests // 10, 20)
+                results[name] = await run_load(client, method, path, bodies, count, concurrency)
+                print(f"  {name:55s} p50 {results[name]['p50_ms']:9.3f} ms  "
+                      f"p99 {results[name]['p99_ms']:9.3f} ms  {results[name]['throughput_per_s']:9.1f} req/s")
+    analyzer.shutdown()
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline_path: str, threshold: float) -> int:
+    """Print deltas against an earlier result file; returns the number of regressions."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    regressions = 0
+    print(f"\nCompared with {baseline['meta']['commit']} ({baseline_path}):")
+    for section in ("micro", "load"):
+        for name, result in current.get(section, {}).items():
+            before = baseline.get(section, {}).get(name)
+            if not before:
+                continue
+            change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  << REGRESSION"
+                regressions += 1
+            print(f"  {name:55s} p50 {before['p50_ms']:9.4f} -> {result['p50_ms']:9.4f} ms ({change:+.1%}){flag}")
+    return regressions
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="rosters up to 10k and fewer load requests")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--skip-load", action="store_true", help="micro-benchmarks only")
+    parser.add_argument("--requests", type=int, help="requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="p50 slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    rosters = [100, 1000, 10000] if args.quick else [100, 1000, 10000, 100000]
+    requests = args.requests or (200 if args.quick else 1000)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "micro": {},
+        "load": {},
+    }
+
+    print("Micro-benchmarks")
+    for name, bench in micro_benchmarks(rosters).items():
+        if args.only and args.only not in name:
+            continue
+        results["micro"][name] = result = bench()
+        print(f"  {name:55s} p50 {result['p50_ms']:9.4f} ms  p99 {result['p99_ms']:9.4f} ms  "
+              f"{result['throughput_per_s']:12.1f} ops/s")
+
+    if not args.skip_load:
+        print(f"Load tests ({requests} requests, concurrency {args.concurrency})")
+        results["load"] = asyncio.run(load_tests(requests, args.concurrency, rosters[-1], args.only))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{results['meta']['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
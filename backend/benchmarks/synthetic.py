@@ -0,0 +1,102 @@
+# backend/benchmarks/synthetic.py
+"""Deterministic synthetic data for the benchmark suite.
+
+Descriptions mix English keywords with the transliterated Tamil/Hindi
+phrases field reports actually contain; rosters are scattered around
+Chennai with realistic skill, status and rating distributions.
+"""
+import io
+import random
+from typing import List
+
+import numpy as np
+from PIL import Image
+
+AREAS = ["Adyar", "Velachery", "T Nagar", "Anna Nagar", "Tambaram", "Porur", "Guindy", "Mylapore",
+         "Perungudi", "Saidapet", "Royapuram", "Ambattur"]
+CENTER = (13.0827, 80.2707)
+SKILLS = ["first_aid", "cpr", "nursing", "doctor", "paramedic", "cooking", "logistics", "driving",
+          "swimming", "boat_operation", "rescue", "construction", "counseling", "translation",
+          "water_purification", "electrician"]
+TYPES = ["medical", "food", "water", "shelter", "flood", "fire"]
+PRIORITIES = ["critical", "high", "medium", "low"]
+
+SUBJECTS = ["my mother", "three children", "elderly couple", "our street", "the relief camp", "families here",
+            "engalukku", "hamare ghar mein", "patient", "pregnant woman"]
+PROBLEMS = [
+    "is injured and needs a doctor", "water entering house, paani bahut hai", "no food since yesterday, saapadu illa",
+    "need drinking water urgently, thanni venum", "roof collapsed, need shelter", "fire near the market, smoke everywhere",
+    "sick with fever, hospital is far", "stuck on the terrace, flood rising", "bachao please, help needed",
+    "minor cuts only, can wait till tomorrow", "contaminated water making people sick", "starving kids, khana chahiye",
+]
+SUFFIXES = ["", " please help", " emergency!!", " {n} people here", " approx {n} members", " sir please send team",
+            " critical condition", ""]
+
+
+def descriptions(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        suffix = rng.choice(SUFFIXES).format(n=rng.randint(1, 80))
+        texts.append(f"{rng.choice(SUBJECTS)} {rng.choice(PROBLEMS)} near {rng.choice(AREAS)}{suffix}")
+    return texts
+
+
+def emergency_requests(count: int, seed: int = 0) -> List[dict]:
+    """Bodies for POST /api/classify-emergency."""
+    rng = random.Random(seed)
+    return [
+        {"description": text, "type": rng.choice(TYPES), "priority": rng.choice(PRIORITIES),
+         "victims": rng.randint(1, 20), "area": rng.choice(AREAS), "contact": "9000000000", "reportedBy": "bench"}
+        for text in descriptions(count, seed)
+    ]
+
+
+def emergencies(count: int, seed: int = 0) -> List[dict]:
+    """Stored-emergency shaped records with locations."""
+    rng = np.random.default_rng(seed)
+    lats = CENTER[0] + rng.normal(0, 0.08, count)
+    lngs = CENTER[1] + rng.normal(0, 0.08, count)
+    return [
+        {"id": f"e{i}", "type": TYPES[i % len(TYPES)], "priority": PRIORITIES[int(rng.integers(4))],
+         "area": AREAS[i % len(AREAS)], "victims": int(rng.integers(1, 40)), "volunteersNeeded": int(rng.integers(1, 4)),
+         "status": "open", "location": {"lat": float(lats[i]), "lng": float(lngs[i])}}
+        for i in range(count)
+    ]
+
+
+def volunteers(count: int, seed: int = 0) -> List[dict]:
+    rng = np.random.default_rng(seed)
+    lats = CENTER[0] + rng.normal(0, 0.12, count)
+    lngs = CENTER[1] + rng.normal(0, 0.12, count)
+    skill_counts = rng.integers(1, 5, count)
+    statuses = rng.choice(["available", "available", "available", "busy", "offline"], count)
+    ratings = np.clip(rng.normal(4.2, 0.5, count), 1, 5)
+    missions = rng.poisson(12, count)
+    return [
+        {"id": f"v{i}", "name": f"Volunteer {i}",
+         "skills": [SKILLS[j] for j in rng.choice(len(SKILLS), int(skill_counts[i]), replace=False)],
+         "status": str(statuses[i]), "rating": round(float(ratings[i]), 1), "completedMissions": int(missions[i]),
+         "area": AREAS[i % len(AREAS)], "location": {"lat": float(lats[i]), "lng": float(lngs[i])}}
+        for i in range(count)
+    ]
+
+
+def image_bytes(width: int = 4000, height: int = 3000, kind: str = "flood", seed: int = 0, quality: int = 90) -> bytes:
+    """A phone-sized JPEG with a flood, fire or rubble-like colour layout."""
+    rng = np.random.default_rng(seed)
+    small = np.zeros((height // 8, width // 8, 3), dtype=np.float32)
+    h = small.shape[0]
+    small[: h // 2] = (150, 160, 175)  # overcast sky
+    if kind == "flood":
+        small[h // 2:] = (110, 95, 70)  # muddy water
+    elif kind == "fire":
+        small[h // 2:] = (90, 80, 75)
+        small[h // 3: h // 2 + h // 6, :: 3] = (240, 120, 30)
+    else:
+        small[h // 2:] = rng.uniform(40, 200, (h - h // 2, small.shape[1], 3))
+    small += rng.normal(0, 12, small.shape)
+    image = Image.fromarray(np.clip(small, 0, 255).astype(np.uint8)).resize((width, height), Image.BILINEAR)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
@@ -1,12 +1,101 @@
 # backend/main.py - FIXED CORS VERSION
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+from contextlib import asynccontextmanager
+import asyncio
 import json
+import numpy as np
+import os
+import time
+import uuid
 from datetime import datetime
 
-app = FastAPI(title="CrisisConnect AI API", version="1.0.0")
+from app.api.models import change_log_model, chat_model, emergency_model, metrics_model, volunteer_model
+from app.api.models.emergency_model import Emergency
+from app.api.models.volunteer_model import Volunteer
+from app.api.routes.registry import mount_routers
+from app.api.services import ai_classifier, sentiment
+from app.api.services.admission import CRITICAL, NORMAL, Overloaded, admission
+from app.api.services.chat_engine import engine as chat_engine
+from app.api.services.heatmap import MAX_TILES, heatmap, zoom_precision
+from app.api.services.image_processor import analyzer as image_analyzer
+from app.api.services.incidents import record_incident
+from app.api.services.llm_client import llm_classifier
+from app.api.services.metrics import MetricsMiddleware, record_process_start, registry as metrics_registry, stage
+from app.api.services.prediction_engine import engine as prediction_engine
+from app.api.services.resource_forecaster import forecaster as resource_forecaster
+from app.api.services.response_cache import cache as response_cache
+from app.api.services.realtime import TOPICS, Subscriber, hub
+from app.api.services.roster import Roster
+from app.api.services.model_registry import best_label, registry as model_registry
+from app.api.services.volunteer_index import volunteer_index
+from app.api.services.worker_sync import sync as worker_sync
+from app.config import server
+from app.config.database import db
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    # A pre-forked worker inherited the parent's pid and start time
+    record_process_start()
+    # Load the scikit-learn artifacts once (a pre-fork parent may already have); missing ones fall back to keyword rules
+    model_registry.load_all(reload=False)
+    models_loaded = time.perf_counter()
+    # Open the SQLite pool and warm the volunteer spatial index from stored rosters
+    await db.connect(schema=SCHEMAS)
+    volunteer_index.upsert_many(await volunteer_model.query_volunteers(db))
+    for incident in await emergency_model.query_emergencies(db, limit=100000):
+        heatmap.record(incident)
+        if prediction_engine.record(incident):
+            resource_forecaster.record(incident)
+    app.state.startup = {
+        "modelsSeconds": round(models_loaded - started, 3),
+        "warmupSeconds": round(time.perf_counter() - models_loaded, 3),
+    }
+    # Other workers' writes after this point arrive through the change log
+    if worker_sync.enabled:
+        chat_engine.store = db
+        worker_sync.maintenance.append(lambda: chat_model.purge_expired(db))
+        # /metrics on any worker adds up every worker's published values
+        worker_sync.every(server.METRICS_PUBLISH_S,
+                          lambda: metrics_model.save_snapshot(db, os.getpid(), metrics_registry.snapshot()))
+        worker_sync.maintenance.append(lambda: metrics_model.prune(db, server.METRICS_STALE_S))
+    await worker_sync.start()
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    await worker_sync.stop()
+    await db.close()
+    model_registry.shutdown()
+    image_analyzer.shutdown()
+    await llm_classifier.aclose()
+
+SCHEMAS = [emergency_model.SCHEMA, volunteer_model.SCHEMA, change_log_model.SCHEMA, chat_model.SCHEMA,
+           metrics_model.SCHEMA]
+
+def apply_volunteer(record: dict):
+    volunteer_index.upsert(record)
+    hub.publish("volunteers", record, key=record["id"])
+
+def apply_emergency(change: dict):
+    hub.publish("emergencies", change["event"], key=change.get("key"))
+    record_incident(change["incident"])
+
+def apply_sentiment(change: dict):
+    sentiment.tracker.record(change["area"], change["score"], change["at"])
+
+worker_sync.on("volunteers", apply_volunteer)
+worker_sync.on("emergencies", apply_emergency)
+worker_sync.on("incidents", record_incident)
+worker_sync.on("inventory", resource_forecaster.set_inventory)
+worker_sync.on("sentiment", apply_sentiment)
+worker_sync.on("weather", prediction_engine.set_weather)
+
+app = FastAPI(title="CrisisConnect AI API", version="1.0.0", lifespan=lifespan)
+app.state.ready = False
 
 # 🔧 ENHANCED CORS CONFIGURATION - FIXES OPTIONS 400 ERROR
 app.add_middleware(
@@ -24,6 +113,21 @@ app.add_middleware(
     expose_headers=["*"]  # Expose all headers
 )
 
+# 📈 Per-route latency, in-flight and payload-size metrics (served at /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# 🚦 Admission control sheds non-critical intake work with 503 + Retry-After during surges
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        {"detail": str(exc), "lane": exc.lane, "reason": exc.reason},
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# 🧩 /api/ai/* capabilities live in app/api/routes and are mounted once here
+mount_routers(app)
+
 class EmergencyRequest(BaseModel):
     description: str
     type: str
@@ -33,6 +137,9 @@ class EmergencyRequest(BaseModel):
     contact: str
     reportedBy: str
 
+# Number of reports scored per NDJSON chunk in streamed batch classification
+BATCH_STREAM_CHUNK = 64
+
 # 🛠️ EXPLICIT OPTIONS HANDLER (fixes 400 preflight issue)
 @app.options("/{full_path:path}")
 async def options_handler(full_path: str):
@@ -43,38 +150,55 @@ async def options_handler(full_path: str):
 async def classify_emergency(request: EmergencyRequest):
     """🤖 AI Emergency Classification"""
     
-    description_lower = request.description.lower()
+    # Single-pass keyword scan shared with the /ai fallback classifier
+    with stage("keyword_scan"):
+        emergency_type, priority, estimated_people, _ = ai_classifier.classify_text(
+            request.description,
+            default_type=request.type,
+            default_priority=request.priority,
+            baseline_people=request.victims,
+        )
     
-    # AI-like classification logic
-    emergency_type = request.type
-    if any(word in description_lower for word in ["medical", "injured", "sick", "hospital", "doctor", "ambulance"]):
-        emergency_type = "medical"
-    elif any(word in description_lower for word in ["food", "hungry", "starving", "eat", "nutrition", "supplies"]):
-        emergency_type = "food"
-    elif any(word in description_lower for word in ["water", "thirsty", "drinking", "clean", "contaminated"]):
-        emergency_type = "water"
-    elif any(word in description_lower for word in ["shelter", "homeless", "roof", "house", "building"]):
-        emergency_type = "shelter"
+    # Prefer the trained classifier for the type when it is loaded and confident. Only this await
+    # can queue, so it is what admission control schedules: critical reports go ahead of queued ones
+    if model_registry.available("emergency_classifier"):
+        async with admission.admit("classify", CRITICAL if priority == "critical" else NORMAL):
+            with stage("model_inference"):
+                probabilities = await model_registry.predict_proba("emergency_classifier", request.description)
+        emergency_type = best_label(probabilities)[0] or emergency_type
     
-    # AI priority analysis
-    priority = request.priority
-    if any(word in description_lower for word in ["urgent", "critical", "dying", "emergency", "life", "death"]):
-        priority = "critical"
-    elif any(word in description_lower for word in ["serious", "important", "severe", "bad", "help"]):
-        priority = "high"
-    elif any(word in description_lower for word in ["minor", "small", "later", "tomorrow"]):
-        priority = "low"
+    classification = build_classification(emergency_type, priority, estimated_people)
+    publish_classification(request, classification)
+    return classification
+
+def publish_emergency(event: dict, incident: dict, key: Optional[str] = None):
+    """Announce locally and hand the change to the other workers"""
+    change = {"event": event, "incident": incident, "key": key}
+    apply_emergency(change)
+    worker_sync.publish("emergencies", change)
+
+def publish_classification(request: EmergencyRequest, classification: dict):
+    publish_emergency(
+        {"area": request.area, "description": request.description, **classification},
+        {
+            # Each live report counts once: a unique id keeps identical texts sent later from being
+            # taken for a replay, and the same id lets other workers skip it if it is resent
+            "id": f"report-{uuid.uuid4().hex}",
+            "timestamp": time.time(),
+            "type": classification["emergencyType"],
+            "priority": classification["suggestedPriority"],
+            "estimatedPeople": classification["estimatedPeople"],
+            "area": request.area,
+            "description": request.description,
+        },
+    )
+
+def build_classification(emergency_type: str, priority: str, estimated_people: int) -> dict:
+    """Shape a keyword classification into the API response"""
     
     # AI confidence calculation
     confidence = 0.95 if priority == "critical" else 0.85 if priority == "high" else 0.75 if priority == "medium" else 0.65
     
-    # Extract estimated people count from description
-    estimated_people = request.victims
-    words = description_lower.split()
-    for word in words:
-        if word.isdigit() and int(word) > estimated_people:
-            estimated_people = int(word)
-    
     return {
         "emergencyType": emergency_type,
         "suggestedPriority": priority,
@@ -91,31 +215,79 @@ async def classify_emergency(request: EmergencyRequest):
         ]
     }
 
+async def classify_requests(requests: List[EmergencyRequest]) -> List[dict]:
+    """Score a list of reports in one vectorized pass, preserving order"""
+    descriptions = [r.description for r in requests]
+    with stage("batch_scoring"):
+        results = ai_classifier.classify_batch(
+            descriptions,
+            [r.type for r in requests],
+            [r.priority for r in requests],
+            [r.victims for r in requests],
+        )
+    if results and model_registry.available("emergency_classifier"):
+        batch = await model_registry.predict_proba_many("emergency_classifier", descriptions)
+        results = [
+            (best_label(probabilities)[0] or emergency_type, priority, people)
+            for probabilities, (emergency_type, priority, people) in zip(batch, results)
+        ]
+    classifications = [build_classification(*result) for result in results]
+    for request, classification in zip(requests, classifications):
+        publish_classification(request, classification)
+    return classifications
+
+@app.post("/api/classify-emergency/batch")
+async def classify_emergency_batch(requests: List[EmergencyRequest], stream: bool = False):
+    """📦 Batch Emergency Classification (optionally streamed as NDJSON)"""
+    
+    if not stream:
+        return {"results": await classify_requests(requests)}
+    
+    async def ndjson_chunks():
+        for start in range(0, len(requests), BATCH_STREAM_CHUNK):
+            results = await classify_requests(requests[start:start + BATCH_STREAM_CHUNK])
+            yield "".join(
+                json.dumps({"index": start + offset, **result}) + "\n"
+                for offset, result in enumerate(results)
+            )
+            # Let the server flush this chunk before scoring the next one
+            await asyncio.sleep(0)
+    
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
+
 @app.post("/api/match-volunteers")
 async def match_volunteers(data: dict):
     """🎯 AI-Powered Volunteer Matching"""
     
+    # Stored ids can stand in for the inline request and roster
     request_data = data.get("request", {})
-    volunteers = data.get("volunteers", [])
+    if not request_data and data.get("requestId") is not None:
+        stored = await emergency_model.get_emergencies(db, [data["requestId"]])
+        if not stored:
+            raise HTTPException(status_code=404, detail=f"Unknown request {data['requestId']}")
+        request_data = stored[0]
+    volunteers = data.get("volunteers") or await volunteer_model.get_volunteers(db, data.get("volunteerIds", []))
     matches = []
     
     emergency_type = request_data.get("type", "unknown")
     priority = request_data.get("priority", "medium")
     
-    for i, volunteer in enumerate(volunteers[:5]):  # Top 5 matches
-        # AI scoring algorithm
-        skill_score = 0.9 if emergency_type in volunteer.get("skills", []) else 0.6
-        experience_score = min(volunteer.get("completedMissions", 0) / 50, 1.0)
-        rating_score = volunteer.get("rating", 4.0) / 5.0
-        availability_score = 1.0 if volunteer.get("status") == "available" else 0.3
-        
-        # Weighted AI score
-        ai_score = (
-            skill_score * 0.4 +
-            experience_score * 0.2 +
-            rating_score * 0.2 +
-            availability_score * 0.2
-        ) - (i * 0.05)  # Slight decrease for ranking
+    candidates = volunteers[:5]  # Top 5 matches
+    
+    # Columnar roster: every score component is one vectorized expression over the candidates
+    with stage("scoring"):
+        roster = Roster.from_records(candidates, details=False)
+        skill_scores = np.where(roster.has_skill(emergency_type), 0.9, 0.6)
+        ai_scores = (
+            skill_scores * 0.4 +
+            np.minimum(roster.missions / 50, 1.0) * 0.2 +
+            roster.rating / 5.0 * 0.2 +
+            np.where(roster.available, 1.0, 0.3) * 0.2
+        ) - np.arange(len(roster)) * 0.05  # Slight decrease for ranking
+    
+    for i, volunteer in enumerate(candidates):
+        skill_score = float(skill_scores[i])
+        ai_score = float(ai_scores[i])
         
         matches.append({
             "volunteer": volunteer,
@@ -129,118 +301,131 @@ async def match_volunteers(data: dict):
         })
     
     # Sort by AI score
-    matches.sort(key=lambda x: x["aiScore"], reverse=True)
+    with stage("sort"):
+        matches.sort(key=lambda x: x["aiScore"], reverse=True)
     
     return {"recommendations": matches}
 
-@app.post("/api/emergency-chat")
-async def emergency_chat(data: dict):
-    """💬 AI Emergency Chatbot"""
-    
-    message = data.get("message", "").lower()
-    context = data.get("context", {})
-    
-    # AI urgency detection
-    urgent_keywords = ["emergency", "urgent", "help", "critical", "dying", "fire", "flood", "accident", "blood", "unconscious"]
-    moderate_keywords = ["sick", "injured", "pain", "need help", "problem", "trouble"]
+@app.post("/api/emergencies/bulk")
+async def upsert_emergencies(emergencies: List[Emergency]):
+    """🗄️ Bulk insert/update stored emergencies"""
+    upserted = await emergency_model.upsert_emergencies(db, emergencies)
+    for emergency in emergencies:
+        record = emergency.model_dump()
+        publish_emergency(record, record, key=emergency.id)
+    return {"upserted": upserted}
+
+@app.get("/api/emergencies")
+async def list_emergencies(status: Optional[str] = None, type: Optional[str] = None,
+                           area: Optional[str] = None, limit: int = 1000):
+    return {"emergencies": await emergency_model.query_emergencies(db, status, type, area, limit)}
+
+@app.post("/api/volunteers/bulk")
+async def upsert_volunteers(volunteers: List[Volunteer]):
+    """🗄️ Bulk insert/update stored volunteers (also refreshes the spatial index)"""
+    upserted = await volunteer_model.upsert_volunteers(db, volunteers)
+    for volunteer in volunteers:
+        record = volunteer.model_dump()
+        apply_volunteer(record)
+        worker_sync.publish("volunteers", record)
+    return {"upserted": upserted}
+
+@app.get("/api/volunteers")
+async def list_volunteers(status: Optional[str] = None, area: Optional[str] = None, limit: int = 1000):
+    return {"volunteers": await volunteer_model.query_volunteers(db, status, area, limit)}
+
+@app.get("/api/disaster-predictions")
+async def disaster_predictions(request: Request):
+    """🔮 AI Disaster Prediction System (ETag / If-None-Match aware)"""
     
-    urgency_level = 0.0
-    detected_emergency_type = "unknown"
+    def build():
+        forecast = prediction_engine.forecast("24h")
+        return {
+            "predictedIncidents": forecast["predictedIncidents"],
+            "riskAreas": forecast["riskAreas"],
+            "resourceForecast": resource_forecaster.totals(24),
+            "actionableInsights": forecast["actionableInsights"],
+            "modelConfidence": forecast["modelConfidence"],
+            "hotspots": heatmap.hotspots(),
+            "lastUpdated": datetime.now().isoformat()
+        }
     
-    # Advanced AI analysis
-    if any(word in message for word in urgent_keywords):
-        urgency_level = 0.9
-    elif any(word in message for word in moderate_keywords):
-        urgency_level = 0.6
-    else:
-        urgency_level = 0.3
+    # Rebuilt only after new incidents, weather or inventory; polls in between reuse the bytes or get a 304
+    return response_cache.respond(request, "disaster-predictions",
+                                  (prediction_engine.version, resource_forecaster.version, heatmap.version), build)
+
+@app.get("/api/heatmap")
+async def risk_heatmap(request: Request, zoom: Optional[float] = None, precision: Optional[int] = None,
+                       bbox: Optional[str] = None, limit: int = 500):
+    """🗺️ Pre-aggregated risk tiles for a map view (bbox = minLat,minLng,maxLat,maxLng)"""
     
-    # Detect emergency type from message
-    if any(word in message for word in ["medical", "sick", "injured", "doctor", "hospital"]):
-        detected_emergency_type = "medical"
-    elif any(word in message for word in ["fire", "burning", "smoke", "flames"]):
-        detected_emergency_type = "fire"
-    elif any(word in message for word in ["flood", "water", "drowning"]):
-        detected_emergency_type = "flood"
-    elif any(word in message for word in ["food", "hungry", "starving"]):
-        detected_emergency_type = "food"
+    if precision is None:
+        precision = zoom_precision(zoom) if zoom is not None else 5
+    # Normalise before keying the cache so equivalent requests share one entry
+    precision = min(max(precision, 1), heatmap.max_precision)
+    if limit < 1:
+        raise HTTPException(status_code=422, detail="limit must be at least 1")
+    limit = min(limit, MAX_TILES)
+    box = None
+    if bbox:
+        try:
+            box = tuple(float(value) for value in bbox.split(","))
+        except ValueError:
+            box = ()
+        if len(box) != 4:
+            raise HTTPException(status_code=422, detail="bbox must be minLat,minLng,maxLat,maxLng")
     
-    if urgency_level > 0.8:
-        response = {
-            "message": f"🚨 I've detected a {detected_emergency_type if detected_emergency_type != 'unknown' else 'critical'} emergency! I'm immediately connecting you to our emergency response system. Please stay calm and provide your exact location.",
-            "urgencyLevel": urgency_level,
-            "actions": [
-                {"type": "call_emergency", "text": "📞 Call Emergency Services NOW"},
-                {"type": "open_form", "text": "📋 Quick Emergency Form"},
-                {"type": "get_location", "text": "📍 Share Location"}
-            ],
-            "emergencyData": {
-                "type": detected_emergency_type,
-                "priority": "critical",
-                "extractedInfo": message
-            }
-        }
-    elif urgency_level > 0.5:
-        response = {
-            "message": f"⚠️ I understand you need assistance with a {detected_emergency_type if detected_emergency_type != 'unknown' else ''} situation. Let me help you report this properly.",
-            "urgencyLevel": urgency_level,
-            "actions": [
-                {"type": "open_form", "text": "📋 Report Emergency"},
-                {"type": "get_location", "text": "📍 Share Location"}
-            ]
-        }
-    else:
-        response = {
-            "message": "👋 Hello! I'm your CrisisConnect AI assistant. I'm here to help with emergency reporting and disaster coordination. How can I assist you today?",
-            "urgencyLevel": urgency_level,
-            "actions": [
-                {"type": "open_form", "text": "📋 Report Issue"},
-                {"type": "get_info", "text": "ℹ️ Get Information"}
-            ]
+    def build():
+        return {
+            "precision": precision,
+            "tiles": heatmap.tiles(precision, box, limit),
+            "lastUpdated": datetime.now().isoformat()
         }
     
-    return response
+    # Cells decay uniformly, so a body stays valid (up to scale) until the next incident changes the grid
+    return response_cache.respond(request, ("heatmap", precision, box, limit), heatmap.version, build)
 
-@app.get("/api/disaster-predictions")
-async def disaster_predictions():
-    """🔮 AI Disaster Prediction System"""
+@app.websocket("/ws")
+async def realtime_updates(websocket: WebSocket, topics: str = ",".join(TOPICS)):
+    """📡 Push channel: incremental deltas for the subscribed topics
     
-    current_time = datetime.now()
+    Clients may send {"action": "subscribe" | "unsubscribe", "topics": [...]} at any time.
+    """
+    await websocket.accept()
+    subscriber = Subscriber()
+    hub.subscribe(subscriber, topics.split(","))
     
-    return {
-        "predictedIncidents": [
-            {"type": "medical", "predicted": 4, "confidence": 0.87, "timeframe": "next 6 hours"},
-            {"type": "flood", "predicted": 1, "confidence": 0.92, "timeframe": "next 12 hours"},
-            {"type": "food", "predicted": 3, "confidence": 0.74, "timeframe": "next 24 hours"}
-        ],
-        "riskAreas": [
-            {
-                "location": "Central Delhi",
-                "riskScore": 0.85,
-                "primaryThreat": "Flash flooding due to heavy rainfall forecast",
-                "peakTime": "Next 8-14 hours",
-                "riskFactors": ["Heavy rainfall warning", "Poor drainage system", "High population density"],
-                "recommendedActions": ["Pre-position rescue teams", "Prepare evacuation routes"]
-            }
-        ],
-        "resourceForecast": {
-            "medical_kits": {"predicted": 28, "current": 20, "trend": "up", "change": "+40%"},
-            "food_packets": {"predicted": 150, "current": 120, "trend": "up", "change": "+25%"},
-            "water_bottles": {"predicted": 320, "current": 280, "trend": "up", "change": "+14%"}
-        },
-        "actionableInsights": [
-            {
-                "title": "🌊 Flood Preparation Critical",
-                "description": "Heavy rainfall in next 12 hours will likely cause flash flooding in Central Delhi.",
-                "priority": "critical",
-                "confidence": 0.92,
-                "impact": "Prevent 500+ emergency calls, reduce response time by 60%",
-                "timeframe": "Immediate - next 4 hours"
-            }
-        ],
-        "modelConfidence": 0.84,
-        "lastUpdated": current_time.isoformat()
-    }
+    async def send_updates():
+        while not subscriber.closed:
+            updates = await subscriber.next_batch()
+            if subscriber.overloaded:
+                # Too slow to keep up even with coalescing; let it reconnect and resync
+                await websocket.close(code=1013)
+                return
+            if updates:
+                await websocket.send_json({"updates": updates})
+    
+    async def receive_commands():
+        while True:
+            message = await websocket.receive_json()
+            if message.get("action") == "subscribe":
+                hub.subscribe(subscriber, message.get("topics", []))
+            elif message.get("action") == "unsubscribe":
+                hub.unsubscribe(subscriber, message.get("topics", []))
+    
+    tasks = [asyncio.create_task(send_updates()), asyncio.create_task(receive_commands())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        hub.unsubscribe(subscriber)
+        subscriber.close()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+                pass
 
 @app.get("/")
 async def root():
@@ -262,33 +447,72 @@ async def health_check():
     return {
         "status": "healthy", 
         "timestamp": datetime.now().isoformat(),
-        "cors_enabled": True
+        "cors_enabled": True,
+        "models": model_registry.status(),
+        "imageCache": image_analyzer.cache.stats(),
+        "chatSessions": await chat_engine.stats(),
+        "workerSync": worker_sync.stats(),
+        "responseCache": response_cache.stats(),
+        "heatmap": heatmap.stats(),
+        "admission": admission.stats()
+    }
+
+@app.get("/ready")
+async def readiness():
+    """🚦 200 once this worker has loaded models, warmed its indexes and joined the change feed"""
+    if not app.state.ready:
+        return JSONResponse({"ready": False, "pid": os.getpid()}, status_code=503)
+    return {
+        "ready": True,
+        "pid": os.getpid(),
+        "models": model_registry.status(),
+        "volunteersIndexed": len(volunteer_index),
+        "startup": app.state.startup,
+        "sync": worker_sync.stats()
     }
 
+@app.get("/metrics")
+async def metrics():
+    """📈 Prometheus text exposition, summed over all workers when there are several"""
+    others = await metrics_model.recent_snapshots(db, server.METRICS_STALE_S, os.getpid()) if worker_sync.enabled else ()
+    return PlainTextResponse(metrics_registry.render(others), media_type="text/plain; version=0.0.4")
+
 # Test endpoint to verify CORS is working
 @app.get("/api/test")
 async def test_cors():
     return {"message": "✅ CORS is working correctly!", "timestamp": datetime.now().isoformat()}
 
 
-# Add these to your main.py
-@app.post("/api/ai/analyze-sentiment")
-async def analyze_sentiment(data: dict):
-    # Advanced sentiment analysis
-    pass
-
-@app.post("/api/ai/resource-predictions")
-async def resource_predictions(data: dict):
-    # ML-based resource forecasting
-    pass
-
-@app.post("/api/ai/optimize-volunteers")
-async def optimize_volunteers(data: dict):
-    # Advanced volunteer scheduling
-    pass
-
-
+async def create_schema():
+    """Create tables once before forking so workers don't race on DDL"""
+    await db.connect(schema=SCHEMAS)
+    await db.close()
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    
+    parser = argparse.ArgumentParser(description="Run the CrisisConnect API")
+    parser.add_argument("--host", default=server.HOST)
+    parser.add_argument("--port", type=int, default=server.PORT)
+    parser.add_argument("--workers", default=str(server.WORKERS), help="worker processes, or 'auto' for one per core")
+    parser.add_argument("--prefork", action="store_true", default=server.PREFORK,
+                        help="import and load models once, then fork the workers (copy-on-write)")
+    args = parser.parse_args()
+    workers = server.default_workers() if args.workers == "auto" else int(args.workers)
+    
+    if workers > 1 and args.prefork:
+        from app.startup import serve_prefork
+        
+        # This process already imported everything; the forks inherit it instead of re-importing
+        worker_sync.enabled = True
+        asyncio.run(create_schema())
+        serve_prefork(app, args.host, args.port, workers)
+    elif workers > 1:
+        # Every worker imports main:app afresh and reads these at import time
+        os.environ["CRISIS_WORKERS"] = str(workers)
+        os.environ.setdefault("CRISIS_MODEL_MMAP", "1")
+        asyncio.run(create_schema())
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=workers, app_dir=str(server.BACKEND_DIR))
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
@@ -15,6 +15,7 @@ const AIChatbot = ({ onEmergencyDetected }) => {
   const [inputMessage, setInputMessage] = useState('');
   const [isTyping, setIsTyping] = useState(false);
   const messagesEndRef = useRef(null);
+  const sessionIdRef = useRef(null);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -44,14 +45,16 @@ const AIChatbot = ({ onEmergencyDetected }) => {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
           message: inputMessage,
+          // The server keeps the conversation; only the new message is sent each turn
+          sessionId: sessionIdRef.current,
           context: {
-            previousMessages: messages.slice(-5),
             timestamp: new Date().toISOString()
           }
         })
       });
 
       const aiResponse = await response.json();
+      sessionIdRef.current = aiResponse.sessionId || sessionIdRef.current;
 
       const aiMessage = {
         id: Date.now() + 1,
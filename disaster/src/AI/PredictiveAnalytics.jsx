@@ -30,7 +30,7 @@ const PredictiveAnalytics = ({ weatherData, historicalData, currentRequests }) =
       setPredictions({
         nextIncidents: predictionData.predictedIncidents,
         riskHotspots: predictionData.riskAreas,
-        resourceDemand: predictionData.resourceForeccast,
+        resourceDemand: predictionData.resourceForecast,
         weatherImpact: predictionData.weatherCorrelations,
         confidence: predictionData.modelConfidence,
         recommendations: predictionData.actionableInsights
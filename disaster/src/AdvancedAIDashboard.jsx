@@ -43,6 +43,7 @@ const AdvancedAIDashboard = () => {
   const [volunteers, setVolunteers] = useState([]);
   const [resources, setResources] = useState([]);
   const [activeTab, setActiveTab] = useState('ai-overview');
+  const chatSessionRef = useRef(null);
   const [showRequestForm, setShowRequestForm] = useState(false);
   const [notifications, setNotifications] = useState([]);
   
@@ -89,16 +90,18 @@ const AdvancedAIDashboard = () => {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
           message: message,
+          // The server keeps the conversation; only the new message is sent each turn
+          sessionId: chatSessionRef.current,
           context: {
             currentEmergencies: requests.length,
             activeVolunteers: volunteers.filter(v => v.status === 'available').length,
-            recentMessages: aiChatMessages.slice(-3),
             timestamp: new Date().toISOString()
           }
         })
       });
       
       const aiData = await response.json();
+      chatSessionRef.current = aiData.sessionId || chatSessionRef.current;
       
       // Advanced sentiment and urgency analysis
       const sentimentResponse = await fetch('http://127.0.0.1:8000/api/ai/analyze-sentiment', {
@@ -273,17 +276,23 @@ const AdvancedAIDashboard = () => {
     setAiPerformanceMetrics(metrics);
   };
 
-  // 7. AI HEATMAP GENERATION
-  const generateAIHeatmap = () => {
-    const heatmapPoints = requests.map(req => ({
-      lat: req.lat,
-      lng: req.lng,
-      intensity: req.victims / 10 + (req.priority === 'critical' ? 0.8 : req.priority === 'high' ? 0.6 : 0.4),
-      type: req.type,
-      aiPredictedSpread: Math.random() * 0.3 + 0.2
-    }));
-    
-    setAiHeatmapData(heatmapPoints);
+  // 7. AI HEATMAP GENERATION (pre-aggregated, time-decayed tiles from the backend grid)
+  const generateAIHeatmap = async () => {
+    try {
+      const response = await fetch('http://127.0.0.1:8000/api/heatmap?precision=5');
+      const { tiles = [] } = await response.json();
+      
+      setAiHeatmapData(tiles.map(tile => ({
+        lat: tile.lat,
+        lng: tile.lng,
+        intensity: tile.riskScore,
+        type: tile.primaryType,
+        incidents: tile.incidents,
+        bounds: tile.bounds
+      })));
+    } catch (error) {
+      console.error('AI Heatmap Error:', error);
+    }
   };
 
   // Initialize AI systems
@@ -292,15 +301,27 @@ const AdvancedAIDashboard = () => {
     generateRiskAssessment();
     calculateAIMetrics();
     generateAIHeatmap();
+  }, [requests, volunteers]);
+
+  // Real-time AI updates pushed by the backend instead of polling
+  useEffect(() => {
+    const socket = new WebSocket('ws://127.0.0.1:8000/ws?topics=emergencies,volunteers,predictions');
+    
+    socket.onmessage = (event) => {
+      const { updates = [] } = JSON.parse(event.data);
+      if (updates.some(update => update.topic === 'emergencies' || update.topic === 'volunteers')) {
+        calculateAIMetrics();
+        generateRiskAssessment();
+        generateAIHeatmap();
+      }
+    };
     
-    // Set up real-time AI updates
-    const aiUpdateInterval = setInterval(() => {
-      calculateAIMetrics();
-      generateRiskAssessment();
-    }, 30000); // Update every 30 seconds
+    socket.onerror = (error) => {
+      console.error('AI Realtime Channel Error:', error);
+    };
     
-    return () => clearInterval(aiUpdateInterval);
-  }, [requests, volunteers]);
+    return () => socket.close();
+  }, []);
 
   // 🎨 ADVANCED UI COMPONENTS
 